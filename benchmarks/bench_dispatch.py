@@ -0,0 +1,45 @@
+"""
+Measures the per-call cost of finding a tool's handler and of answering
+list_tools, with the catalog built once per server against rebuilding it on
+every call as the server used to.
+
+    python benchmarks/bench_dispatch.py [--calls N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from mcp_server_helm.core.server import HelmMCPServer  # noqa: E402
+from mcp_server_helm.schemas.tools import get_all_tools  # noqa: E402
+
+
+def _per_call(statement, calls: int) -> float:
+    # Best of five runs, in microseconds per call
+    return min(timeit.repeat(statement, number=calls, repeat=5)) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000, help="calls per timing run")
+    args = parser.parse_args()
+
+    server = HelmMCPServer()
+    server._tool_list()
+
+    rows = [
+        ("handler lookup, table rebuilt per call", _per_call(lambda: server._build_handlers()["helm_status"], args.calls)),
+        ("handler lookup, table built once", _per_call(lambda: server._handlers["helm_status"], args.calls)),
+        ("list_tools, tools rebuilt per call", _per_call(get_all_tools, max(1, args.calls // 20))),
+        ("list_tools, cached tool list", _per_call(server._tool_list, args.calls)),
+    ]
+
+    width = max(len(name) for name, _ in rows)
+    for name, micros in rows:
+        print(f"{name:<{width}}  {micros:10.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Measures reading a large repository index: streaming it into compact chart
+records against loading the whole document, and answering a search from the
+in-memory index against running `helm search repo` (when helm is on PATH).
+The index is synthetic and written to a temporary helm home.
+
+    python benchmarks/bench_index_parse.py [--charts N] [--versions N] [--runs N]
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from mcp_server_helm.core import repo_index  # noqa: E402
+from mcp_server_helm.core.repo_index import index_file_path, index_support_available, load_repository_index  # noqa: E402
+from mcp_server_helm.core.search_index import search_repositories  # noqa: E402
+
+REPO = "bench"
+
+
+def _write_index(path: str, charts: int, versions: int) -> None:
+    import yaml
+
+    entries = {}
+    for c in range(charts):
+        chart = f"chart{c}" if c else "nginx"
+        entries[chart] = [{
+            "name": chart,
+            "version": f"{v // 10}.{v % 10}.0" + ("-rc.1" if v == versions - 1 else ""),
+            "appVersion": f"1.{v}",
+            "description": f"The {chart} web server for Kubernetes" if c % 3 else f"Database {chart}",
+            "keywords": ["web", chart],
+            "urls": [f"https://charts.example.com/{chart}-{v}.tgz"],
+            "digest": "0" * 64,
+            "created": "2024-01-01T00:00:00Z",
+        } for v in range(versions)]
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.dump({"apiVersion": "v1", "entries": entries}, f, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper))
+
+
+def _best(call, runs: int) -> float:
+    # Best of runs, in milliseconds
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def _full_load(path: str) -> None:
+    with open(path, "r", encoding="utf-8") as f:
+        repo_index.yaml.load(f, Loader=repo_index._yaml_loader())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--charts", type=int, default=200, help="charts in the index")
+    parser.add_argument("--versions", type=int, default=100, help="versions per chart")
+    parser.add_argument("--runs", type=int, default=3, help="timing runs; the best one counts")
+    args = parser.parse_args()
+
+    if not index_support_available():
+        sys.exit("PyYAML is not installed")
+
+    home = tempfile.mkdtemp(prefix="helm-bench-")
+    try:
+        os.environ["HELM_REPOSITORY_CONFIG"] = os.path.join(home, "repositories.yaml")
+        os.environ["HELM_REPOSITORY_CACHE"] = os.path.join(home, "cache")
+        os.makedirs(os.environ["HELM_REPOSITORY_CACHE"])
+        with open(os.environ["HELM_REPOSITORY_CONFIG"], "w", encoding="utf-8") as f:
+            f.write(f"apiVersion: v1\nrepositories:\n- name: {REPO}\n  url: https://charts.example.com\n")
+        path = index_file_path(REPO)
+        _write_index(path, args.charts, args.versions)
+
+        print(f"index: {args.charts} charts x {args.versions} versions, {os.path.getsize(path) / 1e6:.1f} MB")
+        rows = [
+            ("stream into chart records", _best(lambda: load_repository_index(REPO, path), args.runs)),
+            ("load the whole document", _best(lambda: _full_load(path), args.runs)),
+        ]
+
+        loop = asyncio.new_event_loop()
+        search = lambda: loop.run_until_complete(search_repositories("nginx"))  # noqa: E731
+        rows.append(("first search (loads the index)", _best(search, 1)))
+        rows.append(("search from the in-memory index", _best(search, args.runs)))
+        loop.close()
+
+        helm = shutil.which("helm")
+        if helm:
+            rows.append(("helm search repo", _best(lambda: subprocess.run(
+                [helm, "search", "repo", "nginx"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL), args.runs)))
+        else:
+            print("helm not on PATH; skipping the helm search repo comparison")
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+    width = max(len(label) for label, _ in rows)
+    for label, millis in rows:
+        print(f"{label:<{width}}  {millis:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
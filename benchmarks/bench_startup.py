@@ -0,0 +1,76 @@
+"""
+Measures how long the server takes to start: the import of the server module
+on its own, after the MCP SDK it sits on is already loaded, and the time from
+spawning the server until a stdio client has its first list_tools answer.
+Exits non-zero when either is over its threshold, so it can gate CI.
+
+    python benchmarks/bench_startup.py [--runs N] [--import-threshold MS] [--list-tools-threshold MS]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# Run in a fresh interpreter each time, so nothing is imported already
+IMPORT_PROBE = (
+    "import time, mcp.server, mcp.server.stdio, mcp.types\n"
+    "started = time.perf_counter()\n"
+    "import mcp_server_helm.core.server\n"
+    "print(time.perf_counter() - started)\n"
+)
+
+
+def _environment() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [SRC, env.get("PYTHONPATH")]))
+    return env
+
+
+def _import_time() -> float:
+    output = subprocess.run([sys.executable, "-c", IMPORT_PROBE], env=_environment(), check=True,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+async def _first_list_tools() -> float:
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    parameters = StdioServerParameters(command=sys.executable, args=["-m", "mcp_server_helm.server"], env=_environment())
+    started = time.perf_counter()
+    with open(os.devnull, "w") as errlog:
+        async with stdio_client(parameters, errlog=errlog) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                await session.list_tools()
+                return time.perf_counter() - started
+
+
+def _report(label: str, seconds: float, threshold_ms: float) -> bool:
+    within = seconds * 1000 <= threshold_ms
+    print(f"{label:<28} {seconds * 1000:9.1f} ms  (threshold {threshold_ms:.0f} ms{'' if within else ', EXCEEDED'})")
+    return within
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="server starts to measure; the best one counts")
+    parser.add_argument("--import-threshold", type=float, default=50.0, help="milliseconds the import may take")
+    parser.add_argument("--list-tools-threshold", type=float, default=3000.0,
+                        help="milliseconds until the first list_tools answer")
+    args = parser.parse_args()
+
+    import_time = min(_import_time() for _ in range(args.runs))
+    list_tools_time = min(asyncio.run(_first_list_tools()) for _ in range(args.runs))
+
+    within = _report("import server module", import_time, args.import_threshold)
+    within = _report("spawn to first list_tools", list_tools_time, args.list_tools_threshold) and within
+    sys.exit(0 if within else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Measures what checking a tool call's arguments against its input schema
+costs, next to the helm process a rejected call no longer spawns.
+
+    python benchmarks/bench_validation.py [--calls N] [--spawns N]
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from mcp_server_helm.core.server import HelmMCPServer  # noqa: E402
+
+CALLS = [
+    ("helm_status, valid", "helm_status", {"release_name": "web", "namespace": "prod", "revision": 3}),
+    ("helm_status, wrong type", "helm_status", {"release_name": "web", "revision": "3"}),
+    ("helm_install, valid", "helm_install", {"chart": "bitnami/nginx", "release_name": "web",
+                                             "set_values": {"replicaCount": "2"}, "wait": True}),
+    ("helm_install, missing chart", "helm_install", {"release_name": "web"}),
+    ("helm_upgrade_many, 50 releases", "helm_upgrade_many", {
+        "chart": "bitnami/nginx", "releases": [{"release_name": f"web-{i}", "namespace": "prod"} for i in range(50)]}),
+]
+
+
+async def _spawn(argv) -> None:
+    process = await asyncio.create_subprocess_exec(*argv, stdout=asyncio.subprocess.DEVNULL,
+                                                   stderr=asyncio.subprocess.DEVNULL)
+    await process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000, help="validations per timing run")
+    parser.add_argument("--spawns", type=int, default=20, help="processes spawned for the comparison")
+    args = parser.parse_args()
+
+    server = HelmMCPServer()
+    rows = []
+    for label, name, arguments in CALLS:
+        validator = server._validator(name)
+        micros = min(timeit.repeat(lambda: validator(arguments, "", []), number=args.calls, repeat=5)) / args.calls * 1e6
+        rows.append((f"validate {label}", micros))
+
+    # The cheapest helm call there is; without helm a no-op process stands in for it
+    helm = shutil.which("helm")
+    argv = [helm, "version", "--short"] if helm else [sys.executable, "-c", "pass"]
+    started = time.perf_counter()
+    for _ in range(args.spawns):
+        asyncio.run(_spawn(argv))
+    rows.append((f"spawn {os.path.basename(argv[0])} {' '.join(argv[1:])}",
+                 (time.perf_counter() - started) / args.spawns * 1e6))
+
+    width = max(len(label) for label, _ in rows)
+    for label, micros in rows:
+        print(f"{label:<{width}}  {micros:12.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
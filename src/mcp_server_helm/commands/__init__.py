@@ -1,23 +1,26 @@
-from . import basic
-from . import dependencies
-from . import get
-from . import release
-from . import repository
-from . import registry
-from . import search
-from . import show
-from . import package
-from . import plugin
+import importlib
+from typing import Any
 
 __all__ = [
     'basic',
+    'batch',
     'dependencies', 
     'get',
+    'jobs',
     'release',
     'repository',
     'registry',
     'search',
     'show',
     'package',
-    'plugin'
-]
\ No newline at end of file
+    'plugin',
+    'stats'
+]
+
+
+def __getattr__(name: str) -> Any:
+    # Command modules are imported on first use, so starting the server does not
+    # load every command and the optional dependencies behind them
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,11 +1,39 @@
 import logging
-from typing import Optional
-from ..core.utils import execute_helm_command
+from typing import List, Optional, Tuple
+from ..core.binary import environment_stamp, helm_binary
+from ..core.utils import execute_helm_command_with_status
 
 logger = logging.getLogger(__name__)
 
+ENV_COMMAND = ["helm", "env"]
+VERSION_COMMAND = ["helm", "version", "--short"]
 
-def helm_completion(shell: str) -> str:
+
+async def _helm_fact(cmd: List[str]) -> Tuple[str, bool]:
+    """
+    Runs a command whose output only depends on the helm binary and its
+    environment, answering from memory while neither has changed.
+    """
+    stamp = helm_binary.resolve(), environment_stamp()
+    output = helm_binary.fact(tuple(cmd), stamp)
+    if output is not None:
+        return output, True
+
+    output, ok = await execute_helm_command_with_status(cmd)
+    if ok:
+        helm_binary.store_fact(tuple(cmd), stamp, output)
+    return output, ok
+
+
+async def probe_helm() -> None:
+    """
+    Resolves the helm binary and caches its version and environment.
+    """
+    await _helm_fact(VERSION_COMMAND)
+    await _helm_fact(ENV_COMMAND)
+
+
+async def helm_completion(shell: str) -> Tuple[str, bool]:
     """
     Generates the autocompletion script for the specified shell.
     """
@@ -13,12 +41,12 @@ def helm_completion(shell: str) -> str:
 
     valid_shells = ["bash", "fish", "powershell", "zsh"]
     if shell not in valid_shells:
-        return f"Invalid shell: {shell}. Valid options are: {', '.join(valid_shells)}"
+        return f"Invalid shell: {shell}. Valid options are: {', '.join(valid_shells)}", False
 
-    return execute_helm_command(["helm", "completion", shell])
+    return await execute_helm_command_with_status(["helm", "completion", shell])
 
 
-def helm_create(name: str, starter: Optional[str] = None) -> str:
+async def helm_create(name: str, starter: Optional[str] = None) -> Tuple[str, bool]:
     """
     Creates a new chart with the given name.
     """
@@ -29,28 +57,28 @@ def helm_create(name: str, starter: Optional[str] = None) -> str:
     if starter:
         cmd.extend(["--starter", starter])
 
-    return execute_helm_command(cmd)
+    return await execute_helm_command_with_status(cmd)
 
 
-def helm_env() -> str:
+async def helm_env() -> Tuple[str, bool]:
     """
     Shows Helm's environment information.
     """
     logger.info("Running helm env")
 
-    return execute_helm_command(["helm", "env"])
+    return await _helm_fact(ENV_COMMAND)
 
 
-def helm_version() -> str:
+async def helm_version() -> Tuple[str, bool]:
     """
     Shows the Helm version information.
     """
     logger.info("Running helm version")
 
-    return execute_helm_command(["helm", "version", "--short"])
+    return await _helm_fact(VERSION_COMMAND)
 
 
-def helm_verify(path: str, keyring: Optional[str] = None) -> str:
+async def helm_verify(path: str, keyring: Optional[str] = None) -> Tuple[str, bool]:
     """
     Verifies that a chart at the given path has been signed and is valid.
     """
@@ -61,4 +89,4 @@ def helm_verify(path: str, keyring: Optional[str] = None) -> str:
     if keyring:
         cmd.extend(["--keyring", keyring])
 
-    return execute_helm_command(cmd)
\ No newline at end of file
+    return await execute_helm_command_with_status(cmd)
\ No newline at end of file
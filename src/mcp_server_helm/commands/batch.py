@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from ..core import config
+
+logger = logging.getLogger(__name__)
+
+FAILURE_POLICIES = ("stop", "continue")
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class _Step:
+    def __init__(self, step_id: str, tool: str, arguments: Dict[str, Any], depends_on: List[str]):
+        self.step_id = step_id
+        self.tool = tool
+        self.arguments = arguments
+        self.depends_on = depends_on
+        self.status: Optional[str] = None
+        self.output = ""
+        self.seconds = 0.0
+
+
+def _parse_steps(steps: List[Dict[str, Any]]) -> List[_Step]:
+    """
+    Validates batch steps and their dependency graph.
+
+    Raises ValueError for malformed steps, unknown or cyclic dependencies.
+    """
+    parsed: Dict[str, _Step] = {}
+    for position, step in enumerate(steps, 1):
+        if not isinstance(step, dict) or not isinstance(step.get("tool"), str):
+            raise ValueError(f"step {position} must be an object with a tool name")
+        if step["tool"] == "helm_batch":
+            raise ValueError(f"step {position} cannot be another helm_batch")
+
+        step_id = str(step.get("id") or f"step-{position}")
+        if step_id in parsed:
+            raise ValueError(f"duplicate step id {step_id!r}")
+
+        depends_on = [str(dependency) for dependency in step.get("depends_on") or []]
+        parsed[step_id] = _Step(step_id, step["tool"], dict(step.get("arguments") or {}), depends_on)
+
+    for step in parsed.values():
+        for dependency in step.depends_on:
+            if dependency not in parsed:
+                raise ValueError(f"step {step.step_id!r} depends on unknown step {dependency!r}")
+
+    # Kahn's algorithm; anything left unordered is part of a cycle
+    remaining = {step_id: len(set(step.depends_on)) for step_id, step in parsed.items()}
+    ready = [step_id for step_id, count in remaining.items() if count == 0]
+    ordered = 0
+    while ready:
+        done = ready.pop()
+        ordered += 1
+        for step in parsed.values():
+            if done in step.depends_on:
+                remaining[step.step_id] -= 1
+                if remaining[step.step_id] == 0:
+                    ready.append(step.step_id)
+    if ordered != len(parsed):
+        cyclic = sorted(step_id for step_id, count in remaining.items() if count > 0)
+        raise ValueError(f"dependency cycle between steps {', '.join(cyclic)}")
+
+    return list(parsed.values())
+
+
+def _format_batch(steps: List[_Step], seconds: float) -> str:
+    formatted_output = "BATCH RESULTS:\n\n"
+    formatted_output += "STEP\t\tTOOL\t\tSTATUS\t\tTIME\n"
+
+    for step in steps:
+        formatted_output += f"{step.step_id}\t\t{step.tool}\t\t{step.status}\t\t{step.seconds:.2f}s\n"
+
+    counts = {status: sum(1 for step in steps if step.status == status) for status in (SUCCEEDED, FAILED, SKIPPED)}
+    formatted_output += f"\n{counts[SUCCEEDED]} succeeded, {counts[FAILED]} failed, {counts[SKIPPED]} skipped "
+    formatted_output += f"in {seconds:.2f}s\n"
+
+    for step in steps:
+        formatted_output += f"\n--- {step.step_id} ({step.tool}): {step.status} ---\n"
+        formatted_output += step.output.rstrip("\n") + "\n"
+
+    return formatted_output
+
+
+async def helm_batch(steps: List[Dict[str, Any]],
+                     dispatch: Callable[[str, Dict[str, Any]], Awaitable[Tuple[str, bool]]],
+                     max_concurrency: Optional[int] = None, failure_policy: str = "stop") -> Tuple[str, bool]:
+    """
+    Runs several tool calls, in parallel where their dependencies allow.
+    """
+    logger.info(f"Running helm batch with {len(steps)} steps, max_concurrency={max_concurrency}, "
+                f"failure_policy={failure_policy}")
+
+    if failure_policy not in FAILURE_POLICIES:
+        return f"Error: failure_policy must be one of {', '.join(FAILURE_POLICIES)}", False
+
+    try:
+        parsed = _parse_steps(steps)
+    except ValueError as e:
+        return f"Error: invalid batch: {e}", False
+
+    by_id = {step.step_id: step for step in parsed}
+    finished = {step.step_id: asyncio.Event() for step in parsed}
+    slots = asyncio.Semaphore(max(1, max_concurrency or config.BATCH_CONCURRENCY))
+    stopping = False
+
+    async def run(step: _Step) -> None:
+        nonlocal stopping
+        try:
+            for dependency in step.depends_on:
+                await finished[dependency].wait()
+
+            failed = [dependency for dependency in step.depends_on if by_id[dependency].status != SUCCEEDED]
+            if failed:
+                step.status = SKIPPED
+                step.output = f"Skipped: dependency {', '.join(failed)} did not succeed."
+                return
+
+            async with slots:
+                if stopping:
+                    step.status = SKIPPED
+                    step.output = "Skipped: an earlier step failed."
+                    return
+
+                started = time.monotonic()
+                step.output, ok = await dispatch(step.tool, step.arguments)
+                step.seconds = time.monotonic() - started
+
+            step.status = SUCCEEDED if ok else FAILED
+            if step.status == FAILED and failure_policy == "stop":
+                stopping = True
+        finally:
+            finished[step.step_id].set()
+
+    started = time.monotonic()
+    await asyncio.gather(*(run(step) for step in parsed))
+    return _format_batch(parsed, time.monotonic() - started), all(step.status != FAILED for step in parsed)
@@ -1,31 +1,32 @@
 import logging
-from ..core.utils import execute_helm_command
+from typing import Tuple
+from ..core.utils import execute_helm_command_with_status
 
 logger = logging.getLogger(__name__)
 
 
-def helm_dependency_build(chart_path: str) -> str:
+async def helm_dependency_build(chart_path: str) -> Tuple[str, bool]:
     """
     Builds the chart's dependencies.
     """
     logger.info(f"Running helm dependency build for chart={chart_path}")
 
-    return execute_helm_command(["helm", "dependency", "build", chart_path])
+    return await execute_helm_command_with_status(["helm", "dependency", "build", chart_path])
 
 
-def helm_dependency_list(chart_path: str) -> str:
+async def helm_dependency_list(chart_path: str) -> Tuple[str, bool]:
     """
     Lists the dependencies for the given chart.
     """
     logger.info(f"Running helm dependency list for chart={chart_path}")
 
-    return execute_helm_command(["helm", "dependency", "list", chart_path])
+    return await execute_helm_command_with_status(["helm", "dependency", "list", chart_path])
 
 
-def helm_dependency_update(chart_path: str) -> str:
+async def helm_dependency_update(chart_path: str) -> Tuple[str, bool]:
     """
     Updates the chart's dependencies.
     """
     logger.info(f"Running helm dependency update for chart={chart_path}")
 
-    return execute_helm_command(["helm", "dependency", "update", chart_path])
\ No newline at end of file
+    return await execute_helm_command_with_status(["helm", "dependency", "update", chart_path])
\ No newline at end of file
@@ -1,53 +1,84 @@
+import os
 import logging
-from typing import Optional
-from ..core.utils import execute_helm_command
+from typing import List, Optional, Tuple
+from ..core import config
+from ..core.cache import DiskCache
+from ..core.utils import current_kube_context, effective_namespace, execute_helm_command_with_status
+from .release import latest_release
 
 logger = logging.getLogger(__name__)
 
+get_cache = DiskCache("get", os.path.join(config.STATE_DIR, "get-cache.sqlite3"), config.GET_CACHE_BYTES)
 
-def helm_get_all(release_name: str, namespace: Optional[str] = None) -> str:
-    """
-    Gets all information about a release.
+
+async def _get(subcommand: str, release_name: str, namespace: Optional[str], flags: List[str]) -> Tuple[str, bool]:
     """
-    logger.info(f"Running helm get all for release={release_name}, namespace={namespace}")
+    Runs `helm get <subcommand>` for the latest revision of a release, serving
+    repeated lookups from the on-disk get cache.
 
-    cmd = ["helm", "get", "all", release_name]
+    What helm get reports for a revision never changes, so results are cached
+    by revision. The key also carries the revision's last update time and
+    status, which tells a reinstalled release apart from its predecessor.
+    """
+    cmd = ["helm", "get", subcommand, release_name]
 
     if namespace:
         cmd.extend(["-n", namespace])
 
-    return execute_helm_command(cmd)
+    cmd.extend(flags)
+
+    release = await latest_release(release_name, namespace)
+    if release is None or not release.get("revision"):
+        # Let helm report missing releases
+        return await execute_helm_command_with_status(cmd)
+
+    revision = str(release["revision"])
+    key = (current_kube_context(), effective_namespace(namespace), release_name, revision,
+           release.get("updated", ""), release.get("status", ""), subcommand) + tuple(flags)
+
+    cached = get_cache.get(key)
+    if cached is not None:
+        logger.info(f"Serving helm get {subcommand} for {release_name} revision {revision} from cache")
+        return cached, True
+
+    # Pin the revision so the output matches the key even if a new one lands meanwhile
+    cmd.extend(["--revision", revision])
+    output, ok = await execute_helm_command_with_status(cmd)
 
+    if ok:
+        get_cache.put(key, output)
 
-def helm_get_hooks(release_name: str, namespace: Optional[str] = None) -> str:
+    return output, ok
+
+
+async def helm_get_all(release_name: str, namespace: Optional[str] = None) -> Tuple[str, bool]:
     """
-    Gets the hooks for a release.
+    Gets all information about a release.
     """
-    logger.info(f"Running helm get hooks for release={release_name}, namespace={namespace}")
+    logger.info(f"Running helm get all for release={release_name}, namespace={namespace}")
 
-    cmd = ["helm", "get", "hooks", release_name]
+    return await _get("all", release_name, namespace, [])
 
-    if namespace:
-        cmd.extend(["-n", namespace])
 
-    return execute_helm_command(cmd)
+async def helm_get_hooks(release_name: str, namespace: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Gets the hooks for a release.
+    """
+    logger.info(f"Running helm get hooks for release={release_name}, namespace={namespace}")
 
+    return await _get("hooks", release_name, namespace, [])
 
-def helm_get_manifest(release_name: str, namespace: Optional[str] = None) -> str:
+
+async def helm_get_manifest(release_name: str, namespace: Optional[str] = None) -> Tuple[str, bool]:
     """
     Gets the manifest for a release.
     """
     logger.info(f"Running helm get manifest for release={release_name}, namespace={namespace}")
 
-    cmd = ["helm", "get", "manifest", release_name]
-
-    if namespace:
-        cmd.extend(["-n", namespace])
-
-    return execute_helm_command(cmd)
+    return await _get("manifest", release_name, namespace, [])
 
 
-def helm_get_metadata(release_name: str, namespace: Optional[str] = None) -> str:
+async def helm_get_metadata(release_name: str, namespace: Optional[str] = None) -> Tuple[str, bool]:
     """
     Gets the metadata for a release.
     """
@@ -58,35 +89,27 @@ def helm_get_metadata(release_name: str, namespace: Optional[str] = None) -> str
     if namespace:
         cmd.extend(["-n", namespace])
 
-    return execute_helm_command(cmd)
+    return await execute_helm_command_with_status(cmd)
 
 
-def helm_get_notes(release_name: str, namespace: Optional[str] = None) -> str:
+async def helm_get_notes(release_name: str, namespace: Optional[str] = None) -> Tuple[str, bool]:
     """
     Gets the notes for a release.
     """
     logger.info(f"Running helm get notes for release={release_name}, namespace={namespace}")
 
-    cmd = ["helm", "get", "notes", release_name]
-
-    if namespace:
-        cmd.extend(["-n", namespace])
-
-    return execute_helm_command(cmd)
+    return await _get("notes", release_name, namespace, [])
 
 
-def helm_get_values(release_name: str, namespace: Optional[str] = None, all_values: bool = False) -> str:
+async def helm_get_values(release_name: str, namespace: Optional[str] = None, all_values: bool = False) -> Tuple[str, bool]:
     """
     Gets the values for a release.
     """
     logger.info(f"Running helm get values for release={release_name}, namespace={namespace}, all={all_values}")
 
-    cmd = ["helm", "get", "values", release_name]
-
-    if namespace:
-        cmd.extend(["-n", namespace])
+    flags = []
 
     if all_values:
-        cmd.append("--all")
+        flags.append("--all")
 
-    return execute_helm_command(cmd)
\ No newline at end of file
+    return await _get("values", release_name, namespace, flags)
\ No newline at end of file
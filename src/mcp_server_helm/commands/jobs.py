@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Tuple
+from ..core.jobs import RUNNING, SUCCEEDED, Job, job_manager
+
+logger = logging.getLogger(__name__)
+
+# Seconds helm_job_cancel waits for a cancelled job to stop
+CANCEL_WAIT = 10
+
+
+def _format_job(job: Job) -> str:
+    formatted_output = f"JOB ID: {job.job_id}\n"
+    formatted_output += f"TOOL: {job.tool}\n"
+    formatted_output += f"STATUS: {job.status}\n"
+    formatted_output += f"STARTED: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(job.started))}\n"
+    formatted_output += f"DURATION: {job.duration:.1f}s\n"
+
+    if job.log.lines:
+        formatted_output += "\nRECENT OUTPUT:\n"
+        formatted_output += "\n".join(job.log.lines) + "\n"
+
+    return formatted_output
+
+
+def _unknown_job(job_id: str) -> Tuple[str, bool]:
+    return f"Error: job {job_id} not found. Finished jobs are kept for a limited time.", False
+
+
+def helm_job_start(tool: str, call: Callable[[], Awaitable[Tuple[str, bool]]]) -> Tuple[str, bool]:
+    """
+    Runs a tool call in the background and returns its job ID.
+    """
+    logger.info(f"Starting background job for {tool}")
+
+    try:
+        job = job_manager.start(tool, call)
+    except RuntimeError as e:
+        return f"Error: {e}", False
+
+    formatted_output = "JOB STARTED:\n\n"
+    formatted_output += f"JOB ID: {job.job_id}\n"
+    formatted_output += f"TOOL: {tool}\n"
+    formatted_output += "\nUse helm_job_status or helm_job_result with this job ID to follow it.\n"
+    return formatted_output, True
+
+
+async def helm_job_status(job_id: str) -> Tuple[str, bool]:
+    """
+    Shows the state and recent output of a background job.
+    """
+    logger.info(f"Getting status of job {job_id}")
+
+    job = job_manager.get(job_id)
+    if job is None:
+        return _unknown_job(job_id)
+
+    return _format_job(job), True
+
+
+async def helm_job_result(job_id: str) -> Tuple[str, bool]:
+    """
+    Returns the output of a finished background job.
+    """
+    logger.info(f"Getting result of job {job_id}")
+
+    job = job_manager.get(job_id)
+    if job is None:
+        return _unknown_job(job_id)
+
+    if job.status == RUNNING:
+        return f"Job {job_id} is still running ({job.duration:.1f}s so far).", True
+
+    # A failed or cancelled job fails the call that fetches its result
+    return job.result or "", job.status == SUCCEEDED
+
+
+async def helm_job_cancel(job_id: str) -> Tuple[str, bool]:
+    """
+    Cancels a running background job.
+    """
+    logger.info(f"Cancelling job {job_id}")
+
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return _unknown_job(job_id)
+
+    if job.task is not None and not job.task.done():
+        await asyncio.wait([job.task], timeout=CANCEL_WAIT)
+
+    return _format_job(job), True
@@ -1,13 +1,15 @@
 import logging
-from typing import Dict, List, Optional
-from ..core.utils import execute_helm_command
+from typing import Dict, List, Optional, Tuple
+from ..core.repo_index import resolve_chart_version
+from ..core.utils import execute_helm_command_with_status
+from ..core.values import InlineValues, add_values_input
 
 logger = logging.getLogger(__name__)
 
 
-def helm_package(chart_path: str, destination: Optional[str] = None,
+async def helm_package(chart_path: str, destination: Optional[str] = None,
                  app_version: Optional[str] = None, version: Optional[str] = None,
-                 dependency_update: bool = False) -> str:
+                 dependency_update: bool = False) -> Tuple[str, bool]:
     """
     Packages a chart into a chart archive.
     """
@@ -27,11 +29,11 @@ def helm_package(chart_path: str, destination: Optional[str] = None,
     if dependency_update:
         cmd.append("--dependency-update")
 
-    return execute_helm_command(cmd)
+    return await execute_helm_command_with_status(cmd)
 
 
-def helm_push(chart_path: str, registry_url: str, force: bool = False,
-              insecure: bool = False, plain_http: bool = False) -> str:
+async def helm_push(chart_path: str, registry_url: str, force: bool = False,
+              insecure: bool = False, plain_http: bool = False) -> Tuple[str, bool]:
     """
     Pushes a chart to a registry.
     """
@@ -48,12 +50,12 @@ def helm_push(chart_path: str, registry_url: str, force: bool = False,
     if plain_http:
         cmd.append("--plain-http")
 
-    return execute_helm_command(cmd)
+    return await execute_helm_command_with_status(cmd)
 
 
-def helm_pull(chart: str, repo: Optional[str] = None, version: Optional[str] = None,
+async def helm_pull(chart: str, repo: Optional[str] = None, version: Optional[str] = None,
               destination: Optional[str] = None, untar: bool = False,
-              verify: bool = False, keyring: Optional[str] = None) -> str:
+              verify: bool = False, keyring: Optional[str] = None) -> Tuple[str, bool]:
     """
     Downloads a chart from a repository.
     """
@@ -66,6 +68,12 @@ def helm_pull(chart: str, repo: Optional[str] = None, version: Optional[str] = N
 
     cmd = ["helm", "pull", chart_ref]
 
+    # Pin the exact version from the cached repository index when it is known
+    resolved = await resolve_chart_version(chart, repo, version)
+    if resolved is not None:
+        logger.info(f"Resolved {chart_ref} version {version} to {resolved}")
+        version = resolved
+
     if version:
         cmd.extend(["--version", version])
 
@@ -81,10 +89,11 @@ def helm_pull(chart: str, repo: Optional[str] = None, version: Optional[str] = N
     if keyring:
         cmd.extend(["--keyring", keyring])
 
-    return execute_helm_command(cmd)
+    return await execute_helm_command_with_status(cmd)
 
 
-def helm_lint(chart_path: str, values_file: Optional[str] = None, set_values: Optional[Dict[str, str]] = None) -> str:
+async def helm_lint(chart_path: str, values_file: Optional[str] = None, set_values: Optional[Dict[str, str]] = None,
+                    values: Optional[InlineValues] = None) -> Tuple[str, bool]:
     """
     Runs a series of tests to verify that the chart is well-formed.
     """
@@ -96,17 +105,24 @@ def helm_lint(chart_path: str, values_file: Optional[str] = None, set_values: Op
     if values_file:
         cmd.extend(["-f", values_file])
 
+    # Add inline values if provided; helm reads them from stdin after the values file
+    try:
+        stdin_input = add_values_input(cmd, values)
+    except ValueError as e:
+        return f"Error: invalid values: {e}", False
+
     # Add set values if provided
     if set_values:
         for key, value in set_values.items():
             cmd.extend(["--set", f"{key}={value}"])
 
-    return execute_helm_command(cmd)
+    return await execute_helm_command_with_status(cmd, stdin_input)
 
 
-def helm_template(chart: str, release_name: Optional[str] = None, namespace: Optional[str] = None,
+async def helm_template(chart: str, release_name: Optional[str] = None, namespace: Optional[str] = None,
                   values_file: Optional[str] = None, set_values: Optional[Dict[str, str]] = None,
-                  api_versions: Optional[List[str]] = None, kube_version: Optional[str] = None) -> str:
+                  api_versions: Optional[List[str]] = None, kube_version: Optional[str] = None,
+                  values: Optional[InlineValues] = None) -> Tuple[str, bool]:
     """
     Renders chart templates locally and displays the output.
     """
@@ -129,6 +145,12 @@ def helm_template(chart: str, release_name: Optional[str] = None, namespace: Opt
     if values_file:
         cmd.extend(["-f", values_file])
 
+    # Add inline values if provided; helm reads them from stdin after the values file
+    try:
+        stdin_input = add_values_input(cmd, values)
+    except ValueError as e:
+        return f"Error: invalid values: {e}", False
+
     # Add set values if provided
     if set_values:
         for key, value in set_values.items():
@@ -143,4 +165,4 @@ def helm_template(chart: str, release_name: Optional[str] = None, namespace: Opt
     if kube_version:
         cmd.extend(["--kube-version", kube_version])
 
-    return execute_helm_command(cmd)
\ No newline at end of file
+    return await execute_helm_command_with_status(cmd, stdin_input)
\ No newline at end of file
@@ -1,11 +1,11 @@
 import logging
-from typing import Optional
-from ..core.utils import execute_helm_command
+from typing import Optional, Tuple
+from ..core.utils import execute_helm_command_with_status
 
 logger = logging.getLogger(__name__)
 
 
-def helm_plugin_install(plugin_url: str, version: Optional[str] = None) -> str:
+async def helm_plugin_install(plugin_url: str, version: Optional[str] = None) -> Tuple[str, bool]:
     """
     Installs a Helm plugin.
     """
@@ -16,31 +16,31 @@ def helm_plugin_install(plugin_url: str, version: Optional[str] = None) -> str:
     if version:
         cmd.extend(["--version", version])
 
-    return execute_helm_command(cmd)
+    return await execute_helm_command_with_status(cmd)
 
 
-def helm_plugin_list() -> str:
+async def helm_plugin_list() -> Tuple[str, bool]:
     """
     Lists Helm plugins.
     """
     logger.info("Running helm plugin list")
 
-    return execute_helm_command(["helm", "plugin", "list"])
+    return await execute_helm_command_with_status(["helm", "plugin", "list"])
 
 
-def helm_plugin_uninstall(plugin_name: str) -> str:
+async def helm_plugin_uninstall(plugin_name: str) -> Tuple[str, bool]:
     """
     Uninstalls a Helm plugin.
     """
     logger.info(f"Running helm plugin uninstall with plugin={plugin_name}")
 
-    return execute_helm_command(["helm", "plugin", "uninstall", plugin_name])
+    return await execute_helm_command_with_status(["helm", "plugin", "uninstall", plugin_name])
 
 
-def helm_plugin_update(plugin_name: str) -> str:
+async def helm_plugin_update(plugin_name: str) -> Tuple[str, bool]:
     """
     Updates a Helm plugin.
     """
     logger.info(f"Running helm plugin update with plugin={plugin_name}")
 
-    return execute_helm_command(["helm", "plugin", "update", plugin_name])
\ No newline at end of file
+    return await execute_helm_command_with_status(["helm", "plugin", "update", plugin_name])
\ No newline at end of file
@@ -1,11 +1,12 @@
 import logging
-from ..core.utils import execute_helm_command
+from typing import Tuple
+from ..core.utils import execute_helm_command_with_status
 
 logger = logging.getLogger(__name__)
 
 
-def helm_registry_login(registry_url: str, username: str, password: str,
-                        insecure: bool = False) -> str:
+async def helm_registry_login(registry_url: str, username: str, password: str,
+                        insecure: bool = False) -> Tuple[str, bool]:
     """
     Logs in to a registry.
     """
@@ -17,13 +18,13 @@ def helm_registry_login(registry_url: str, username: str, password: str,
     if insecure:
         cmd.append("--insecure")
 
-    return execute_helm_command(cmd, stdin_input=password)
+    return await execute_helm_command_with_status(cmd, stdin_input=password)
 
 
-def helm_registry_logout(registry_url: str) -> str:
+async def helm_registry_logout(registry_url: str) -> Tuple[str, bool]:
     """
     Logs out from a registry.
     """
     logger.info(f"Running helm registry logout with registry_url={registry_url}")
 
-    return execute_helm_command(["helm", "registry", "logout", registry_url])
\ No newline at end of file
+    return await execute_helm_command_with_status(["helm", "registry", "logout", registry_url])
\ No newline at end of file
@@ -1,15 +1,132 @@
+import asyncio
 import json
 import logging
-from typing import Dict, List, Optional
-from ..core.utils import execute_helm_command
+import random
+import re
+import time
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
+from ..core import config
+from ..core.cache import LRUCache
+from ..core.cursors import Delta, Entries, diff_entries, snapshots
+from ..core.deadlines import deadline_error, parse_duration, tool_deadline
+from ..core.locks import release_locks
+from ..core.progress import report_progress
+from ..core.utils import (current_kube_context, effective_namespace, execute_helm_command_with_status,
+                          execute_kubectl_command)
+from ..core.values import STDIN_VALUES, InlineValues, add_values_input, values_input
+from ..core.watch import release_watcher
 
 logger = logging.getLogger(__name__)
 
+# Namespace scope of `helm list --all-namespaces` results in the list cache
+ALL_NAMESPACES = "*"
 
-def helm_install(chart: str, release_name: Optional[str] = None, namespace: Optional[str] = None,
+list_cache = LRUCache("list", config.LIST_CACHE_BYTES)
+
+# Bumped whenever cached release lists are invalidated, so a list that was
+# running during a mutation does not cache its possibly stale output
+_list_generation = 0
+
+
+def _list_cache_key(namespace: Optional[str], all_namespaces: bool, flags: Tuple[str, ...]) -> Tuple:
+    scope = ALL_NAMESPACES if all_namespaces else effective_namespace(namespace)
+    return (current_kube_context(), scope) + flags
+
+
+def _invalidate_release_lists(namespace: Optional[str]) -> None:
+    """
+    Drops cached release lists that can contain releases of namespace.
+    """
+    global _list_generation
+    _list_generation += 1
+
+    context = current_kube_context()
+    scopes = (effective_namespace(namespace), ALL_NAMESPACES)
+    dropped = list_cache.invalidate(lambda key: key[0] == context and key[1] in scopes)
+    if dropped:
+        logger.info(f"Invalidated {dropped} cached release lists for namespace {scopes[0]}")
+
+
+async def _list_releases(cmd: List[str], namespace: Optional[str],
+                         all_namespaces: bool) -> Tuple[str, bool, Optional[float]]:
+    """
+    Runs a `helm list --output json` command through the list cache.
+
+    Returns the output, whether it succeeded and the age of the cached result,
+    or None as age when helm was run.
+    """
+    key = _list_cache_key(namespace, all_namespaces, tuple(cmd[4:]))
+    output = list_cache.get(key) if config.LIST_CACHE_TTL > 0 else None
+    if output is not None:
+        return output, True, list_cache.age(key)
+
+    generation = _list_generation
+    output, ok = await execute_helm_command_with_status(cmd)
+    if ok and config.LIST_CACHE_TTL > 0 and generation == _list_generation:
+        list_cache.put(key, output, ttl=config.LIST_CACHE_TTL)
+    return output, ok, None
+
+
+async def latest_release(release_name: str, namespace: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Returns the `helm list` entry of a release's latest revision in any state,
+    or None if the release does not exist or cannot be listed.
+    """
+    cmd = ["helm", "list", "--output", "json", "--all", "--filter", f"^{re.escape(release_name)}$"]
+
+    if namespace:
+        cmd.extend(["-n", namespace])
+
+    output, ok, _ = await _list_releases(cmd, namespace, False)
+    if not ok:
+        return None
+
+    try:
+        releases = json.loads(output)
+    except json.JSONDecodeError:
+        return None
+
+    for release in releases or []:
+        if release.get("name") == release_name:
+            return release
+    return None
+
+
+def _release_revision(release: Optional[Dict[str, Any]]) -> Optional[int]:
+    """
+    Returns the revision of a `helm list` entry, or None for a missing release.
+    """
+    if release is None:
+        return None
+    try:
+        return int(release.get("revision") or 0) or None
+    except ValueError:
+        return None
+
+
+async def _run_mutation(cmd: List[str], release_name: Optional[str], namespace: Optional[str],
+                        operation: str, stdin_input: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Runs a mutating helm command under the release's lock and invalidates the
+    cached release lists of its namespace afterwards. Failed operations can
+    record a revision as well, so lists are invalidated either way.
+
+    Returns the output and whether the command succeeded.
+    """
+    try:
+        # Generated names cannot collide with another in-flight operation
+        if release_name is None:
+            return await execute_helm_command_with_status(cmd, stdin_input)
+        async with release_locks.hold(release_name, namespace, operation):
+            return await execute_helm_command_with_status(cmd, stdin_input)
+    finally:
+        _invalidate_release_lists(namespace)
+
+
+async def helm_install(chart: str, release_name: Optional[str] = None, namespace: Optional[str] = None,
                  values_file: Optional[str] = None, set_values: Optional[Dict[str, str]] = None,
                  description: Optional[str] = None, timeout: Optional[str] = None,
-                 wait: bool = False, atomic: bool = False) -> str:
+                 wait: bool = False, atomic: bool = False, values: Optional[InlineValues] = None) -> Tuple[str, bool]:
     """
     Installs a Helm chart.
     """
@@ -35,6 +152,12 @@ def helm_install(chart: str, release_name: Optional[str] = None, namespace: Opti
     if values_file:
         cmd.extend(["-f", values_file])
 
+    # Add inline values if provided; helm reads them from stdin after the values file
+    try:
+        stdin_input = add_values_input(cmd, values)
+    except ValueError as e:
+        return f"Error: invalid values: {e}", False
+
     # Add set values if provided
     if set_values:
         for key, value in set_values.items():
@@ -59,7 +182,7 @@ def helm_install(chart: str, release_name: Optional[str] = None, namespace: Opti
     # Add output format
     cmd.extend(["--output", "json"])
 
-    output = execute_helm_command(cmd)
+    output, ok = await _run_mutation(cmd, release_name or None, namespace, "install", stdin_input)
 
     try:
         # Try to parse JSON output
@@ -76,21 +199,39 @@ def helm_install(chart: str, release_name: Optional[str] = None, namespace: Opti
             formatted_output += "\nNOTES:\n"
             formatted_output += notes
 
-        return formatted_output
+        return formatted_output, ok
     except json.JSONDecodeError:
         # If output is not JSON, return raw output
-        return f"Installation output:\n{output}"
+        return f"Installation output:\n{output}", ok
 
 
-def helm_upgrade(release_name: str, chart: str, namespace: Optional[str] = None,
+async def helm_upgrade(release_name: str, chart: str, namespace: Optional[str] = None,
                  values_file: Optional[str] = None, set_values: Optional[Dict[str, str]] = None,
                  install: bool = False, force: bool = False, atomic: bool = False,
-                 timeout: Optional[str] = None, wait: bool = False) -> str:
+                 timeout: Optional[str] = None, wait: bool = False, values: Optional[InlineValues] = None) -> Tuple[str, bool]:
     """
     Upgrades a release.
     """
     logger.info(f"Running helm upgrade with release={release_name}, chart={chart}")
 
+    try:
+        stdin_values = values_input(values) if values is not None else None
+    except ValueError as e:
+        return f"Error: invalid values: {e}", False
+
+    return await _upgrade_release(release_name, chart, namespace, values_file, set_values,
+                                  install, force, atomic, timeout, wait, stdin_values)
+
+
+async def _upgrade_release(release_name: str, chart: str, namespace: Optional[str] = None,
+                           values_file: Optional[str] = None, set_values: Optional[Dict[str, str]] = None,
+                           install: bool = False, force: bool = False, atomic: bool = False,
+                           timeout: Optional[str] = None, wait: bool = False,
+                           stdin_values: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Runs helm upgrade and returns the formatted output and whether it succeeded.
+    stdin_values are serialized inline values, passed to helm as `-f -`.
+    """
     cmd = ["helm", "upgrade", release_name, chart]
 
     if namespace:
@@ -99,6 +240,9 @@ def helm_upgrade(release_name: str, chart: str, namespace: Optional[str] = None,
     if values_file:
         cmd.extend(["-f", values_file])
 
+    if stdin_values is not None:
+        cmd.extend(STDIN_VALUES)
+
     if set_values:
         for key, value in set_values.items():
             cmd.extend(["--set", f"{key}={value}"])
@@ -120,7 +264,7 @@ def helm_upgrade(release_name: str, chart: str, namespace: Optional[str] = None,
 
     cmd.extend(["--output", "json"])
 
-    output = execute_helm_command(cmd)
+    output, ok = await _run_mutation(cmd, release_name, namespace, "upgrade", stdin_values)
 
     try:
         # Try to parse JSON output
@@ -137,14 +281,130 @@ def helm_upgrade(release_name: str, chart: str, namespace: Optional[str] = None,
             formatted_output += "\nNOTES:\n"
             formatted_output += notes
 
-        return formatted_output
+        return formatted_output, ok
     except json.JSONDecodeError:
         # If output is not JSON, return raw output
-        return f"Upgrade output:\n{output}"
+        return f"Upgrade output:\n{output}", ok
 
 
-def helm_uninstall(release_name: str, namespace: Optional[str] = None,
-                   keep_history: bool = False, no_hooks: bool = False) -> str:
+async def helm_upgrade_many(releases: List[Dict[str, str]], chart: str, values_file: Optional[str] = None,
+                            set_values: Optional[Dict[str, str]] = None, install: bool = False,
+                            force: bool = False, atomic: bool = False, timeout: Optional[str] = None,
+                            wait: bool = False, wave_size: Optional[int] = None,
+                            max_concurrency: Optional[int] = None, max_failures: int = 0,
+                            rollback_failed: bool = False, values: Optional[InlineValues] = None) -> Tuple[str, bool]:
+    """
+    Upgrades many releases to the same chart and values, wave by wave.
+    """
+    logger.info(f"Running helm upgrade for {len(releases)} releases with chart={chart}, wave_size={wave_size}, "
+                f"max_failures={max_failures}, rollback_failed={rollback_failed}")
+
+    targets = list(dict.fromkeys((release["release_name"], release.get("namespace")) for release in releases))
+    if not targets:
+        return "No releases to upgrade.", True
+
+    # Serialized once and streamed to every upgrade
+    try:
+        stdin_values = values_input(values) if values is not None else None
+    except ValueError as e:
+        return f"Error: invalid values: {e}", False
+
+    wave_size = max(1, wave_size or config.UPGRADE_WAVE_SIZE)
+    slots = asyncio.Semaphore(max(1, max_concurrency or wave_size))
+    deadline = tool_deadline("helm_upgrade", {"timeout": timeout})
+    waves = [targets[i:i + wave_size] for i in range(0, len(targets), wave_size)]
+
+    # (wave, release, namespace, result, seconds, detail)
+    report: List[Tuple[int, str, str, str, float, str]] = []
+    failures = 0
+
+    async def run(tool: str, call: Awaitable[Tuple[str, bool]]) -> Tuple[bool, float, str]:
+        async with slots:
+            started = time.monotonic()
+            try:
+                output, ok = await asyncio.wait_for(call, deadline)
+            except asyncio.TimeoutError:
+                output, ok = deadline_error(tool, deadline), False
+            return ok, time.monotonic() - started, output
+
+    def upgrade(release_name: str, namespace: Optional[str]) -> Awaitable[Tuple[bool, float, str]]:
+        return run("helm_upgrade", _upgrade_release(release_name, chart, namespace, values_file, set_values,
+                                                    install, force, atomic, timeout, wait, stdin_values))
+
+    async def rollback(release_name: str, namespace: Optional[str],
+                       previous: Optional[int]) -> Tuple[Optional[bool], float, str]:
+        # Only a revision left behind by the failed upgrade is undone, back to the one recorded before it.
+        # Upgrades that never reached the release and atomic upgrades helm rolled back come back as None.
+        release = await latest_release(release_name, namespace)
+        current = _release_revision(release)
+        if previous is None:
+            return None, 0.0, "no earlier revision to roll back to"
+        if current is None or current <= previous:
+            return None, 0.0, f"revision {previous} left in place"
+        if release.get("status") == "deployed":
+            return None, 0.0, f"revision {current} is deployed"
+        return await run("helm_rollback", _rollback_release(release_name, previous, namespace, timeout, wait))
+
+    for number, wave in enumerate(waves, 1):
+        if failures > max_failures:
+            for release_name, namespace in wave:
+                report.append((number, release_name, effective_namespace(namespace), "skipped", 0.0,
+                               "failure threshold exceeded"))
+            continue
+
+        # Revisions before the wave tell a failed upgrade's revision apart from one it never recorded
+        previous: Dict[Tuple[str, Optional[str]], Optional[int]] = {}
+        if rollback_failed:
+            found = await asyncio.gather(*(latest_release(name, ns) for name, ns in wave))
+            previous = {target: _release_revision(release) for target, release in zip(wave, found)}
+
+        results = await asyncio.gather(*(upgrade(name, ns) for name, ns in wave))
+        failed = [(name, ns) for (name, ns), (ok, _, _) in zip(wave, results) if not ok]
+        failures += len(failed)
+
+        rollbacks: Dict[Tuple[str, Optional[str]], Tuple[Optional[bool], float, str]] = {}
+        if rollback_failed and failed:
+            rollback_results = await asyncio.gather(*(rollback(name, ns, previous[(name, ns)])
+                                                      for name, ns in failed))
+            rollbacks = dict(zip(failed, rollback_results))
+
+        for (release_name, namespace), (ok, seconds, output) in zip(wave, results):
+            if ok:
+                outcome, detail = "upgraded", ""
+            else:
+                outcome, detail = "failed", output.strip().splitlines()[-1] if output.strip() else ""
+                if (release_name, namespace) in rollbacks:
+                    rolled_back, rollback_seconds, rollback_output = rollbacks[(release_name, namespace)]
+                    seconds += rollback_seconds
+                    if rolled_back is None:
+                        detail = f"{detail} (not rolled back: {rollback_output})"
+                    else:
+                        outcome = "rolled back" if rolled_back else "rollback failed"
+                        if not rolled_back:
+                            detail = rollback_output.strip().splitlines()[-1] if rollback_output.strip() else detail
+            report.append((number, release_name, effective_namespace(namespace), outcome, seconds, detail))
+
+        logger.info(f"Upgrade wave {number}/{len(waves)} finished with {len(failed)} failures")
+
+    counts: Dict[str, int] = {}
+    for row in report:
+        counts[row[3]] = counts.get(row[3], 0) + 1
+
+    formatted_output = f"UPGRADE REPORT: {len(targets)} releases in {len(waves)} waves, "
+    formatted_output += ", ".join(f"{count} {outcome}" for outcome, count in counts.items()) + "\n"
+    if failures > max_failures:
+        formatted_output += f"Stopped after {failures} failures (threshold {max_failures}).\n"
+
+    formatted_output += "\nWAVE\t\tNAME\t\tNAMESPACE\t\tRESULT\t\tTIME\t\tDETAIL\n"
+    for number, release_name, namespace, outcome, seconds, detail in report:
+        formatted_output += f"{number}\t\t{release_name}\t\t{namespace}\t\t{outcome}\t\t{seconds:.2f}s\t\t{detail}\n"
+
+    # A release that failed to upgrade fails the whole call, even if it was rolled back
+    return formatted_output, failures == 0
+
+
+async def helm_uninstall(release_name: str, namespace: Optional[str] = None,
+                   keep_history: bool = False, no_hooks: bool = False) -> Tuple[str, bool]:
     """
     Uninstalls a release.
     """
@@ -161,16 +421,25 @@ def helm_uninstall(release_name: str, namespace: Optional[str] = None,
     if no_hooks:
         cmd.append("--no-hooks")
 
-    return execute_helm_command(cmd)
+    return await _run_mutation(cmd, release_name, namespace, "uninstall")
 
 
-def helm_rollback(release_name: str, revision: Optional[int] = None, namespace: Optional[str] = None,
-                  timeout: Optional[str] = None, wait: bool = False, force: bool = False) -> str:
+async def helm_rollback(release_name: str, revision: Optional[int] = None, namespace: Optional[str] = None,
+                  timeout: Optional[str] = None, wait: bool = False, force: bool = False) -> Tuple[str, bool]:
     """
     Rolls back a release to a previous revision.
     """
     logger.info(f"Running helm rollback with release={release_name}, revision={revision}")
 
+    return await _rollback_release(release_name, revision, namespace, timeout, wait, force)
+
+
+async def _rollback_release(release_name: str, revision: Optional[int] = None, namespace: Optional[str] = None,
+                            timeout: Optional[str] = None, wait: bool = False,
+                            force: bool = False) -> Tuple[str, bool]:
+    """
+    Runs helm rollback and returns the output and whether it succeeded.
+    """
     cmd = ["helm", "rollback", release_name]
 
     if revision is not None:
@@ -188,14 +457,19 @@ def helm_rollback(release_name: str, revision: Optional[int] = None, namespace:
     if force:
         cmd.append("--force")
 
-    return execute_helm_command(cmd)
+    return await _run_mutation(cmd, release_name, namespace, "rollback")
 
 
-def helm_history(release_name: str, namespace: Optional[str] = None, max_: Optional[int] = None) -> str:
+async def helm_history(release_name: str, namespace: Optional[str] = None, max_: Optional[int] = None,
+                       delta: bool = False, cursor: Optional[str] = None) -> Tuple[str, bool]:
     """
     Gets the release history.
+
+    In delta mode the history ends with a cursor, and a call passing that
+    cursor only returns the revisions added, removed or changed since.
     """
-    logger.info(f"Running helm history for release={release_name}, namespace={namespace}, max={max_}")
+    logger.info(f"Running helm history for release={release_name}, namespace={namespace}, max={max_}, "
+                f"delta={delta or cursor is not None}")
 
     cmd = ["helm", "history", release_name]
 
@@ -205,15 +479,58 @@ def helm_history(release_name: str, namespace: Optional[str] = None, max_: Optio
     if max_:
         cmd.extend(["--max", str(max_)])
 
-    return execute_helm_command(cmd)
+    if not delta and cursor is None:
+        return await execute_helm_command_with_status(cmd)
 
+    output, ok = await execute_helm_command_with_status(cmd + ["--output", "json"])
+    if not ok:
+        return output, False
 
-def helm_status(release_name: str, namespace: Optional[str] = None, revision: Optional[int] = None) -> str:
-    """
-    Displays the status of the named release.
-    """
-    logger.info(f"Running helm status with release={release_name}, namespace={namespace}")
+    try:
+        revisions = json.loads(output) or []
+    except json.JSONDecodeError:
+        return f"Release history:\n{output}", True
+
+    by_key = {str(revision.get("revision", "")): revision for revision in revisions}
+    current: Entries = {key: (revision.get("status", ""),) for key, revision in by_key.items()}
+    scope = ("helm_history", current_kube_context(), effective_namespace(namespace), release_name, max_)
+    previous = snapshots.load(cursor, scope) if cursor else None
+    new_cursor = snapshots.save(scope, current)
+
+    columns = ("revision", "updated", "status", "chart", "app_version", "description")
+    header = "\t\t".join(field.replace("_", " ").upper() for field in columns) + "\n"
+
+    def row(revision: Dict[str, Any]) -> str:
+        return "\t\t".join(str(revision.get(field, 'N/A')) for field in columns) + "\n"
+
+    if previous is None:
+        formatted_output = "RELEASE HISTORY:\n\n" + header
+        for revision in revisions:
+            formatted_output += row(revision)
+        if cursor:
+            formatted_output += "\nCursor expired or unknown, listing the whole history.\n"
+        formatted_output += f"\nCursor: {new_cursor}\n"
+        return formatted_output, True
+
+    changes = diff_entries(previous, current)
+    if not (changes.added or changes.removed or changes.changed):
+        return f"No history changes.\n\nCursor: {new_cursor}\n", True
 
+    rows = [(key, "added", by_key[key]) for key in changes.added]
+    rows += [(key, "changed", by_key[key]) for key in changes.changed]
+    rows += [(key, "removed", {"revision": key, "status": previous[key][0]}) for key in changes.removed]
+
+    formatted_output = "HISTORY CHANGES:\n\nCHANGE\t\t" + header
+    for _, change, revision in sorted(rows, key=lambda item: int(item[0]) if item[0].isdigit() else 0):
+        formatted_output += f"{change}\t\t" + row(revision)
+
+    formatted_output += f"\n{len(changes.added)} added, {len(changes.changed)} changed, "
+    formatted_output += f"{len(changes.removed)} removed.\n"
+    formatted_output += f"\nCursor: {new_cursor}\n"
+    return formatted_output, True
+
+
+def _status_command(release_name: str, namespace: Optional[str] = None, revision: Optional[int] = None) -> List[str]:
     cmd = ["helm", "status", release_name, "--output", "json"]
 
     if namespace:
@@ -222,44 +539,310 @@ def helm_status(release_name: str, namespace: Optional[str] = None, revision: Op
     if revision:
         cmd.extend(["--revision", str(revision)])
 
-    output = execute_helm_command(cmd)
+    return cmd
+
 
+def _parse_status(output: str) -> Optional[Dict[str, Any]]:
+    """
+    Parses `helm status --output json` output, returning None if it is not JSON.
+    """
     try:
         status = json.loads(output)
+    except json.JSONDecodeError:
+        return None
+    return status if isinstance(status, dict) else None
 
-        formatted_output = f"STATUS: {status.get('info', {}).get('status', 'N/A')}\n"
-        formatted_output += f"NAME: {status.get('name', 'N/A')}\n"
-        formatted_output += f"NAMESPACE: {status.get('namespace', 'N/A')}\n"
-        formatted_output += f"REVISION: {status.get('version', 'N/A')}\n"
-        formatted_output += f"LAST DEPLOYED: {status.get('info', {}).get('last_deployed', 'N/A')}\n"
 
-        # Add notes if available
-        notes = status.get('info', {}).get('notes')
-        if notes:
-            formatted_output += "\nNOTES:\n"
-            formatted_output += notes
+async def helm_status(release_name: str, namespace: Optional[str] = None, revision: Optional[int] = None) -> Tuple[str, bool]:
+    """
+    Displays the status of the named release.
+    """
+    logger.info(f"Running helm status with release={release_name}, namespace={namespace}")
 
-        return formatted_output
-    except json.JSONDecodeError:
+    output, ok = await execute_helm_command_with_status(_status_command(release_name, namespace, revision))
+
+    status = _parse_status(output)
+    if status is None:
         # If output is not JSON, return raw output
-        return f"Status output:\n{output}"
+        return f"Status output:\n{output}", ok
+
+    formatted_output = f"STATUS: {status.get('info', {}).get('status', 'N/A')}\n"
+    formatted_output += f"NAME: {status.get('name', 'N/A')}\n"
+    formatted_output += f"NAMESPACE: {status.get('namespace', 'N/A')}\n"
+    formatted_output += f"REVISION: {status.get('version', 'N/A')}\n"
+    formatted_output += f"LAST DEPLOYED: {status.get('info', {}).get('last_deployed', 'N/A')}\n"
+
+    # Add notes if available
+    notes = status.get('info', {}).get('notes')
+    if notes:
+        formatted_output += "\nNOTES:\n"
+        formatted_output += notes
+
+    return formatted_output, True
+
+
+async def _resolve_releases(namespace: Optional[str], all_namespaces: bool, selector: Optional[str],
+                            filter_: Optional[str]) -> Tuple[List[Tuple[str, Optional[str]]], Optional[str]]:
+    """
+    Resolves releases matching a namespace, label selector and name filter
+    through `helm list`. Returns (release, namespace) pairs and an error, if any.
+    """
+    cmd = ["helm", "list", "--output", "json", "--max", "0"]
+
+    if all_namespaces:
+        cmd.append("--all-namespaces")
+    elif namespace:
+        cmd.extend(["-n", namespace])
+
+    if selector:
+        cmd.extend(["--selector", selector])
+
+    if filter_:
+        cmd.extend(["-f", filter_])
+
+    output, ok, _ = await _list_releases(cmd, namespace, all_namespaces)
+    if not ok:
+        return [], output
+
+    try:
+        releases = json.loads(output) or []
+    except json.JSONDecodeError:
+        return [], f"Error: unexpected helm list output:\n{output}"
 
+    return [(release.get("name", ""), release.get("namespace") or namespace) for release in releases], None
+
+
+async def helm_status_many(releases: Optional[List[Dict[str, str]]] = None, namespace: Optional[str] = None,
+                           all_namespaces: bool = False, selector: Optional[str] = None,
+                           filter_: Optional[str] = None, max_concurrency: Optional[int] = None) -> Tuple[str, bool]:
+    """
+    Displays the status of many releases at once.
+    """
+    logger.info(f"Running helm status for many releases with releases={releases}, namespace={namespace}, "
+                f"all_namespaces={all_namespaces}, selector={selector}, filter={filter_}")
+
+    if releases:
+        targets = [(release["release_name"], release.get("namespace") or namespace) for release in releases]
+    else:
+        targets, error = await _resolve_releases(namespace, all_namespaces, selector, filter_)
+        if error is not None:
+            return error, False
+
+    if not targets:
+        return "No releases found.", True
+
+    slots = asyncio.Semaphore(max(1, max_concurrency or config.STATUS_CONCURRENCY))
+
+    async def query(release_name: str, release_namespace: Optional[str]) -> Tuple[str, str, Optional[Dict[str, Any]], str]:
+        async with slots:
+            output, ok = await execute_helm_command_with_status(_status_command(release_name, release_namespace))
+        status = _parse_status(output) if ok else None
+        return release_name, effective_namespace(release_namespace), status, output
+
+    results = await asyncio.gather(*(query(name, ns) for name, ns in dict.fromkeys(targets)))
+
+    failures = [(name, ns, output) for name, ns, status, output in results if status is None]
+    rows = [(name, ns, status) for name, ns, status, _ in results if status is not None]
+    # Releases that are not deployed come first, like query failures
+    rows.sort(key=lambda row: (row[2].get("info", {}).get("status") == "deployed", row[1], row[0]))
+    unhealthy = sum(1 for _, _, status in rows if status.get("info", {}).get("status") != "deployed")
+
+    formatted_output = f"RELEASE STATUS: {len(results)} releases, {len(failures)} failed queries, "
+    formatted_output += f"{unhealthy} not deployed\n"
+
+    if failures:
+        formatted_output += "\nFAILED QUERIES:\n\n"
+        formatted_output += "NAME\t\tNAMESPACE\t\tERROR\n"
+        for name, ns, output in failures:
+            error = output.strip().splitlines()[-1] if output.strip() else "N/A"
+            formatted_output += f"{name}\t\t{ns}\t\t{error}\n"
+
+    if rows:
+        formatted_output += "\nNAME\t\tNAMESPACE\t\tREVISION\t\tSTATUS\t\tLAST DEPLOYED\n"
+        for name, ns, status in rows:
+            formatted_output += f"{status.get('name', name)}\t\t"
+            formatted_output += f"{status.get('namespace', ns)}\t\t"
+            formatted_output += f"{status.get('version', 'N/A')}\t\t"
+            formatted_output += f"{status.get('info', {}).get('status', 'N/A')}\t\t"
+            formatted_output += f"{status.get('info', {}).get('last_deployed', 'N/A')}\n"
+
+    return formatted_output, not failures
+
+
+# First pause between two polls of helm_wait_status; it doubles up to WAIT_MAX_INTERVAL
+WAIT_FIRST_INTERVAL = 1.0
+
+
+async def helm_wait_status(release_name: str, namespace: Optional[str] = None, status: str = "deployed",
+                           revision: Optional[int] = None, timeout: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Waits until a release reaches a status, and optionally a revision, or the timeout expires.
+    """
+    logger.info(f"Waiting for release={release_name}, namespace={namespace} to reach status={status}, "
+                f"revision={revision}, timeout={timeout}")
 
-def helm_list(namespace: Optional[str] = None, all_namespaces: bool = False,
+    wait_seconds = float(config.WAIT_TIMEOUT)
+    if timeout:
+        parsed = parse_duration(timeout)
+        if parsed is None:
+            return f"Error: invalid timeout {timeout!r}, expected a duration such as 90s or 5m", False
+        wait_seconds = parsed
+
+    started = time.monotonic()
+    deadline = started + wait_seconds
+    interval = WAIT_FIRST_INTERVAL
+    polls = 0
+    seen: Optional[Tuple[str, str]] = None
+    target = f"status {status}" + (f" at revision {revision} or later" if revision else "")
+
+    # Any poll started after this waiter last looked can answer it
+    newer_than = started
+
+    with release_watcher.waiting(namespace):
+        while True:
+            releases, error = await release_watcher.releases(namespace, newer_than)
+            newer_than = time.monotonic()
+            polls += 1
+            if error is not None:
+                return error, False
+
+            release = next((item for item in releases or [] if item.get("name") == release_name), None)
+            if release is not None:
+                current = (str(release.get("revision", "")), release.get("status", ""))
+                if current != seen:
+                    seen = current
+                    await report_progress(f"{release_name}: revision {current[0]}, status {current[1]}")
+
+                reached_revision = revision is None or int(current[0] or 0) >= revision
+                if reached_revision and current[1] == status:
+                    formatted_output = "RELEASE REACHED TARGET:\n\n"
+                    formatted_output += "NAME\t\tNAMESPACE\t\tREVISION\t\tSTATUS\t\tWAITED\t\tPOLLS\n"
+                    formatted_output += f"{release_name}\t\t{release.get('namespace', 'N/A')}\t\t{current[0]}\t\t"
+                    formatted_output += f"{current[1]}\t\t{time.monotonic() - started:.1f}s\t\t{polls}\n"
+                    return formatted_output, True
+
+                # A failed release stays failed until someone acts on it
+                if reached_revision and current[1] == "failed":
+                    return (f"Error: release {release_name} failed at revision {current[0]} "
+                            f"while waiting for {target}"), False
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                last_seen = f"last seen at revision {seen[0]} with status {seen[1]}" if seen else "release not found"
+                return (f"Error: release {release_name} did not reach {target} within {wait_seconds:.0f}s "
+                        f"({last_seen}, {polls} polls)"), False
+
+            # Jitter keeps waiters that started together from polling in lockstep
+            await asyncio.sleep(min(remaining, interval * random.uniform(0.5, 1.0)))
+            interval = min(interval * 2, float(config.WAIT_MAX_INTERVAL))
+
+
+# Release fields helm_list can sort by and project
+LIST_FIELDS = ("name", "namespace", "revision", "updated", "status", "chart", "app_version")
+
+# Columns shown when no fields are requested
+DEFAULT_LIST_FIELDS = ("name", "namespace", "revision", "status", "chart", "app_version")
+
+# Sort orders helm list applies itself, so pagination can be left to helm
+_HELM_SORTS = {None: [], "name": [], "updated": ["--date"]}
+
+
+def _list_sort_key(field: str):
+    if field == "revision":
+        return lambda release: (int(release.get("revision") or 0), release.get("name", ""))
+    return lambda release: (str(release.get(field) or ""), release.get("name", ""), release.get("namespace", ""))
+
+
+async def _discover_namespaces() -> Optional[List[str]]:
+    """
+    Returns the namespaces of the current kube context through kubectl, or None
+    if they cannot be listed.
+    """
+    cmd = ["kubectl", "get", "namespaces", "-o", "jsonpath={.items[*].metadata.name}"]
+
+    if current_kube_context():
+        cmd.extend(["--context", current_kube_context()])
+
+    output, ok = await execute_kubectl_command(cmd)
+    if not ok:
+        logger.info(f"Could not discover namespaces, listing all namespaces at once: {output.strip()}")
+        return None
+    return output.split()
+
+
+async def _list_shards(cmd: List[str], namespaces: List[str]
+                       ) -> Tuple[List[Dict[str, Any]], Dict[str, str], Optional[float]]:
+    """
+    Lists releases of each namespace in parallel and merges them.
+
+    Returns the releases, the errors of namespaces that could not be listed and
+    the age of the oldest cached shard, if any shard came from the cache.
+    """
+    async def shard(namespace: str) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[float]]:
+        output, ok, age = await _list_releases(cmd + ["-n", namespace], namespace, False)
+        if not ok:
+            return [], output.strip(), age
+        try:
+            return json.loads(output) or [], None, age
+        except json.JSONDecodeError:
+            return [], f"unexpected helm list output: {output.strip()}", age
+
+    results = await asyncio.gather(*(shard(namespace) for namespace in namespaces))
+
+    releases: List[Dict[str, Any]] = []
+    errors: Dict[str, str] = {}
+    ages = []
+    for namespace, (shard_releases, error, age) in zip(namespaces, results):
+        releases.extend(shard_releases)
+        if error is not None:
+            errors[namespace] = error
+        if age is not None:
+            ages.append(age)
+    return releases, errors, max(ages) if ages else None
+
+
+async def helm_list(namespace: Optional[str] = None, all_namespaces: bool = False,
               filter_: Optional[str] = None, uninstalled: bool = False,
-              deployed: bool = False, failed: bool = False) -> str:
+              deployed: bool = False, failed: bool = False,
+              namespaces: Optional[List[str]] = None, shard: bool = False,
+              limit: Optional[int] = None, offset: int = 0, sort_by: Optional[str] = None,
+              reverse: bool = False, fields: Optional[List[str]] = None,
+              delta: bool = False, cursor: Optional[str] = None) -> Tuple[str, bool]:
     """
     Lists all Helm releases.
+
+    With namespaces, or with shard and all_namespaces, each namespace is listed
+    by its own helm process and the results are merged. limit and offset page
+    through the sorted releases.
+
+    Whenever the server sorts or pages the releases itself (sharded lists,
+    delta calls and sorts helm cannot do), helm is asked for every release
+    with --max 0 rather than its default of the first 256.
+
+    In delta mode the list ends with a cursor, and a call passing that cursor
+    only returns the releases added, removed or changed since.
     """
-    logger.info(f"Running helm list with namespace={namespace}, all_namespaces={all_namespaces}")
+    logger.info(f"Running helm list with namespace={namespace}, all_namespaces={all_namespaces}, "
+                f"namespaces={namespaces}, shard={shard}, limit={limit}, offset={offset}, sort_by={sort_by}")
 
-    cmd = ["helm", "list", "--output", "json"]
+    if sort_by is not None and sort_by not in LIST_FIELDS:
+        return f"Error: sort_by must be one of {', '.join(LIST_FIELDS)}", False
 
-    if namespace and not all_namespaces:
-        cmd.extend(["-n", namespace])
+    columns = list(dict.fromkeys(fields or DEFAULT_LIST_FIELDS))
+    unknown = [field for field in columns if field not in LIST_FIELDS]
+    if unknown:
+        return f"Error: unknown fields {', '.join(unknown)}; fields must be among {', '.join(LIST_FIELDS)}", False
 
-    if all_namespaces:
-        cmd.append("--all-namespaces")
+    if limit is not None and limit < 1:
+        return "Error: limit must be at least 1", False
+    if offset < 0:
+        return "Error: offset must not be negative", False
+
+    tracking = delta or cursor is not None
+    if tracking and (limit is not None or offset):
+        return "Error: limit and offset cannot be combined with delta mode", False
+
+    cmd = ["helm", "list", "--output", "json"]
 
     if filter_:
         cmd.extend(["-f", filter_])
@@ -273,34 +856,165 @@ def helm_list(namespace: Optional[str] = None, all_namespaces: bool = False,
     if failed:
         cmd.append("--failed")
 
-    output = execute_helm_command(cmd)
+    # Cursors are only valid for the query they were issued for
+    if namespaces:
+        list_scope = tuple(sorted(set(namespaces)))
+    else:
+        list_scope = (ALL_NAMESPACES if all_namespaces else effective_namespace(namespace),)
+    scope = ("helm_list", current_kube_context()) + list_scope + tuple(cmd[4:])
+
+    if not namespaces and shard and all_namespaces:
+        namespaces = await _discover_namespaces()
+
+    errors: Dict[str, str] = {}
+    paged_by_helm = False
+    has_more = False
+    total: Optional[int] = None
+
+    if namespaces:
+        # Shards are merged here, so sorting and paging happen here as well
+        releases, errors, age = await _list_shards(cmd + ["--max", "0"], list(dict.fromkeys(namespaces)))
+        if errors and len(errors) == len(set(namespaces)):
+            return "\n".join(f"Error listing namespace {ns}: {error}" for ns, error in errors.items()), False
+    else:
+        if namespace and not all_namespaces:
+            cmd.extend(["-n", namespace])
+
+        if all_namespaces:
+            cmd.append("--all-namespaces")
+
+        paged_by_helm = sort_by in _HELM_SORTS and not tracking
+        if paged_by_helm:
+            cmd.extend(_HELM_SORTS[sort_by])
+            if reverse:
+                cmd.append("--reverse")
+            if limit is not None:
+                # One extra release tells whether another page follows
+                cmd.extend(["--max", str(limit + 1)])
+            elif offset:
+                cmd.extend(["--max", "0"])
+            if offset:
+                cmd.extend(["--offset", str(offset)])
+        else:
+            cmd.extend(["--max", "0"])
+
+        output, ok, age = await _list_releases(cmd, namespace, all_namespaces)
+
+        try:
+            releases = json.loads(output) or []
+        except json.JSONDecodeError:
+            # If output is not JSON, return raw output
+            return f"Release list:\n{output}", ok
+
+        if paged_by_helm and limit is not None and len(releases) > limit:
+            releases, has_more = releases[:limit], True
+
+    # Cached lists say how old they are so callers can judge their freshness
+    cached_note = f" (cached {age:.1f}s ago)" if age is not None else ""
+    cursor_note = ""
+
+    if tracking:
+        by_key = {_release_key(release): release for release in releases}
+        current: Entries = {key: (str(release.get("revision", "")), release.get("status", ""))
+                            for key, release in by_key.items()}
+        previous = snapshots.load(cursor, scope) if cursor else None
+
+        if previous is not None and errors:
+            # Namespaces that could not be listed keep their state instead of reading as removed
+            for key, state in previous.items():
+                if key.split("/", 1)[0] in errors:
+                    current.setdefault(key, state)
+
+        new_cursor = snapshots.save(scope, current)
+        if previous is not None:
+            changes = diff_entries(previous, current)
+            return (_format_release_changes(changes, previous, by_key, columns, cached_note, new_cursor, errors),
+                    not errors)
+
+        if cursor:
+            cursor_note = "Cursor expired or unknown, listing all releases.\n"
+        cursor_note += f"Cursor: {new_cursor}\n"
+
+    if not paged_by_helm:
+        releases.sort(key=_list_sort_key(sort_by or "name"), reverse=reverse)
+        total = len(releases)
+        end = offset + limit if limit is not None else None
+        has_more = end is not None and end < total
+        releases = releases[offset:end]
+
+    paged = limit is not None or offset > 0
+
+    # Format the output for readability
+    if not releases:
+        formatted_output = f"No releases found{cached_note}."
+    else:
+        formatted_output = f"RELEASE LIST{cached_note}:\n\n"
+        formatted_output += "\t\t".join(field.replace("_", " ").upper() for field in columns) + "\n"
+
+        for release in releases:
+            formatted_output += "\t\t".join(str(release.get(field, 'N/A')) for field in columns) + "\n"
 
-    try:
-        releases = json.loads(output)
+    if paged and releases:
+        of_total = f" of {total}" if total is not None else ""
+        formatted_output += f"\nShowing releases {offset + 1}-{offset + len(releases)}{of_total}."
+        if has_more:
+            formatted_output += f" Next page: offset={offset + len(releases)}."
+        formatted_output += "\n"
 
-        # Format the output for readability
-        if not releases:
-            return "No releases found."
+    formatted_output += _format_namespace_errors(errors)
 
-        formatted_output = "RELEASE LIST:\n\n"
-        formatted_output += "NAME\t\tNAMESPACE\t\tREVISION\t\tSTATUS\t\tCHART\t\tAPP VERSION\n"
+    if cursor_note:
+        formatted_output += ("\n" if formatted_output.endswith("\n") else "\n\n") + cursor_note
 
-        for release in releases:
-            formatted_output += f"{release.get('name', 'N/A')}\t\t"
-            formatted_output += f"{release.get('namespace', 'N/A')}\t\t"
-            formatted_output += f"{release.get('revision', 'N/A')}\t\t"
-            formatted_output += f"{release.get('status', 'N/A')}\t\t"
-            formatted_output += f"{release.get('chart', 'N/A')}\t\t"
-            formatted_output += f"{release.get('app_version', 'N/A')}\n"
-
-        return formatted_output
-    except json.JSONDecodeError:
-        # If output is not JSON, return raw output
-        return f"Release list:\n{output}"
+    # Namespaces that could not be listed fail the call, as they would fail `helm list --all-namespaces`
+    return formatted_output, not errors
+
+
+def _release_key(release: Dict[str, Any]) -> str:
+    return f"{release.get('namespace', '')}/{release.get('name', '')}"
+
+
+def _format_namespace_errors(errors: Dict[str, str]) -> str:
+    if not errors:
+        return ""
+
+    formatted_output = f"\nCould not list {len(errors)} namespaces:\n"
+    for ns, error in errors.items():
+        formatted_output += f"{ns}\t\t{error.splitlines()[0] if error else 'unknown error'}\n"
+    return formatted_output
+
+
+def _format_release_changes(changes: Delta, previous: Entries, by_key: Dict[str, Dict[str, Any]],
+                            columns: List[str], cached_note: str, cursor: str, errors: Dict[str, str]) -> str:
+    if not (changes.added or changes.removed or changes.changed):
+        formatted_output = f"No release changes{cached_note}.\n"
+    else:
+        formatted_output = f"RELEASE CHANGES{cached_note}:\n\n"
+        formatted_output += "CHANGE\t\t" + "\t\t".join(field.replace("_", " ").upper() for field in columns) + "\n"
+
+        rows = [(key, "added", by_key[key]) for key in changes.added]
+        rows += [(key, "changed", by_key[key]) for key in changes.changed]
+        for key in changes.removed:
+            # Removed releases are only known by their last recorded state
+            release_namespace, release_name = key.split("/", 1)
+            revision, status = previous[key]
+            rows.append((key, "removed", {"name": release_name, "namespace": release_namespace,
+                                          "revision": revision, "status": status}))
+
+        for _, change, release in sorted(rows, key=lambda row: row[0]):
+            formatted_output += f"{change}\t\t" + "\t\t".join(str(release.get(field, 'N/A')) for field in columns)
+            formatted_output += "\n"
+
+        formatted_output += f"\n{len(changes.added)} added, {len(changes.changed)} changed, "
+        formatted_output += f"{len(changes.removed)} removed.\n"
+
+    formatted_output += _format_namespace_errors(errors)
+    formatted_output += f"\nCursor: {cursor}\n"
+    return formatted_output
 
 
-def helm_test(release_name: str, namespace: Optional[str] = None,
-              timeout: Optional[str] = None, filter_: Optional[str] = None) -> str:
+async def helm_test(release_name: str, namespace: Optional[str] = None,
+              timeout: Optional[str] = None, filter_: Optional[str] = None) -> Tuple[str, bool]:
     """
     Runs tests for a release.
     """
@@ -317,4 +1031,4 @@ def helm_test(release_name: str, namespace: Optional[str] = None,
     if filter_:
         cmd.extend(["--filter", filter_])
 
-    return execute_helm_command(cmd)
\ No newline at end of file
+    return await execute_helm_command_with_status(cmd)
\ No newline at end of file
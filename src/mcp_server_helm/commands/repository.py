@@ -1,13 +1,14 @@
 import json
 import logging
-from typing import Optional
-from ..core.utils import execute_helm_command
+from typing import List, Optional, Tuple
+from ..core.repo_update import FAILED, RepoUpdateResult, update_repositories
+from ..core.utils import execute_helm_command_with_status
 
 logger = logging.getLogger(__name__)
 
 
-def helm_repo_add(name: str, url: str, username: Optional[str] = None,
-                  password: Optional[str] = None, pass_credentials: bool = False) -> str:
+async def helm_repo_add(name: str, url: str, username: Optional[str] = None,
+                  password: Optional[str] = None, pass_credentials: bool = False) -> Tuple[str, bool]:
     """
     Adds a chart repository.
     """
@@ -24,31 +25,31 @@ def helm_repo_add(name: str, url: str, username: Optional[str] = None,
     if pass_credentials:
         cmd.append("--pass-credentials")
 
-    return execute_helm_command(cmd)
+    return await execute_helm_command_with_status(cmd)
 
 
-def helm_repo_remove(name: str) -> str:
+async def helm_repo_remove(name: str) -> Tuple[str, bool]:
     """
     Removes a chart repository.
     """
     logger.info(f"Running helm repo remove with name={name}")
 
-    return execute_helm_command(["helm", "repo", "remove", name])
+    return await execute_helm_command_with_status(["helm", "repo", "remove", name])
 
 
-def helm_repo_list() -> str:
+async def helm_repo_list() -> Tuple[str, bool]:
     """
     Lists chart repositories.
     """
     logger.info("Running helm repo list")
 
-    output = execute_helm_command(["helm", "repo", "list", "--output", "json"])
+    output, ok = await execute_helm_command_with_status(["helm", "repo", "list", "--output", "json"])
 
     try:
         repos = json.loads(output)
 
         if not repos:
-            return "No repositories found."
+            return "No repositories found.", True
 
         formatted_output = "REPOSITORY LIST:\n\n"
         formatted_output += "NAME\t\tURL\n"
@@ -57,22 +58,62 @@ def helm_repo_list() -> str:
             formatted_output += f"{repo.get('name', 'N/A')}\t\t"
             formatted_output += f"{repo.get('url', 'N/A')}\n"
 
-        return formatted_output
+        return formatted_output, True
     except json.JSONDecodeError:
         # If output is not JSON, return raw output
-        return f"Repository list:\n{output}"
+        return f"Repository list:\n{output}", ok
 
 
-def helm_repo_update() -> str:
+def _format_update_results(results: List[RepoUpdateResult]) -> str:
+    """
+    Formats per-repository update results as a table.
+    """
+    formatted_output = "REPOSITORY UPDATE:\n\n"
+    formatted_output += "NAME\tRESULT\tTIME\tDOWNLOADED\tINDEX SIZE\n"
+
+    for result in results:
+        formatted_output += f"{result.name}\t{result.status}\t{result.seconds:.2f}s\t"
+        formatted_output += f"{result.downloaded_bytes}\t{result.index_bytes}\n"
+
+    failed = [result for result in results if result.status == FAILED]
+    for result in failed:
+        formatted_output += f"\nUnable to get an update from the \"{result.name}\" chart repository ({result.url}):\n"
+        formatted_output += f"\t{result.error}\n"
+
+    if failed:
+        formatted_output += f"\nFailed to update the following repositories: {[result.url for result in failed]}\n"
+    else:
+        formatted_output += "\nUpdate Complete.\n"
+
+    return formatted_output
+
+
+async def helm_repo_update(names: Optional[List[str]] = None, parallel: bool = False) -> Tuple[str, bool]:
     """
     Updates chart repositories.
+
+    With parallel set, repository indexes are fetched concurrently with
+    conditional requests and per-repository results are reported.
     """
-    logger.info("Running helm repo update")
+    logger.info(f"Running helm repo update with names={names}, parallel={parallel}")
+
+    if parallel:
+        try:
+            results = await update_repositories(names)
+        except ValueError as e:
+            return f"Error executing command: Error: {e}", False
+        if results is not None:
+            return _format_update_results(results), all(result.status != FAILED for result in results)
+
+    cmd = ["helm", "repo", "update"]
+
+    if names:
+        cmd.extend(names)
 
-    return execute_helm_command(["helm", "repo", "update"])
+    return await execute_helm_command_with_status(cmd)
 
 
-def helm_repo_index(directory: str, url: Optional[str] = None, merge: Optional[str] = None) -> str:
+async def helm_repo_index(directory: str, url: Optional[str] = None, merge: Optional[str] = None) -> Tuple[str, bool]:
     """
     Generates an index file for a chart repository.
     """
@@ -86,4 +127,4 @@ def helm_repo_index(directory: str, url: Optional[str] = None, merge: Optional[s
     if merge:
         cmd.extend(["--merge", merge])
 
-    return execute_helm_command(cmd)
\ No newline at end of file
+    return await execute_helm_command_with_status(cmd)
\ No newline at end of file
@@ -1,18 +1,46 @@
 import json
 import logging
-from typing import Optional
-from ..core.utils import execute_helm_command
+from typing import Dict, List, Optional, Tuple
+from ..core import config
+from ..core.search_index import search_repositories
+from ..core.utils import execute_helm_command_with_status
 
 logger = logging.getLogger(__name__)
 
 
-def helm_search_repo(keyword: str, version: Optional[str] = None, regexp: bool = False,
-                     versions: bool = False) -> str:
+def _format_repo_results(charts: List[Dict[str, str]], keyword: str) -> str:
+    """
+    Formats `helm search repo` results for readability.
+    """
+    if not charts:
+        return f"No charts found for keyword: {keyword}"
+
+    formatted_output = "SEARCH RESULTS:\n\n"
+    formatted_output += "NAME\t\tCHART VERSION\t\tAPP VERSION\t\tDESCRIPTION\n"
+
+    for chart in charts:
+        formatted_output += f"{chart.get('name', 'N/A')}\t\t"
+        formatted_output += f"{chart.get('version', 'N/A')}\t\t"
+        formatted_output += f"{chart.get('app_version', 'N/A')}\t\t"
+        formatted_output += f"{chart.get('description', 'N/A')}\n"
+
+    return formatted_output
+
+
+async def helm_search_repo(keyword: str, version: Optional[str] = None, regexp: bool = False,
+                     versions: bool = False) -> Tuple[str, bool]:
     """
     Searches repositories for a keyword in charts.
+
+    Served from the in-memory repository index when possible, otherwise by helm.
     """
     logger.info(f"Running helm search repo with keyword={keyword}")
 
+    if config.NATIVE_INDEX:
+        charts = await search_repositories(keyword, regexp, versions, version)
+        if charts is not None:
+            return _format_repo_results(charts, keyword), True
+
     cmd = ["helm", "search", "repo", keyword, "--output", "json"]
 
     if version:
@@ -24,31 +52,18 @@ def helm_search_repo(keyword: str, version: Optional[str] = None, regexp: bool =
     if versions:
         cmd.append("--versions")
 
-    output = execute_helm_command(cmd)
+    output, ok = await execute_helm_command_with_status(cmd)
 
     try:
         charts = json.loads(output)
-
-        if not charts:
-            return f"No charts found for keyword: {keyword}"
-
-        formatted_output = "SEARCH RESULTS:\n\n"
-        formatted_output += "NAME\t\tCHART VERSION\t\tAPP VERSION\t\tDESCRIPTION\n"
-
-        for chart in charts:
-            formatted_output += f"{chart.get('name', 'N/A')}\t\t"
-            formatted_output += f"{chart.get('version', 'N/A')}\t\t"
-            formatted_output += f"{chart.get('app_version', 'N/A')}\t\t"
-            formatted_output += f"{chart.get('description', 'N/A')}\n"
-
-        return formatted_output
+        return _format_repo_results(charts, keyword), True
     except json.JSONDecodeError:
         # If output is not JSON, return raw output
-        return f"Search results:\n{output}"
+        return f"Search results:\n{output}", ok
 
 
-def helm_search_hub(keyword: str, max_results: Optional[int] = None,
-                    repo_url: Optional[str] = None) -> str:
+async def helm_search_hub(keyword: str, max_results: Optional[int] = None,
+                    repo_url: Optional[str] = None) -> Tuple[str, bool]:
     """
     Searches the Helm Hub for a keyword in charts.
     """
@@ -62,13 +77,13 @@ def helm_search_hub(keyword: str, max_results: Optional[int] = None,
     if repo_url:
         cmd.extend(["--repository-url", repo_url])
 
-    output = execute_helm_command(cmd)
+    output, ok = await execute_helm_command_with_status(cmd)
 
     try:
         charts = json.loads(output)
 
         if not charts:
-            return f"No charts found for keyword: {keyword}"
+            return f"No charts found for keyword: {keyword}", True
 
         formatted_output = "HUB SEARCH RESULTS:\n\n"
         formatted_output += "URL\t\tCHART VERSION\t\tAPP VERSION\t\tDESCRIPTION\n"
@@ -79,7 +94,7 @@ def helm_search_hub(keyword: str, max_results: Optional[int] = None,
             formatted_output += f"{chart.get('app_version', 'N/A')}\t\t"
             formatted_output += f"{chart.get('description', 'N/A')}\n"
 
-        return formatted_output
+        return formatted_output, True
     except json.JSONDecodeError:
         # If output is not JSON, return raw output
-        return f"Hub search results:\n{output}"
\ No newline at end of file
+        return f"Hub search results:\n{output}", ok
\ No newline at end of file
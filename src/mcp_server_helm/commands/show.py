@@ -1,100 +1,144 @@
+import os
+import re
 import logging
-from typing import Optional
-from ..core.utils import execute_helm_command
+from typing import Optional, Tuple
+from ..core import config
+from ..core.cache import LRUCache
+from ..core.repo_index import resolve_chart_version
+from ..core.utils import execute_helm_command_with_status
 
 logger = logging.getLogger(__name__)
 
+# Exact chart versions; anything else (ranges, wildcards) is a constraint that
+# can resolve to a newer chart once a repository is updated
+PINNED_VERSION_PATTERN = re.compile(r"^=?v?\d+\.\d+\.\d+(-[0-9A-Za-z.-]+)?(\+[0-9A-Za-z.-]+)?$")
 
-def helm_show_all(chart: str, repo: Optional[str] = None, version: Optional[str] = None) -> str:
+# The parts `helm show all` is assembled from, in output order
+SHOW_PARTS = ("chart", "values", "readme", "crds")
+
+show_cache = LRUCache("show", config.SHOW_CACHE_BYTES)
+
+
+def _chart_reference(chart: str, repo: Optional[str] = None) -> str:
     """
-    Shows all information of a chart.
+    Builds the chart reference passed to helm.
     """
-    logger.info(f"Running helm show all with chart={chart}, repo={repo}, version={version}")
-
-    # Build chart reference
-    chart_ref = chart
     if repo:
-        chart_ref = f"{repo}/{chart}"
+        return f"{repo}/{chart}"
+    return chart
 
-    cmd = ["helm", "show", "all", chart_ref]
 
-    if version:
-        cmd.extend(["--version", version])
+def _is_local_chart(chart_ref: str) -> bool:
+    """
+    Local chart directories and archives can change at any time and are never cached.
+    """
+    return chart_ref.endswith(".tgz") or os.path.exists(chart_ref)
+
 
-    return execute_helm_command(cmd)
+def _cache_key(subcommand: str, chart: str, repo: Optional[str], version: Optional[str]) -> Tuple[str, str, str, str]:
+    return repo or "", chart, version or "", subcommand
 
 
-def helm_show_chart(chart: str, repo: Optional[str] = None, version: Optional[str] = None) -> str:
+def _derive_show_all(chart: str, repo: Optional[str], version: Optional[str]) -> Optional[str]:
     """
-    Shows the chart's definition.
+    Assembles `helm show all` output from cached parts, the same way helm joins them.
     """
-    logger.info(f"Running helm show chart with chart={chart}, repo={repo}, version={version}")
+    parts = {}
+    for part in SHOW_PARTS:
+        parts[part] = show_cache.peek(_cache_key(part, chart, repo, version))
+        if parts[part] is None:
+            return None
+
+    output = parts["chart"]
+    if parts["values"]:
+        output += "---\n" + parts["values"]
+    if parts["readme"]:
+        output += "---\n" + parts["readme"]
+    if parts["crds"]:
+        if not parts["crds"].startswith("---"):
+            output += "---\n"
+        output += parts["crds"]
+    return output
+
+
+async def _show(subcommand: str, chart: str, repo: Optional[str] = None, version: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Runs `helm show <subcommand>`, serving repeated lookups from the show cache.
 
-    # Build chart reference
-    chart_ref = chart
-    if repo:
-        chart_ref = f"{repo}/{chart}"
+    Versions of repository charts are first resolved against the cached
+    repository index, so most lookups end up pinned. Results for pinned versions
+    are immutable and kept until evicted; other lookups expire after a short TTL.
+    """
+    resolved = await resolve_chart_version(chart, repo, version)
+    if resolved is not None:
+        version = resolved
+
+    chart_ref = _chart_reference(chart, repo)
+    cacheable = not _is_local_chart(chart_ref)
+    key = _cache_key(subcommand, chart, repo, version)
+
+    if cacheable:
+        cached = show_cache.get(key)
+        if cached is None and subcommand == "all":
+            cached = _derive_show_all(chart, repo, version)
+        if cached is not None:
+            logger.info(f"Serving helm show {subcommand} for {chart_ref} from cache")
+            return cached, True
 
-    cmd = ["helm", "show", "chart", chart_ref]
+    cmd = ["helm", "show", subcommand, chart_ref]
 
     if version:
         cmd.extend(["--version", version])
 
-    return execute_helm_command(cmd)
+    output, ok = await execute_helm_command_with_status(cmd)
 
+    if ok and cacheable:
+        pinned = version is not None and PINNED_VERSION_PATTERN.match(version) is not None
+        show_cache.put(key, output, ttl=None if pinned else config.SHOW_CACHE_TTL)
 
-def helm_show_crds(chart: str, repo: Optional[str] = None, version: Optional[str] = None) -> str:
+    return output, ok
+
+
+async def helm_show_all(chart: str, repo: Optional[str] = None, version: Optional[str] = None) -> Tuple[str, bool]:
     """
-    Shows the chart's CRDs.
+    Shows all information of a chart.
     """
-    logger.info(f"Running helm show crds with chart={chart}, repo={repo}, version={version}")
+    logger.info(f"Running helm show all with chart={chart}, repo={repo}, version={version}")
 
-    # Build chart reference
-    chart_ref = chart
-    if repo:
-        chart_ref = f"{repo}/{chart}"
+    return await _show("all", chart, repo, version)
 
-    cmd = ["helm", "show", "crds", chart_ref]
 
-    if version:
-        cmd.extend(["--version", version])
+async def helm_show_chart(chart: str, repo: Optional[str] = None, version: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Shows the chart's definition.
+    """
+    logger.info(f"Running helm show chart with chart={chart}, repo={repo}, version={version}")
 
-    return execute_helm_command(cmd)
+    return await _show("chart", chart, repo, version)
 
 
-def helm_show_readme(chart: str, repo: Optional[str] = None, version: Optional[str] = None) -> str:
+async def helm_show_crds(chart: str, repo: Optional[str] = None, version: Optional[str] = None) -> Tuple[str, bool]:
     """
-    Shows the chart's README.
+    Shows the chart's CRDs.
     """
-    logger.info(f"Running helm show readme with chart={chart}, repo={repo}, version={version}")
+    logger.info(f"Running helm show crds with chart={chart}, repo={repo}, version={version}")
 
-    # Build chart reference
-    chart_ref = chart
-    if repo:
-        chart_ref = f"{repo}/{chart}"
+    return await _show("crds", chart, repo, version)
 
-    cmd = ["helm", "show", "readme", chart_ref]
 
-    if version:
-        cmd.extend(["--version", version])
+async def helm_show_readme(chart: str, repo: Optional[str] = None, version: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Shows the chart's README.
+    """
+    logger.info(f"Running helm show readme with chart={chart}, repo={repo}, version={version}")
 
-    return execute_helm_command(cmd)
+    return await _show("readme", chart, repo, version)
 
 
-def helm_show_values(chart: str, repo: Optional[str] = None, version: Optional[str] = None) -> str:
+async def helm_show_values(chart: str, repo: Optional[str] = None, version: Optional[str] = None) -> Tuple[str, bool]:
     """
     Shows the chart's values.
     """
     logger.info(f"Running helm show values with chart={chart}, repo={repo}, version={version}")
 
-    # Build chart reference
-    chart_ref = chart
-    if repo:
-        chart_ref = f"{repo}/{chart}"
-
-    cmd = ["helm", "show", "values", chart_ref]
-
-    if version:
-        cmd.extend(["--version", version])
-
-    return execute_helm_command(cmd)
\ No newline at end of file
+    return await _show("values", chart, repo, version)
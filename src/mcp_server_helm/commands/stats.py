@@ -0,0 +1,112 @@
+import logging
+from typing import Tuple
+from ..core.binary import helm_binary
+from ..core.cache import cache_stats
+from ..core.cursors import snapshots
+from ..core.locks import release_locks
+from ..core.processes import terminator
+from ..core.repo_index import repository_indexes
+from ..core.scheduler import scheduler
+from ..core.utils import read_coalescer
+from ..core.watch import release_watcher
+
+logger = logging.getLogger(__name__)
+
+
+async def helm_server_stats() -> Tuple[str, bool]:
+    """
+    Shows the MCP server's internal counters, one section each:
+
+    - SCHEDULER LANES: concurrency limit, queue depth and wait times per lane
+    - COALESCED READS: read-only calls and how many shared another call's helm process
+    - STOPPED PROCESSES: helm processes stopped after a cancellation or deadline
+    - STATUS WAITERS: helm_wait_status callers and the shared polls serving them
+    - RELEASE LOCKS: releases locked by a mutating operation, with their waiters
+    - CACHES: entries, size and hit/miss counters of each cache
+    - DELTA CURSORS: snapshots kept for delta calls of helm_list and helm_history
+    - HELM BINARY: the helm executable in use and its cached facts
+    - REPOSITORY INDEXES: charts, versions and memory use of each loaded index
+    """
+    logger.info("Collecting server stats")
+
+    formatted_output = "SCHEDULER LANES:\n\n"
+    formatted_output += "LANE\t\tLIMIT\t\tRUNNING\t\tWAITING\t\tPEAK WAITING\t\tSTARTED\t\tAVG WAIT\t\tMAX WAIT\n"
+
+    for lane in scheduler.stats():
+        formatted_output += f"{lane['lane']}\t\t"
+        formatted_output += f"{lane['limit']}\t\t"
+        formatted_output += f"{lane['running']}\t\t"
+        formatted_output += f"{lane['waiting']}\t\t"
+        formatted_output += f"{lane['peak_waiting']}\t\t"
+        formatted_output += f"{lane['started']}\t\t"
+        formatted_output += f"{lane['avg_wait']:.3f}s\t\t"
+        formatted_output += f"{lane['max_wait']:.3f}s\n"
+
+    coalescing = read_coalescer.stats()
+    formatted_output += "\nCOALESCED READS:\n\n"
+    formatted_output += "CALLS\t\tSAVED\t\tIN FLIGHT\n"
+    formatted_output += f"{coalescing['calls']}\t\t{coalescing['coalesced']}\t\t{coalescing['in_flight']}\n"
+
+    terminations = terminator.stats()
+    formatted_output += "\nSTOPPED PROCESSES:\n\n"
+    formatted_output += "TERMINATED\t\tKILLED\t\tPENDING\t\tAVG TIME TO STOP\t\tMAX TIME TO STOP\n"
+    formatted_output += f"{terminations['terminated']}\t\t{terminations['killed']}\t\t{terminations['pending']}\t\t"
+    formatted_output += f"{terminations['avg_time']:.3f}s\t\t{terminations['max_time']:.3f}s\n"
+
+    watching = release_watcher.stats()
+    formatted_output += "\nSTATUS WAITERS:\n\n"
+    formatted_output += "WAITERS\t\tNAMESPACES\t\tPOLLS\t\tSHARED\n"
+    formatted_output += f"{watching['waiters']}\t\t{watching['namespaces']}\t\t{watching['polls']}\t\t"
+    formatted_output += f"{watching['shared']}\n"
+
+    formatted_output += "\nRELEASE LOCKS:\n\n"
+    locks = release_locks.snapshot()
+    if not locks:
+        formatted_output += "No release locks held.\n"
+    else:
+        formatted_output += "CONTEXT\t\tNAMESPACE\t\tRELEASE\t\tHOLDER\t\tHELD FOR\t\tWAITERS\n"
+        for lock in locks:
+            formatted_output += f"{lock['context']}\t\t"
+            formatted_output += f"{lock['namespace']}\t\t"
+            formatted_output += f"{lock['release']}\t\t"
+            formatted_output += f"{lock['holder'] or 'N/A'}\t\t"
+            formatted_output += f"{lock['held_for']:.1f}s\t\t"
+            formatted_output += f"{', '.join(lock['waiters']) or 'none'}\n"
+
+    formatted_output += "\nCACHES:\n\n"
+    formatted_output += "CACHE\t\tENTRIES\t\tBYTES\t\tMAX BYTES\t\tHITS\t\tMISSES\t\tEVICTIONS\n"
+
+    for cache in cache_stats():
+        formatted_output += f"{cache['cache']}\t\t"
+        formatted_output += f"{cache['entries']}\t\t"
+        formatted_output += f"{cache['bytes']}\t\t"
+        formatted_output += f"{cache['max_bytes']}\t\t"
+        formatted_output += f"{cache['hits']}\t\t"
+        formatted_output += f"{cache['misses']}\t\t"
+        formatted_output += f"{cache['evictions']}\n"
+
+    cursors = snapshots.stats()
+    formatted_output += "\nDELTA CURSORS:\n\n"
+    formatted_output += "SNAPSHOTS\t\tMAX SNAPSHOTS\t\tHITS\t\tMISSES\t\tEVICTIONS\n"
+    formatted_output += f"{cursors['snapshots']}\t\t{cursors['max_snapshots']}\t\t{cursors['hits']}\t\t"
+    formatted_output += f"{cursors['misses']}\t\t{cursors['evictions']}\n"
+
+    binary = helm_binary.stats()
+    formatted_output += "\nHELM BINARY:\n\n"
+    formatted_output += "PATH\t\tRESOLUTIONS\t\tCACHED FACTS\t\tFACT HITS\t\tFACT MISSES\n"
+    formatted_output += f"{binary['path'] or 'N/A'}\t\t{binary['resolutions']}\t\t{binary['facts']}\t\t"
+    formatted_output += f"{binary['fact_hits']}\t\t{binary['fact_misses']}\n"
+
+    formatted_output += "\nREPOSITORY INDEXES:\n\n"
+    indexes = repository_indexes.stats()
+    if not indexes:
+        formatted_output += "No repository indexes loaded.\n"
+    else:
+        formatted_output += "REPOSITORY\t\tCHARTS\t\tVERSIONS\t\tMEMORY\n"
+        for index in indexes:
+            formatted_output += f"{index['repository']}\t\t"
+            formatted_output += f"{index['charts']}\t\t"
+            formatted_output += f"{index['versions']}\t\t"
+            formatted_output += f"{index['memory_bytes']}\n"
+
+    return formatted_output, True
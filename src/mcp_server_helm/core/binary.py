@@ -0,0 +1,126 @@
+import logging
+import os
+import shutil
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# (device, inode, mtime, size) of the helm binary; any change means it was replaced
+Identity = Tuple[int, int, int, int]
+
+# Environment variables passed on to helm and kubectl when MCP_HELM_TRIM_ENV is
+# set. Everything else is then dropped unless listed in MCP_HELM_ENV_PASSTHROUGH.
+ENV_NAMES = frozenset([
+    "PATH", "HOME", "USER", "LOGNAME", "TMPDIR", "TEMP", "TMP", "LANG", "LANGUAGE", "TZ",
+    "HTTP_PROXY", "HTTPS_PROXY", "NO_PROXY", "ALL_PROXY", "DOCKER_CONFIG", "GNUPGHOME",
+    # Windows needs these to start processes and find the user's profile
+    "SYSTEMROOT", "SYSTEMDRIVE", "WINDIR", "COMSPEC", "PATHEXT", "APPDATA", "LOCALAPPDATA",
+    "USERPROFILE", "HOMEDRIVE", "HOMEPATH", "PROGRAMDATA", "PROGRAMFILES",
+])
+
+# Prefixes of helm's own settings, kubeconfig and the credentials of cloud exec plugins
+ENV_PREFIXES = ("HELM_", "KUBE", "XDG_", "LC_", "SSL_", "AWS_", "AZURE_", "GOOGLE_", "CLOUDSDK_")
+
+
+def _identity(path: str) -> Optional[Identity]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def subprocess_env() -> Optional[Dict[str, str]]:
+    """
+    Returns the environment helm and kubectl run with, or None when they
+    inherit the server's whole environment, which is the default.
+
+    Plugins, credential helpers and private chart repositories rely on
+    variables no allowlist can foresee, so trimming is opt-in.
+    """
+    if not config.TRIM_ENV:
+        return None
+    return {name: value for name, value in os.environ.items()
+            if name.upper() in ENV_NAMES or name.upper().startswith(ENV_PREFIXES) or name in config.ENV_PASSTHROUGH}
+
+
+def environment_stamp() -> Tuple[Tuple[str, str], ...]:
+    """
+    Returns the environment helm runs with in a comparable form, for cached
+    facts that depend on it.
+    """
+    env = subprocess_env()
+    return tuple(sorted((os.environ if env is None else env).items()))
+
+
+class HelmBinary:
+    """
+    The helm executable resolved through PATH, and facts about it that only
+    change when the binary is replaced, such as its version.
+
+    The resolved path is reused until PATH changes or the file at that path
+    changes its inode or mtime; cached facts are dropped at the same time.
+    """
+
+    def __init__(self):
+        self._search_path: Optional[str] = None
+        self._path: Optional[str] = None
+        self._identity: Optional[Identity] = None
+        self._facts: Dict[Hashable, Tuple[Any, str]] = {}
+        self.resolutions = 0
+        self.fact_hits = 0
+        self.fact_misses = 0
+
+    def resolve(self) -> Tuple[Optional[str], Optional[Identity]]:
+        """
+        Returns the absolute path and identity of the helm binary, or None for
+        both if helm is not on PATH.
+        """
+        search_path = os.environ.get("PATH", "")
+        if self._path is not None and search_path == self._search_path:
+            identity = _identity(self._path)
+            if identity is not None and identity == self._identity:
+                return self._path, identity
+
+        self.resolutions += 1
+        path = shutil.which("helm", path=search_path)
+        path = os.path.abspath(path) if path else None
+        identity = _identity(path) if path else None
+
+        if path != self._path or identity != self._identity:
+            self._facts.clear()
+            if path:
+                logger.info(f"Using helm binary {path}")
+        self._search_path, self._path, self._identity = search_path, path, identity
+        return path, identity
+
+    def fact(self, key: Hashable, stamp: Any) -> Optional[str]:
+        """
+        Returns the output cached for key if it was recorded with the same
+        stamp and the binary has not changed since.
+        """
+        path, _ = self.resolve()
+        cached = self._facts.get(key)
+        if path is None or cached is None or cached[0] != stamp:
+            self.fact_misses += 1
+            return None
+        self.fact_hits += 1
+        return cached[1]
+
+    def store_fact(self, key: Hashable, stamp: Any, output: str) -> None:
+        if self._path is not None:
+            self._facts[key] = (stamp, output)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self._path,
+            "resolutions": self.resolutions,
+            "facts": len(self._facts),
+            "fact_hits": self.fact_hits,
+            "fact_misses": self.fact_misses,
+        }
+
+
+helm_binary = HelmBinary()
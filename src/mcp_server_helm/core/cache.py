@@ -0,0 +1,247 @@
+import importlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+# Imported when the first disk cache is opened; None if Python was built without SQLite
+sqlite3: Any = None
+
+logger = logging.getLogger(__name__)
+
+# Every cache created in this process, for reporting through helm_server_stats
+_registry: List[Union["LRUCache", "DiskCache"]] = []
+
+
+class LRUCache:
+    """
+    In-process LRU cache of text results, bounded by the total size of the
+    cached values. Entries may carry an optional time-to-live.
+    """
+
+    def __init__(self, name: str, max_bytes: int):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # key -> (value, size in bytes, expiry timestamp or None, time stored)
+        self._entries: "OrderedDict[Hashable, Tuple[str, int, Optional[float], float]]" = OrderedDict()
+        _registry.append(self)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """
+        Returns the cached value for key, or None if it is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[2] is not None and entry[2] <= time.monotonic():
+            self._remove(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def peek(self, key: Hashable) -> Optional[str]:
+        """
+        Returns the cached value without touching recency or hit counters.
+        """
+        entry = self._entries.get(key)
+        if entry is None or (entry[2] is not None and entry[2] <= time.monotonic()):
+            return None
+        return entry[0]
+
+    def age(self, key: Hashable) -> Optional[float]:
+        """
+        Returns how many seconds ago the value for key was stored, or None if it is not cached.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return time.monotonic() - entry[3]
+
+    def put(self, key: Hashable, value: str, ttl: Optional[float] = None) -> None:
+        """
+        Stores value under key, evicting least recently used entries to stay within budget.
+        """
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {key} in {self.name}: {size} bytes exceeds the cache budget")
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        now = time.monotonic()
+        expires = now + ttl if ttl is not None else None
+        self._entries[key] = (value, size, expires, now)
+        self.size += size
+
+        while self.size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Removes every entry whose key matches predicate and returns how many were dropped.
+        """
+        stale = [key for key in self._entries if predicate(key)]
+        for key in stale:
+            self._remove(key)
+        return len(stale)
+
+    def _remove(self, key: Hashable) -> None:
+        size = self._entries.pop(key)[1]
+        self.size -= size
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cache": self.name,
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class DiskCache:
+    """
+    LRU cache of text results persisted in a SQLite database, so it survives
+    server restarts. Bounded by the total size of the cached values.
+
+    Only suitable for values that never change for a given key. The database
+    is opened on first use; if it cannot be opened or written the cache
+    behaves as if it were empty.
+    """
+
+    def __init__(self, name: str, path: str, max_bytes: int):
+        self.name = name
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._db: Optional[Any] = None
+        self._disabled = max_bytes <= 0
+        _registry.append(self)
+
+    def _connection(self) -> Optional[Any]:
+        global sqlite3
+        if self._db is None and not self._disabled and sqlite3 is None:
+            try:
+                sqlite3 = importlib.import_module("sqlite3")
+            except ImportError:
+                logger.warning(f"Disabling {self.name} cache, SQLite is not available")
+                self._disabled = True
+
+        if self._db is None and not self._disabled:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                # Cached release data can contain secrets; keep the database private
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                os.close(fd)
+                db = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+                db.execute("CREATE TABLE IF NOT EXISTS entries ("
+                           "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)")
+                db.execute("CREATE INDEX IF NOT EXISTS entries_used ON entries (used)")
+                self._db = db
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Disabling {self.name} cache, cannot open {self.path}: {e}")
+                self._disabled = True
+        return self._db
+
+    @staticmethod
+    def _encode_key(key: Hashable) -> str:
+        return json.dumps(list(key) if isinstance(key, tuple) else key)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """
+        Returns the cached value for key, or None if it is missing.
+        """
+        db = self._connection()
+        row = None
+        if db is not None:
+            try:
+                encoded = self._encode_key(key)
+                row = db.execute("SELECT value FROM entries WHERE key = ?", (encoded,)).fetchone()
+                if row is not None:
+                    db.execute("UPDATE entries SET used = ? WHERE key = ?", (time.time(), encoded))
+            except sqlite3.Error as e:
+                logger.warning(f"Reading from {self.name} cache failed: {e}")
+                row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return row[0]
+
+    def put(self, key: Hashable, value: str) -> None:
+        """
+        Stores value under key, evicting least recently used entries to stay within budget.
+        """
+        size = len(value.encode("utf-8"))
+        db = self._connection()
+        if db is None or size > self.max_bytes:
+            return
+
+        try:
+            db.execute("INSERT OR REPLACE INTO entries (key, value, size, used) VALUES (?, ?, ?, ?)",
+                       (self._encode_key(key), value, size, time.time()))
+            self._evict(db)
+        except sqlite3.Error as e:
+            logger.warning(f"Writing to {self.name} cache failed: {e}")
+
+    def _evict(self, db: Any) -> None:
+        excess = self._size(db) - self.max_bytes
+        if excess <= 0:
+            return
+
+        stale = []
+        for key, size in db.execute("SELECT key, size FROM entries ORDER BY used"):
+            stale.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        db.executemany("DELETE FROM entries WHERE key = ?", stale)
+        self.evictions += len(stale)
+
+    @staticmethod
+    def _size(db: Any) -> int:
+        return db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        entries = size = 0
+        db = self._db
+        if db is not None:
+            try:
+                entries, size = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            except sqlite3.Error:
+                pass
+        return {
+            "cache": self.name,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """
+    Returns the counters of every cache created in this process.
+    """
+    return [cache.stats() for cache in _registry]
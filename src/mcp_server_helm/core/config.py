@@ -0,0 +1,110 @@
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _int_setting(name: str, default: int) -> int:
+    """
+    Read an integer setting from the environment, falling back to the default.
+    """
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid value for {name}: {value!r}, using {default}")
+        return default
+
+
+def _bool_setting(name: str, default: bool) -> bool:
+    """
+    Read a boolean setting from the environment, falling back to the default.
+    """
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+
+    return value.strip().lower() not in ("0", "false", "no", "off")
+
+
+# Maximum number of concurrently running read-only helm processes
+READ_CONCURRENCY = max(1, _int_setting("MCP_HELM_READ_CONCURRENCY", 8))
+
+# Maximum number of concurrently running mutating helm processes
+MUTATE_CONCURRENCY = max(1, _int_setting("MCP_HELM_MUTATE_CONCURRENCY", 4))
+
+# Byte budget of the in-memory helm show cache
+SHOW_CACHE_BYTES = max(0, _int_setting("MCP_HELM_SHOW_CACHE_BYTES", 64 * 1024 * 1024))
+
+# Seconds to keep helm show results for charts without a pinned version
+SHOW_CACHE_TTL = max(0, _int_setting("MCP_HELM_SHOW_CACHE_TTL", 30))
+
+# Answer helm_search_repo and chart version lookups from in-memory repository indexes
+NATIVE_INDEX = _bool_setting("MCP_HELM_NATIVE_INDEX", True)
+
+# Directory for state the server keeps across restarts
+STATE_DIR = os.environ.get("MCP_HELM_STATE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "mcp-server-helm")
+
+# Maximum number of repositories fetched at once by a parallel helm_repo_update
+REPO_UPDATE_CONCURRENCY = max(1, _int_setting("MCP_HELM_REPO_UPDATE_CONCURRENCY", 8))
+
+# Seconds before a single repository index download is abandoned
+REPO_UPDATE_TIMEOUT = max(1, _int_setting("MCP_HELM_REPO_UPDATE_TIMEOUT", 120))
+
+# Seconds to keep helm list results; mutations through the server invalidate them earlier
+LIST_CACHE_TTL = max(0, _int_setting("MCP_HELM_LIST_CACHE_TTL", 5))
+
+# Byte budget of the in-memory helm list cache
+LIST_CACHE_BYTES = max(0, _int_setting("MCP_HELM_LIST_CACHE_BYTES", 16 * 1024 * 1024))
+
+# Byte budget of the on-disk cache of helm get results per release revision
+GET_CACHE_BYTES = max(0, _int_setting("MCP_HELM_GET_CACHE_BYTES", 256 * 1024 * 1024))
+
+# Share one helm process between identical read-only commands running at the same time
+COALESCE_READS = _bool_setting("MCP_HELM_COALESCE_READS", True)
+
+# Seconds between "still running" progress notifications sent while a helm command runs
+PROGRESS_INTERVAL = max(1, _int_setting("MCP_HELM_PROGRESS_INTERVAL", 10))
+
+# Maximum number of background jobs kept in the job table, running or finished
+JOB_LIMIT = max(1, _int_setting("MCP_HELM_JOB_LIMIT", 100))
+
+# Seconds a finished background job's result is kept
+JOB_RETENTION = max(0, _int_setting("MCP_HELM_JOB_RETENTION", 3600))
+
+# Seconds a helm process gets to exit after SIGTERM before it is killed
+KILL_GRACE = max(0, _int_setting("MCP_HELM_KILL_GRACE", 5))
+
+# Seconds a tool call may run before the server stops it
+DEFAULT_DEADLINE = max(1, _int_setting("MCP_HELM_DEFAULT_DEADLINE", 300))
+
+# Deadline of tools that wait for rollouts or download charts and plugins
+LONG_DEADLINE = max(1, _int_setting("MCP_HELM_LONG_DEADLINE", 1800))
+
+# Default number of helm_batch steps running at once
+BATCH_CONCURRENCY = max(1, _int_setting("MCP_HELM_BATCH_CONCURRENCY", 4))
+
+# Default number of concurrent status queries of helm_status_many
+STATUS_CONCURRENCY = max(1, _int_setting("MCP_HELM_STATUS_CONCURRENCY", 16))
+
+# Default number of releases per wave of helm_upgrade_many
+UPGRADE_WAVE_SIZE = max(1, _int_setting("MCP_HELM_UPGRADE_WAVE_SIZE", 5))
+
+# Maximum number of release snapshots kept for helm_list and helm_history delta cursors
+CURSOR_LIMIT = max(1, _int_setting("MCP_HELM_CURSOR_LIMIT", 1000))
+
+# Seconds helm_wait_status waits when no timeout is given
+WAIT_TIMEOUT = max(1, _int_setting("MCP_HELM_WAIT_TIMEOUT", 300))
+
+# Longest pause in seconds between two polls of helm_wait_status
+WAIT_MAX_INTERVAL = max(1, _int_setting("MCP_HELM_WAIT_MAX_INTERVAL", 15))
+
+# Run helm and kubectl with an allowlist of environment variables instead of the whole environment
+TRIM_ENV = _bool_setting("MCP_HELM_TRIM_ENV", False)
+
+# Extra environment variables kept besides the built-in allowlist when TRIM_ENV is set
+ENV_PASSTHROUGH = frozenset(name.strip() for name in os.environ.get("MCP_HELM_ENV_PASSTHROUGH", "").split(",")
+                            if name.strip())
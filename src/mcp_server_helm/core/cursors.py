@@ -0,0 +1,88 @@
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# State of one tracked item, such as a release's (revision, status)
+Entries = Dict[str, Tuple[Any, ...]]
+
+
+class Delta(NamedTuple):
+    added: List[str]
+    removed: List[str]
+    changed: List[str]
+
+
+class SnapshotStore:
+    """
+    Bounded table of the states handed out as delta cursors.
+
+    A cursor is a digest of the query scope and its entries, so identical
+    states share one snapshot. The least recently used snapshots are dropped
+    once max_snapshots are kept; their cursors then read as expired.
+    """
+
+    def __init__(self, max_snapshots: int):
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[str, Tuple[Tuple, Entries]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _digest(scope: Tuple, entries: Entries) -> str:
+        data = json.dumps([list(scope), sorted([key, list(value)] for key, value in entries.items())],
+                          default=str, separators=(",", ":"))
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()[:32]
+
+    def save(self, scope: Tuple, entries: Entries) -> str:
+        """
+        Records entries as the state of scope and returns its cursor.
+        """
+        cursor = self._digest(scope, entries)
+        self._snapshots[cursor] = (scope, entries)
+        self._snapshots.move_to_end(cursor)
+        while len(self._snapshots) > self.max_snapshots:
+            self._snapshots.popitem(last=False)
+            self.evictions += 1
+        return cursor
+
+    def load(self, cursor: str, scope: Tuple) -> Optional[Entries]:
+        """
+        Returns the entries recorded for cursor, or None if the cursor is
+        unknown, expired or belongs to another query.
+        """
+        snapshot = self._snapshots.get(cursor)
+        if snapshot is None or snapshot[0] != scope:
+            self.misses += 1
+            return None
+        self._snapshots.move_to_end(cursor)
+        self.hits += 1
+        return snapshot[1]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "snapshots": len(self._snapshots),
+            "max_snapshots": self.max_snapshots,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def diff_entries(previous: Entries, current: Entries) -> Delta:
+    """
+    Returns the keys added, removed and changed between two snapshots, each sorted.
+    """
+    added = sorted(key for key in current if key not in previous)
+    removed = sorted(key for key in previous if key not in current)
+    changed = sorted(key for key in current if key in previous and previous[key] != current[key])
+    return Delta(added, removed, changed)
+
+
+snapshots = SnapshotStore(config.CURSOR_LIMIT)
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import re
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# Tools that wait for rollouts or download charts, plugins and indexes get
+# LONG_DEADLINE; every other tool gets DEFAULT_DEADLINE
+LONG_RUNNING_TOOLS = frozenset([
+    "helm_dependency_build", "helm_dependency_update", "helm_install", "helm_plugin_install",
+    "helm_plugin_update", "helm_pull", "helm_push", "helm_repo_update", "helm_rollback", "helm_test",
+    "helm_uninstall", "helm_upgrade", "helm_wait_status",
+])
+
+# Tools made of other tool calls, each of which runs under its own deadline
+COMPOSITE_TOOLS = frozenset(["helm_batch", "helm_upgrade_many"])
+
+# Time added to a helm --timeout so helm can report its own timeout before the server steps in
+TIMEOUT_MARGIN = 60
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d*)?|\.\d+)(ns|us|µs|ms|s|m|h)")
+_DURATION_UNITS = {"ns": 1e-9, "us": 1e-6, "µs": 1e-6, "ms": 1e-3, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(duration: str) -> Optional[float]:
+    """
+    Parses a Go duration such as "5m0s" or "90s" into seconds, or returns None if it is invalid.
+    """
+    duration = duration.strip()
+    if duration == "0":
+        return 0.0
+
+    position = 0
+    seconds = 0.0
+    for match in _DURATION_PART.finditer(duration):
+        if match.start() != position:
+            return None
+        seconds += float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+        position = match.end()
+    if position == 0 or position != len(duration):
+        return None
+    return seconds
+
+
+def tool_deadline(name: str, arguments: Dict[str, Any]) -> Optional[float]:
+    """
+    Returns the number of seconds a tool call may run, never less than the helm
+    timeout it was given, or None if it has no deadline of its own.
+    """
+    if name in COMPOSITE_TOOLS:
+        return None
+
+    deadline = float(config.LONG_DEADLINE if name in LONG_RUNNING_TOOLS else config.DEFAULT_DEADLINE)
+
+    timeout = arguments.get("timeout")
+    if isinstance(timeout, str):
+        seconds = parse_duration(timeout)
+        if seconds is not None:
+            deadline = max(deadline, seconds + TIMEOUT_MARGIN)
+    return deadline
+
+
+def deadline_error(name: str, deadline: Optional[float]) -> str:
+    """
+    Returns the error text of a tool call stopped at its deadline.
+    """
+    error_msg = f"Error executing command: {name} did not finish within its deadline of {deadline:.0f}s and was stopped"
+    logger.error(error_msg)
+    return error_msg
+
+
+async def run_with_deadline(name: str, call: Callable[[], Awaitable[Tuple[str, bool]]],
+                            deadline: Optional[float]) -> Tuple[str, bool]:
+    """
+    Runs a tool call, cancelling it and stopping its helm process once the deadline passes.
+    Returns the call's output and whether it succeeded.
+    """
+    try:
+        return await asyncio.wait_for(call(), deadline)
+    except asyncio.TimeoutError:
+        return deadline_error(name, deadline), False
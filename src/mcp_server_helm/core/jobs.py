@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from . import config
+from .progress import ProgressReporter, current_reporter
+
+logger = logging.getLogger(__name__)
+
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Output lines kept per job for helm_job_status
+LOG_LINES = 20
+
+
+class JobLog(ProgressReporter):
+    """
+    Collects a background job's output lines in place of client progress notifications.
+    """
+
+    def __init__(self):
+        super().__init__(None, "")
+        self.lines: Deque[str] = deque(maxlen=LOG_LINES)
+
+    async def report(self, message: str) -> None:
+        self.sent += 1
+        self.lines.append(message)
+
+
+class Job:
+    """
+    A tool call running in the background.
+    """
+
+    def __init__(self, job_id: str, tool: str):
+        self.job_id = job_id
+        self.tool = tool
+        self.status = RUNNING
+        self.result: Optional[str] = None
+        self.started = time.time()
+        self.finished: Optional[float] = None
+        self.log = JobLog()
+        self.task: Optional["asyncio.Future[None]"] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.finished or time.time()) - self.started
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "tool": self.tool,
+            "status": self.status,
+            "started": self.started,
+            "duration": self.duration,
+            "output_lines": list(self.log.lines),
+        }
+
+
+class JobManager:
+    """
+    Bounded table of background jobs.
+
+    Finished jobs are kept for JOB_RETENTION seconds so their results can be
+    fetched, and the oldest finished jobs are evicted first when the table is
+    full. A new job is refused only when every slot holds a running job.
+    """
+
+    def __init__(self, max_jobs: int, retention: int):
+        self.max_jobs = max_jobs
+        self.retention = retention
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    def start(self, tool: str, call: Callable[[], Awaitable[Tuple[str, bool]]]) -> Job:
+        """
+        Runs call() in the background and returns its job.
+
+        Raises RuntimeError if the job table is full of running jobs.
+        """
+        self._evict()
+        if len(self._jobs) >= self.max_jobs:
+            raise RuntimeError(f"too many background jobs running (limit {self.max_jobs})")
+
+        job = Job(uuid.uuid4().hex[:12], tool)
+        self._jobs[job.job_id] = job
+        job.task = asyncio.ensure_future(self._run(job, call))
+        logger.info(f"Started background job {job.job_id} for {tool}")
+        return job
+
+    async def _run(self, job: Job, call: Callable[[], Awaitable[Tuple[str, bool]]]) -> None:
+        # The job outlives the request that started it, so its output goes to the job log
+        current_reporter.set(job.log)
+        try:
+            # helm's exit status decides; the text of a failed call is not always an error message
+            job.result, ok = await call()
+            job.status = SUCCEEDED if ok else FAILED
+        except asyncio.CancelledError:
+            job.result = "Job was cancelled."
+            job.status = CANCELLED
+        except Exception as e:
+            job.result = f"Error executing {job.tool}: {str(e)}"
+            job.status = FAILED
+        finally:
+            job.finished = time.time()
+            logger.info(f"Background job {job.job_id} for {job.tool} {job.status} after {job.duration:.1f}s")
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._evict()
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancels a running job, which stops its helm process. Returns None for unknown jobs.
+        """
+        job = self.get(job_id)
+        if job is not None and job.status == RUNNING and job.task is not None:
+            job.task.cancel()
+        return job
+
+    def jobs(self) -> List[Job]:
+        self._evict()
+        return list(self._jobs.values())
+
+    def _evict(self) -> None:
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.finished is not None]
+        for job in finished:
+            if now - job.finished > self.retention:
+                del self._jobs[job.job_id]
+
+        # Make room for a new job by dropping the oldest finished ones
+        finished = [job for job in finished if job.job_id in self._jobs]
+        while len(self._jobs) >= self.max_jobs and finished:
+            del self._jobs[finished.pop(0).job_id]
+
+
+job_manager = JobManager(config.JOB_LIMIT, config.JOB_RETENTION)
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .utils import current_kube_context, effective_namespace
+
+logger = logging.getLogger(__name__)
+
+ReleaseKey = Tuple[str, str, str]
+
+
+class _LockEntry:
+    """
+    Lock state for a single (kube context, namespace, release) key.
+    """
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.holder: Optional[Dict[str, Any]] = None
+        self.waiters: List[Dict[str, Any]] = []
+
+
+class ReleaseLockManager:
+    """
+    Serializes mutating operations on the same release while letting different
+    releases proceed in parallel. Conflicting calls queue in-process instead of
+    failing in the cluster with "another operation is in progress".
+    """
+
+    def __init__(self):
+        self._entries: Dict[ReleaseKey, _LockEntry] = {}
+
+    @staticmethod
+    def release_key(release_name: str, namespace: Optional[str] = None) -> ReleaseKey:
+        """
+        Returns the lock key for a release as helm would resolve it.
+        """
+        return current_kube_context(), effective_namespace(namespace), release_name
+
+    def _discard_if_idle(self, key: ReleaseKey, entry: _LockEntry) -> None:
+        if not entry.lock.locked() and not entry.waiters and self._entries.get(key) is entry:
+            del self._entries[key]
+
+    @asynccontextmanager
+    async def hold(self, release_name: str, namespace: Optional[str], operation: str) -> AsyncIterator[None]:
+        """
+        Holds the release's lock for the duration of a mutating operation.
+        """
+        key = self.release_key(release_name, namespace)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _LockEntry()
+
+        request = {"operation": operation, "since": time.time()}
+        if entry.lock.locked():
+            logger.info(f"Waiting for lock on release {key}: held by {entry.holder}")
+
+        entry.waiters.append(request)
+        try:
+            await entry.lock.acquire()
+        except BaseException:
+            entry.waiters.remove(request)
+            self._discard_if_idle(key, entry)
+            raise
+        entry.waiters.remove(request)
+
+        entry.holder = {"operation": operation, "since": time.time()}
+        try:
+            yield
+        finally:
+            entry.holder = None
+            entry.lock.release()
+            self._discard_if_idle(key, entry)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Returns the current holder and waiters for every locked release.
+        """
+        now = time.time()
+        snapshot = []
+        for (context, namespace, release_name), entry in self._entries.items():
+            snapshot.append({
+                "context": context or "(current)",
+                "namespace": namespace,
+                "release": release_name,
+                "holder": entry.holder["operation"] if entry.holder else None,
+                "held_for": now - entry.holder["since"] if entry.holder else 0.0,
+                "waiters": [waiter["operation"] for waiter in entry.waiters],
+            })
+        return snapshot
+
+
+release_locks = ReleaseLockManager()
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+import os
+import signal
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+# helm runs in its own process group on POSIX, so plugins and other children it
+# spawns are stopped together with it
+USE_PROCESS_GROUPS = os.name == "posix"
+
+
+class ProcessTerminator:
+    """
+    Stops helm processes whose caller went away: SIGTERM to the process group,
+    then SIGKILL once KILL_GRACE seconds have passed. Keeps time-to-kill metrics.
+    """
+
+    def __init__(self):
+        self.terminated = 0
+        self.killed = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self._pending: Set["asyncio.Future[None]"] = set()
+
+    def terminate(self, process: asyncio.subprocess.Process, cmd: List[str]) -> Optional["asyncio.Future[None]"]:
+        """
+        Starts stopping process in a task of its own, so it runs to the end even
+        if the caller is cancelled again. Returns the task for the caller to
+        wait on, or None if the process already exited.
+        """
+        if process.returncode is not None:
+            return None
+
+        task = asyncio.ensure_future(self._terminate(process, cmd))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return task
+
+    def _signal(self, process: asyncio.subprocess.Process, sig: int) -> None:
+        try:
+            if USE_PROCESS_GROUPS:
+                os.killpg(process.pid, sig)
+            elif sig == signal.SIGTERM:
+                process.terminate()
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+
+    async def _terminate(self, process: asyncio.subprocess.Process, cmd: List[str]) -> None:
+        started = time.monotonic()
+        logger.info(f"Terminating helm process {process.pid}: {' '.join(cmd)}")
+
+        self._signal(process, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(process.wait(), config.KILL_GRACE)
+        except asyncio.TimeoutError:
+            logger.warning(f"helm process {process.pid} ignored SIGTERM for {config.KILL_GRACE}s, killing it")
+            self._signal(process, getattr(signal, "SIGKILL", signal.SIGTERM))
+            self.killed += 1
+            await process.wait()
+
+        elapsed = time.monotonic() - started
+        self.terminated += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        logger.info(f"helm process {process.pid} stopped after {elapsed:.2f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "terminated": self.terminated,
+            "killed": self.killed,
+            "pending": len(self._pending),
+            "avg_time": self.total_time / self.terminated if self.terminated else 0.0,
+            "max_time": self.max_time,
+        }
+
+
+terminator = ProcessTerminator()
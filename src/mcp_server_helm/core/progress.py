@@ -0,0 +1,72 @@
+import logging
+from contextvars import ContextVar
+from typing import Any, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Longest progress message forwarded to the client; longer lines are cut
+MAX_MESSAGE_LENGTH = 500
+
+
+class ProgressReporter:
+    """
+    Forwards progress of a tool call to the MCP client that requested it
+    through its progress token.
+    """
+
+    def __init__(self, session: Any, progress_token: Union[str, int]):
+        self.session = session
+        self.progress_token = progress_token
+        self.sent = 0
+        self._supports_message = True
+
+    async def report(self, message: str) -> None:
+        """
+        Sends message as the next progress notification. Failures are logged and
+        never interrupt the running command.
+        """
+        if len(message) > MAX_MESSAGE_LENGTH:
+            message = message[:MAX_MESSAGE_LENGTH] + "..."
+
+        self.sent += 1
+        try:
+            if self._supports_message:
+                try:
+                    await self.session.send_progress_notification(self.progress_token, self.sent, message=message)
+                    return
+                except TypeError:
+                    # Older MCP SDKs cannot attach a message to progress notifications
+                    self._supports_message = False
+            await self.session.send_progress_notification(self.progress_token, self.sent)
+        except Exception as e:
+            logger.debug(f"Could not send progress notification: {e}")
+
+
+class ProgressFanout(ProgressReporter):
+    """
+    Forwards the progress of a call shared by several tool calls, such as a
+    coalesced read, to the reporters of every caller still waiting for it.
+    Callers that join later see the progress from then on.
+    """
+
+    def __init__(self):
+        self.reporters: List[ProgressReporter] = []
+        self.sent = 0
+
+    async def report(self, message: str) -> None:
+        self.sent += 1
+        for reporter in list(self.reporters):
+            await reporter.report(message)
+
+
+# Reporter of the tool call being handled in the current context, if the client asked for progress
+current_reporter: ContextVar[Optional[ProgressReporter]] = ContextVar("current_reporter", default=None)
+
+
+async def report_progress(message: str) -> None:
+    """
+    Reports progress to the client of the current tool call, if it asked for progress.
+    """
+    reporter = current_reporter.get()
+    if reporter is not None:
+        await reporter.report(message)
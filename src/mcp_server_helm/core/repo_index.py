@@ -0,0 +1,525 @@
+import asyncio
+import importlib
+import os
+import sys
+import logging
+from array import array
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from . import config
+from .semver import Constraints, Triple, Version, parse_constraints, parse_version
+
+# PyYAML is optional and slow to import, so it is imported by the first
+# index_support_available() check rather than at startup
+yaml: Any = None
+_yaml_imported = False
+
+logger = logging.getLogger(__name__)
+
+# Bit widths of the packed precedence keys stored per chart version. Components
+# that do not fit are clamped, which keeps the keys monotonic; ties are broken
+# by parsing the version string itself.
+_MINOR_BITS = 19
+_PATCH_BITS = 19
+_MAJOR_LIMIT = (1 << 24) - 1
+_MINOR_LIMIT = (1 << _MINOR_BITS) - 1
+_PATCH_LIMIT = (1 << _PATCH_BITS) - 1
+
+# Index entry fields kept in memory; everything else is skipped while parsing
+_KEPT_FIELDS = frozenset(["name", "version", "appVersion", "description", "keywords"])
+_NULL_SCALARS = frozenset(["", "~", "null", "Null", "NULL"])
+
+
+def _pack(major: int, minor: int, patch: int, release: bool) -> int:
+    return ((min(major, _MAJOR_LIMIT) << (_MINOR_BITS + _PATCH_BITS + 1)) |
+            (min(minor, _MINOR_LIMIT) << (_PATCH_BITS + 1)) |
+            (min(patch, _PATCH_LIMIT) << 1) |
+            (1 if release else 0))
+
+
+def pack_version(version: Version) -> int:
+    """
+    Packs a version into a 63-bit integer whose order never contradicts semver precedence.
+    """
+    return _pack(version.major, version.minor, version.patch, not version.prerelease)
+
+
+class ChartVersion(NamedTuple):
+    """
+    A view of one repository index entry.
+    """
+    name: str
+    version: str
+    app_version: str
+    description: str
+    keywords: Tuple[str, ...]
+
+
+class ChartRecord:
+    """
+    All versions of one chart in a repository, stored as parallel arrays sorted
+    newest first. Strings are interned so repeated descriptions and app versions
+    cost one pointer per version.
+    """
+
+    __slots__ = ("name", "versions", "packed", "names", "app_versions", "descriptions", "keywords")
+
+    def __init__(self, name: str, versions: Tuple[str, ...], packed: array, names: Tuple[str, ...],
+                 app_versions: Tuple[str, ...], descriptions: Tuple[str, ...],
+                 keywords: Tuple[Tuple[str, ...], ...]):
+        self.name = name
+        self.versions = versions
+        self.packed = packed
+        self.names = names
+        self.app_versions = app_versions
+        self.descriptions = descriptions
+        self.keywords = keywords
+
+    def __len__(self) -> int:
+        return len(self.versions)
+
+    def entry(self, position: int) -> ChartVersion:
+        return ChartVersion(self.names[position], self.versions[position], self.app_versions[position],
+                            self.descriptions[position], self.keywords[position])
+
+    def semver(self, position: int) -> Version:
+        # Versions were validated while loading, so parsing cannot fail here
+        return parse_version(self.versions[position])
+
+    def _first_at_most(self, upper: Optional[Triple]) -> int:
+        """
+        Binary searches the newest-first packed keys for the first version not above upper.
+        """
+        if upper is None:
+            return 0
+        limit = _pack(upper[0], upper[1], upper[2], True)
+        low, high = 0, len(self.packed)
+        while low < high:
+            middle = (low + high) // 2
+            if self.packed[middle] > limit:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def latest_matching(self, constraints: Constraints) -> Optional[int]:
+        """
+        Returns the position of the newest version satisfying constraints, or None.
+
+        Each OR-ed group is bounded with one binary search; only versions inside
+        the group's bounds are checked against the exact constraint.
+        """
+        best: Optional[int] = None
+        for group in constraints.groups:
+            lower, upper = Constraints.group_bounds(group)
+            floor = _pack(lower[0], lower[1], lower[2], False) if lower is not None else -1
+            stop = len(self.packed) if best is None else best
+            for position in range(self._first_at_most(upper), stop):
+                if self.packed[position] < floor:
+                    break
+                version = self.semver(position)
+                if all(constraint.check(version) for constraint in group):
+                    best = position
+                    break
+        return best
+
+    def precedence(self, position: int) -> Tuple:
+        """
+        Returns a sort key for a version, only parsing it when packed keys can tie.
+        """
+        packed = self.packed[position]
+        if packed & 1:
+            return (packed,)
+        return (packed,) + self.semver(position).key
+
+
+class RepositoryIndex:
+    """
+    The charts of one repository, as loaded from its cached index file.
+    """
+
+    __slots__ = ("name", "stamp", "charts", "version_count", "memory_bytes")
+
+    def __init__(self, name: str, stamp: Optional[Tuple[int, int]], charts: Dict[str, ChartRecord]):
+        self.name = name
+        self.stamp = stamp
+        self.charts = charts
+        self.version_count = sum(len(record) for record in charts.values())
+        self.memory_bytes = _estimate_memory(charts)
+
+
+def _estimate_memory(charts: Dict[str, ChartRecord]) -> int:
+    """
+    Approximates the memory held by a repository's records, counting shared objects once.
+    """
+    seen = set()
+    total = sys.getsizeof(charts)
+
+    def add(obj: Any) -> None:
+        nonlocal total
+        if id(obj) not in seen:
+            seen.add(id(obj))
+            total += sys.getsizeof(obj)
+
+    for chart_name, record in charts.items():
+        add(chart_name)
+        add(record)
+        for values in (record.versions, record.names, record.app_versions, record.descriptions, record.keywords):
+            add(values)
+            for value in values:
+                add(value)
+        add(record.packed)
+        for keywords in record.keywords:
+            for keyword in keywords:
+                add(keyword)
+    return total
+
+
+def index_support_available() -> bool:
+    """
+    Reading repository indexes natively requires PyYAML.
+    """
+    global yaml, _yaml_imported
+    if not _yaml_imported:
+        _yaml_imported = True
+        try:
+            yaml = importlib.import_module("yaml")
+        except ImportError:
+            yaml = None
+    return yaml is not None
+
+
+def _yaml_loader():
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _helm_home(env_name: str, xdg_name: str, darwin_dir: str, windows_env: str, linux_default: str) -> str:
+    # Mirrors helm's helmpath lookup: HELM_*_HOME, then XDG_*, then platform defaults
+    if os.environ.get(env_name):
+        return os.environ[env_name]
+    if os.environ.get(xdg_name):
+        return os.path.join(os.environ[xdg_name], "helm")
+    if sys.platform == "darwin":
+        return os.path.join(os.path.expanduser("~"), "Library", darwin_dir, "helm")
+    if sys.platform == "win32" and os.environ.get(windows_env):
+        return os.path.join(os.environ[windows_env], "helm")
+    return os.path.join(os.path.expanduser("~"), linux_default, "helm")
+
+
+def repository_config_path() -> str:
+    """
+    Returns the path of helm's repositories.yaml.
+    """
+    if os.environ.get("HELM_REPOSITORY_CONFIG"):
+        return os.environ["HELM_REPOSITORY_CONFIG"]
+    config_home = _helm_home("HELM_CONFIG_HOME", "XDG_CONFIG_HOME", "Preferences", "APPDATA", ".config")
+    return os.path.join(config_home, "repositories.yaml")
+
+
+def repository_cache_path() -> str:
+    """
+    Returns the directory helm caches repository index files in.
+    """
+    if os.environ.get("HELM_REPOSITORY_CACHE"):
+        return os.environ["HELM_REPOSITORY_CACHE"]
+    cache_home = _helm_home("HELM_CACHE_HOME", "XDG_CACHE_HOME", "Caches", "TEMP", ".cache")
+    return os.path.join(cache_home, "repository")
+
+
+def index_file_path(repo_name: str) -> str:
+    """
+    Returns the cached index.yaml location of a repository.
+    """
+    return os.path.join(repository_cache_path(), f"{repo_name}-index.yaml")
+
+
+def load_repositories() -> List[Dict[str, Any]]:
+    """
+    Returns the repositories configured in helm's repositories.yaml.
+    """
+    with open(repository_config_path(), "r", encoding="utf-8") as f:
+        document = yaml.load(f, Loader=_yaml_loader()) or {}
+
+    return [repo for repo in document.get("repositories") or [] if repo and repo.get("name")]
+
+
+def file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Returns (mtime, size) of a file, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _skip_node(events: Iterator[Any], event: Any) -> None:
+    """
+    Consumes the rest of a node whose start event has already been read.
+    """
+    if not isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+        return
+
+    depth = 1
+    for event in events:
+        if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            depth += 1
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            depth -= 1
+            if depth == 0:
+                return
+
+
+def _scalar(event: Any) -> str:
+    if not isinstance(event, yaml.ScalarEvent):
+        return ""
+    if not event.style and event.value in _NULL_SCALARS:
+        return ""
+    return event.value
+
+
+def _read_entry(events: Iterator[Any]) -> Dict[str, Any]:
+    """
+    Reads the kept fields of one chart version mapping.
+    """
+    entry: Dict[str, Any] = {}
+    for event in events:
+        if isinstance(event, yaml.MappingEndEvent):
+            return entry
+
+        key = _scalar(event)
+        value = next(events)
+        if key not in _KEPT_FIELDS:
+            _skip_node(events, value)
+        elif key == "keywords":
+            keywords = []
+            if isinstance(value, yaml.SequenceStartEvent):
+                for item in events:
+                    if isinstance(item, yaml.SequenceEndEvent):
+                        break
+                    if isinstance(item, yaml.ScalarEvent):
+                        keywords.append(item.value)
+                    else:
+                        _skip_node(events, item)
+            entry[key] = keywords
+        else:
+            _skip_node(events, value)
+            entry[key] = _scalar(value)
+    return entry
+
+
+def _build_record(chart_name: str, entries: List[Dict[str, Any]], strings: Dict[str, str],
+                  keyword_sets: Dict[Tuple[str, ...], Tuple[str, ...]], path: str) -> Optional[ChartRecord]:
+    def intern(value: str) -> str:
+        return strings.setdefault(value, value)
+
+    parsed = []
+    for entry in entries:
+        version = entry.get("version", "")
+        semver = parse_version(version)
+        if semver is None:
+            # helm skips entries it cannot validate as well
+            logger.debug(f"Skipping invalid entry for chart {chart_name} {version!r} in {path}")
+            continue
+        parsed.append((semver, entry))
+
+    if not parsed:
+        return None
+
+    parsed.sort(key=lambda item: item[0].key, reverse=True)
+
+    keywords = []
+    for _, entry in parsed:
+        words = tuple(intern(word) for word in entry.get("keywords") or ())
+        keywords.append(keyword_sets.setdefault(words, words))
+
+    return ChartRecord(
+        intern(chart_name),
+        tuple(intern(entry["version"]) for _, entry in parsed),
+        array("q", (pack_version(semver) for semver, _ in parsed)),
+        tuple(intern(entry.get("name") or chart_name) for _, entry in parsed),
+        tuple(intern(entry.get("appVersion", "")) for _, entry in parsed),
+        tuple(intern(entry.get("description", "")) for _, entry in parsed),
+        tuple(keywords)
+    )
+
+
+def load_repository_index(repo_name: str, path: str) -> RepositoryIndex:
+    """
+    Streams a repository index file into compact chart records.
+
+    The document is parsed event by event and only the fields the server uses
+    are kept, so peak memory stays close to the size of the final records
+    instead of the whole parsed document.
+    """
+    stamp = file_stamp(path)
+    strings: Dict[str, str] = {}
+    keyword_sets: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+    charts: Dict[str, ChartRecord] = {}
+
+    with open(path, "r", encoding="utf-8") as f:
+        events = iter(yaml.parse(f, Loader=_yaml_loader()))
+
+        # Find the top-level "entries" mapping
+        for event in events:
+            if isinstance(event, yaml.MappingStartEvent):
+                break
+        for event in events:
+            if isinstance(event, yaml.MappingEndEvent):
+                break
+            key = _scalar(event)
+            value = next(events)
+            if key != "entries" or not isinstance(value, yaml.MappingStartEvent):
+                _skip_node(events, value)
+                continue
+
+            for chart_event in events:
+                if isinstance(chart_event, yaml.MappingEndEvent):
+                    break
+                chart_name = _scalar(chart_event)
+                versions_event = next(events)
+                if not isinstance(versions_event, yaml.SequenceStartEvent):
+                    _skip_node(events, versions_event)
+                    continue
+
+                entries = []
+                for item in events:
+                    if isinstance(item, yaml.SequenceEndEvent):
+                        break
+                    if isinstance(item, yaml.MappingStartEvent):
+                        entries.append(_read_entry(events))
+                    else:
+                        _skip_node(events, item)
+
+                record = _build_record(chart_name, entries, strings, keyword_sets, path)
+                if record is not None:
+                    charts[record.name] = record
+
+    return RepositoryIndex(repo_name, stamp, charts)
+
+
+class RepositoryIndexes:
+    """
+    The compact indexes of every configured repository, reloaded when
+    repositories.yaml or a repository's cached index file changes.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self._config_stamp: Optional[Tuple[int, int]] = None
+        self._repo_names: List[str] = []
+        self._indexes: Dict[str, RepositoryIndex] = {}
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    async def refresh(self) -> bool:
+        """
+        Reloads changed repositories. Returns False if native indexes are unavailable.
+        """
+        if not index_support_available():
+            return False
+
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+
+        async with self._refresh_lock:
+            loop = asyncio.get_running_loop()
+            changed = False
+
+            config_stamp = file_stamp(repository_config_path())
+            if config_stamp is None:
+                return False
+            if config_stamp != self._config_stamp:
+                repositories = await loop.run_in_executor(None, load_repositories)
+                self._repo_names = [str(repo["name"]) for repo in repositories]
+                self._config_stamp = config_stamp
+                changed = True
+
+            for removed in set(self._indexes) - set(self._repo_names):
+                del self._indexes[removed]
+                changed = True
+
+            for repo_name in self._repo_names:
+                path = index_file_path(repo_name)
+                stamp = file_stamp(path)
+                current = self._indexes.get(repo_name)
+                if current is not None and current.stamp == stamp:
+                    continue
+
+                index = RepositoryIndex(repo_name, stamp, {})
+                if stamp is not None:
+                    try:
+                        index = await loop.run_in_executor(None, load_repository_index, repo_name, path)
+                        logger.info(f"Loaded index for repository {repo_name}: {index.version_count} chart versions, "
+                                    f"~{index.memory_bytes} bytes")
+                    except Exception as e:
+                        # helm also warns and skips repositories it cannot read
+                        logger.warning(f"Repo {repo_name} is corrupt or missing: {e}")
+                self._indexes[repo_name] = index
+                changed = True
+
+            if changed:
+                self.generation += 1
+
+        return True
+
+    def adopt(self, index: RepositoryIndex) -> None:
+        """
+        Installs an index that was just parsed from the repository's cached index
+        file, so the next refresh does not load it again.
+        """
+        self._indexes[index.name] = index
+        self.generation += 1
+
+    def repositories(self) -> List[RepositoryIndex]:
+        """
+        Returns the loaded repositories in repositories.yaml order.
+        """
+        return [self._indexes[name] for name in self._repo_names if name in self._indexes]
+
+    def get(self, repo_name: str) -> Optional[RepositoryIndex]:
+        return self._indexes.get(repo_name)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [{
+            "repository": index.name,
+            "charts": len(index.charts),
+            "versions": index.version_count,
+            "memory_bytes": index.memory_bytes,
+        } for index in self.repositories()]
+
+
+repository_indexes = RepositoryIndexes()
+
+
+async def resolve_chart_version(chart: str, repo: Optional[str] = None,
+                                version: Optional[str] = None) -> Optional[str]:
+    """
+    Resolves the exact chart version helm would pick for repo/chart from the
+    cached repository index, or returns None if it cannot be resolved natively.
+
+    Without a version this is the newest stable version. Otherwise an exact
+    match wins, then the newest version satisfying the constraint, as in helm.
+    """
+    if not repo or not config.NATIVE_INDEX or not await repository_indexes.refresh():
+        return None
+
+    index = repository_indexes.get(repo)
+    record = index.charts.get(chart) if index is not None else None
+    if record is None:
+        return None
+
+    if version is None:
+        # helm's "*" default: the newest version without a prerelease
+        version = "*"
+    elif version in record.versions:
+        return version
+
+    try:
+        constraints = parse_constraints(version)
+    except ValueError:
+        # Let helm report the malformed constraint
+        return None
+
+    position = record.latest_matching(constraints)
+    return record.versions[position] if position is not None else None
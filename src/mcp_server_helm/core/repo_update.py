@@ -0,0 +1,256 @@
+import asyncio
+import base64
+import gzip
+import json
+import logging
+import os
+import ssl
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from . import config
+from .repo_index import (RepositoryIndex, file_stamp, index_file_path, index_support_available, load_repositories,
+                         load_repository_index, repository_cache_path, repository_indexes)
+from .utils import run_helm_command
+
+logger = logging.getLogger(__name__)
+
+# Repository URL schemes fetched natively; anything else (plugin schemes such as
+# s3:// or gs://) is delegated to `helm repo update <name>`
+NATIVE_SCHEMES = ("http", "https")
+
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+FAILED = "failed"
+
+
+class RepoUpdateResult(NamedTuple):
+    name: str
+    url: str
+    status: str
+    seconds: float
+    downloaded_bytes: int
+    index_bytes: int
+    error: str = ""
+
+
+def _validators_path() -> str:
+    return os.path.join(config.STATE_DIR, "repo-validators.json")
+
+
+def _load_validators() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(_validators_path(), "r", encoding="utf-8") as f:
+            validators = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return validators if isinstance(validators, dict) else {}
+
+
+def _save_validators(validators: Dict[str, Dict[str, Any]]) -> None:
+    path = _validators_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write_atomically(path, json.dumps(validators, indent=2, sort_keys=True).encode("utf-8"))
+    except OSError as e:
+        logger.warning(f"Could not save repository validators to {path}: {e}")
+
+
+def _write_atomically(path: str, data: bytes, validate=None) -> Any:
+    """
+    Writes data next to path and renames it into place, so readers never see a
+    partial file. If given, validate(tmp_path) runs before the rename and its
+    result is returned.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-" + os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates private files; cached indexes are world-readable like helm's
+        os.chmod(tmp_path, 0o644)
+        result = validate(tmp_path) if validate is not None else None
+        os.replace(tmp_path, path)
+        return result
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _index_url(repo_url: str) -> str:
+    # Like helm, index.yaml is resolved relative to the repository URL, keeping any query string
+    parts = urllib.parse.urlsplit(repo_url)
+    return urllib.parse.urlunsplit(parts._replace(path=parts.path.rstrip("/") + "/index.yaml"))
+
+
+def _ssl_context(repo: Dict[str, Any]) -> Optional[ssl.SSLContext]:
+    if urllib.parse.urlsplit(str(repo["url"])).scheme != "https":
+        return None
+
+    context = ssl.create_default_context(cafile=repo.get("caFile") or None)
+    if repo.get("certFile") and repo.get("keyFile"):
+        context.load_cert_chain(repo["certFile"], repo["keyFile"])
+    if repo.get("insecure_skip_tls_verify"):
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def _build_request(repo: Dict[str, Any], validator: Optional[Dict[str, Any]]) -> urllib.request.Request:
+    request = urllib.request.Request(_index_url(str(repo["url"])))
+    request.add_header("Accept-Encoding", "gzip")
+
+    if validator is not None:
+        if validator.get("etag"):
+            request.add_header("If-None-Match", validator["etag"])
+        if validator.get("last_modified"):
+            request.add_header("If-Modified-Since", validator["last_modified"])
+
+    if repo.get("username") or repo.get("password"):
+        credentials = f"{repo.get('username') or ''}:{repo.get('password') or ''}".encode("utf-8")
+        header = "Basic " + base64.b64encode(credentials).decode("ascii")
+        if repo.get("pass_credentials_all"):
+            request.add_header("Authorization", header)
+        else:
+            # Unredirected headers are dropped when the server redirects elsewhere
+            request.add_unredirected_header("Authorization", header)
+    return request
+
+
+def _validator_for(repo: Dict[str, Any], validators: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    # Validators only apply while the cached index is still the file they were recorded for
+    validator = validators.get(str(repo["name"]))
+    if not validator or validator.get("url") != repo["url"]:
+        return None
+    stamp = file_stamp(index_file_path(str(repo["name"])))
+    if stamp is None or list(stamp) != validator.get("stamp"):
+        return None
+    return validator
+
+
+def _fetch_index(repo: Dict[str, Any], validator: Optional[Dict[str, Any]]
+                 ) -> Tuple[RepoUpdateResult, Optional[RepositoryIndex], Optional[Dict[str, Any]]]:
+    """
+    Downloads one repository index, conditionally if validators are known, and
+    installs it into helm's repository cache. Runs in a worker thread.
+
+    Returns the result, the parsed index if it changed, and the validators to
+    record for the next update.
+    """
+    name = str(repo["name"])
+    url = str(repo["url"])
+    path = index_file_path(name)
+    started = time.monotonic()
+
+    try:
+        try:
+            with urllib.request.urlopen(_build_request(repo, validator), timeout=config.REPO_UPDATE_TIMEOUT,
+                                        context=_ssl_context(repo)) as response:
+                body = response.read()
+                headers = response.headers
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and validator is not None:
+                result = RepoUpdateResult(name, url, UNCHANGED, time.monotonic() - started, 0, validator["stamp"][1])
+                return result, None, validator
+            raise
+
+        downloaded = len(body)
+        if headers.get("Content-Encoding", "").lower() == "gzip":
+            body = gzip.decompress(body)
+
+        os.makedirs(repository_cache_path(), exist_ok=True)
+        # Parsing validates the download before it replaces the cached index, and
+        # the parsed index is handed to the in-memory indexes instead of reloading it
+        index = _write_atomically(path, body, validate=lambda tmp_path: load_repository_index(name, tmp_path))
+
+        # helm keeps the chart names next to the index for shell completion
+        charts = "".join(f"{chart_name}\n" for chart_name in index.charts)
+        _write_atomically(os.path.join(repository_cache_path(), f"{name}-charts.txt"), charts.encode("utf-8"))
+
+        new_validator = None
+        if headers.get("ETag") or headers.get("Last-Modified"):
+            new_validator = {
+                "url": url,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "stamp": list(index.stamp) if index.stamp is not None else None,
+            }
+        result = RepoUpdateResult(name, url, UPDATED, time.monotonic() - started, downloaded, len(body))
+        return result, index, new_validator
+    except Exception as e:
+        if isinstance(e, urllib.error.URLError) and not isinstance(e, urllib.error.HTTPError):
+            e = e.reason
+        return RepoUpdateResult(name, url, FAILED, time.monotonic() - started, 0, 0, error=str(e)), None, None
+
+
+async def _update_with_helm(repo: Dict[str, Any]) -> RepoUpdateResult:
+    started = time.monotonic()
+    result = await run_helm_command(["helm", "repo", "update", str(repo["name"])])
+    seconds = time.monotonic() - started
+    stamp = file_stamp(index_file_path(str(repo["name"])))
+    index_bytes = stamp[1] if stamp is not None else 0
+
+    if not result.ok:
+        return RepoUpdateResult(str(repo["name"]), str(repo["url"]), FAILED, seconds, 0, 0, error=result.stderr.strip())
+    return RepoUpdateResult(str(repo["name"]), str(repo["url"]), UPDATED, seconds, index_bytes, index_bytes)
+
+
+async def update_repositories(names: Optional[List[str]] = None) -> Optional[List[RepoUpdateResult]]:
+    """
+    Refreshes repository indexes concurrently, or returns None when the caller
+    should fall back to `helm repo update`.
+
+    Up to REPO_UPDATE_CONCURRENCY indexes are fetched at once. Each request
+    carries the ETag and Last-Modified validators of the previous download, so
+    unchanged repositories are neither downloaded nor reparsed.
+
+    Raises ValueError if names contains repositories that are not configured.
+    """
+    if not index_support_available():
+        return None
+
+    loop = asyncio.get_running_loop()
+    try:
+        repositories = await loop.run_in_executor(None, load_repositories)
+    except Exception as e:
+        logger.info(f"Falling back to helm repo update: {e}")
+        return None
+
+    if names:
+        configured = {str(repo["name"]): repo for repo in repositories}
+        missing = [name for name in names if name not in configured]
+        if missing:
+            raise ValueError(f"no repositories found matching '{', '.join(missing)}'. Nothing will be updated")
+        repositories = [configured[name] for name in dict.fromkeys(names)]
+
+    validators = _load_validators()
+    workers = asyncio.Semaphore(config.REPO_UPDATE_CONCURRENCY)
+
+    async def update(repo: Dict[str, Any]) -> RepoUpdateResult:
+        async with workers:
+            name = str(repo["name"])
+            if urllib.parse.urlsplit(str(repo.get("url") or "")).scheme not in NATIVE_SCHEMES:
+                result = await _update_with_helm(repo)
+            else:
+                result, index, validator = await loop.run_in_executor(
+                    None, _fetch_index, repo, _validator_for(repo, validators))
+                if index is not None:
+                    repository_indexes.adopt(index)
+                if validator is not None:
+                    validators[name] = validator
+                else:
+                    validators.pop(name, None)
+
+            logger.info(f"Repository {name}: {result.status} in {result.seconds:.2f}s, "
+                        f"{result.downloaded_bytes} bytes downloaded")
+            return result
+
+    results = await asyncio.gather(*(update(repo) for repo in repositories))
+    await loop.run_in_executor(None, _save_validators, validators)
+    return list(results)
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+READ_LANE = "read"
+MUTATE_LANE = "mutate"
+
+# Helm subcommands that never change cluster or local state. Everything else,
+# including slow local operations such as `repo update`, goes to the mutate lane.
+READ_SUBCOMMANDS = frozenset(["env", "get", "history", "list", "search", "show", "status", "version"])
+
+
+def lane_for_command(cmd: List[str]) -> str:
+    """
+    Returns the scheduler lane a helm command line belongs to.
+    """
+    if len(cmd) > 1 and cmd[1] in READ_SUBCOMMANDS:
+        return READ_LANE
+    return MUTATE_LANE
+
+
+class _Lane:
+    """
+    A bounded pool of helm process slots with queueing statistics.
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.running = 0
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.started = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to the loop they are first used on, and the sync
+        # execute_helm_command wrapper runs each call in a fresh loop.
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.limit)
+            self._loop = loop
+        return self._semaphore
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        semaphore = self._get_semaphore()
+        queued_at = time.monotonic()
+        queued = semaphore.locked()
+        if queued:
+            self.waiting += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+        try:
+            await semaphore.acquire()
+        finally:
+            if queued:
+                self.waiting -= 1
+
+        waited = time.monotonic() - queued_at
+        self.started += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lane": self.name,
+            "limit": self.limit,
+            "running": self.running,
+            "waiting": self.waiting,
+            "peak_waiting": self.peak_waiting,
+            "started": self.started,
+            "avg_wait": self.total_wait / self.started if self.started else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+
+class HelmScheduler:
+    """
+    Limits how many helm processes run at once, with separate lanes for
+    read-only and mutating commands so cheap reads never queue behind slow
+    `--wait` upgrades.
+    """
+
+    def __init__(self, read_limit: int, mutate_limit: int):
+        self._lanes = {
+            READ_LANE: _Lane(READ_LANE, read_limit),
+            MUTATE_LANE: _Lane(MUTATE_LANE, mutate_limit),
+        }
+
+    @asynccontextmanager
+    async def slot(self, cmd: List[str]) -> AsyncIterator[None]:
+        """
+        Waits for a free slot in the command's lane and holds it while the process runs.
+        """
+        lane = self._lanes[lane_for_command(cmd)]
+        async with lane.slot():
+            yield
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Returns queue depth and wait time counters for every lane.
+        """
+        return [lane.stats() for lane in self._lanes.values()]
+
+
+scheduler = HelmScheduler(config.READ_CONCURRENCY, config.MUTATE_CONCURRENCY)
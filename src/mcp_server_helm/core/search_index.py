@@ -0,0 +1,176 @@
+import logging
+import re
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from .repo_index import ChartRecord, ChartVersion, repository_indexes
+from .semver import parse_constraints
+
+logger = logging.getLogger(__name__)
+
+# Field separator helm's search index places between name, repo/name,
+# description and keywords. A match's score is the number of fields before it.
+SEP = "\v"
+
+
+class SearchResult(NamedTuple):
+    name: str
+    score: int
+    record: ChartRecord
+    position: int
+
+    @property
+    def chart(self) -> ChartVersion:
+        return self.record.entry(self.position)
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """
+    In-memory replacement for `helm search repo` built from the compact
+    repository indexes.
+
+    Identical search lines (most chart versions share a description and keywords)
+    are stored once, and a trigram inverted index over those lines narrows
+    literal searches to a handful of candidates. The index is rebuilt whenever a
+    repository index is reloaded.
+    """
+
+    def __init__(self):
+        self._generation = -1
+        self._lines: List[str] = []
+        self._line_entries: List[List[Tuple[str, ChartRecord, int]]] = []
+        self._trigram_postings: Dict[str, Set[int]] = {}
+
+    async def refresh(self) -> bool:
+        """
+        Rebuilds the index if a repository changed. Returns False if the native index is unavailable.
+        """
+        if not await repository_indexes.refresh():
+            return False
+
+        if self._generation != repository_indexes.generation:
+            self._rebuild()
+            self._generation = repository_indexes.generation
+        return True
+
+    def _rebuild(self) -> None:
+        line_ids: Dict[str, int] = {}
+        lines: List[str] = []
+        line_entries: List[List[Tuple[str, ChartRecord, int]]] = []
+
+        for index in repository_indexes.repositories():
+            for chart_name, record in index.charts.items():
+                full_name = f"{index.name}/{chart_name}"
+                for position in range(len(record)):
+                    name = record.names[position]
+                    line = (name + SEP + index.name + "/" + name + SEP + record.descriptions[position] +
+                            SEP + " ".join(record.keywords[position])).lower()
+                    line_id = line_ids.get(line)
+                    if line_id is None:
+                        line_id = line_ids[line] = len(lines)
+                        lines.append(line)
+                        line_entries.append([])
+                    line_entries[line_id].append((full_name, record, position))
+
+        postings: Dict[str, Set[int]] = {}
+        for line_id, line in enumerate(lines):
+            for trigram in _trigrams(line):
+                postings.setdefault(trigram, set()).add(line_id)
+
+        self._lines = lines
+        self._line_entries = line_entries
+        self._trigram_postings = postings
+        logger.info(f"Rebuilt search index: {sum(len(e) for e in line_entries)} chart versions, {len(lines)} unique lines")
+
+    def _candidates(self, term: str) -> List[int]:
+        if len(term) < 3:
+            return list(range(len(self._lines)))
+
+        postings = sorted((self._trigram_postings.get(t, set()) for t in _trigrams(term)), key=len)
+        if not postings[0]:
+            return []
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return sorted(candidates)
+
+    def _results(self, line_id: int, score: int) -> List[SearchResult]:
+        return [SearchResult(name, score, record, position) for name, record, position in self._line_entries[line_id]]
+
+    def search(self, term: str, regexp: bool = False) -> List[SearchResult]:
+        """
+        Finds chart versions matching term with helm's scoring, sorted the way helm sorts them.
+
+        Raises re.error for an invalid regular expression.
+        """
+        results: List[SearchResult] = []
+
+        if regexp:
+            # Like helm, the expression is applied as given to the lowercased line
+            matcher = re.compile(term)
+            for line_id, line in enumerate(self._lines):
+                match = matcher.search(line)
+                if match is not None:
+                    results.extend(self._results(line_id, line.count(SEP, 0, match.start())))
+        else:
+            term = term.lower()
+            for line_id in self._candidates(term):
+                line = self._lines[line_id]
+                position = line.find(term)
+                if position != -1:
+                    results.extend(self._results(line_id, line.count(SEP, 0, position)))
+
+        results.sort(key=lambda result: result.record.precedence(result.position), reverse=True)
+        results.sort(key=lambda result: (result.score, result.name))
+        return results
+
+
+search_index = SearchIndex()
+
+
+async def search_repositories(keyword: str, regexp: bool = False, versions: bool = False,
+                              version: Optional[str] = None) -> Optional[List[Dict[str, str]]]:
+    """
+    Answers `helm search repo` from the in-memory index, or returns None when the
+    caller should fall back to running helm.
+
+    Results are filtered by the version constraint, defaulting to helm's
+    ">0.0.0" (stable versions only), and only the newest match per chart is
+    kept unless versions is set.
+    """
+    try:
+        constraints = parse_constraints(version or ">0.0.0")
+    except ValueError as e:
+        logger.info(f"Falling back to helm for version constraint {version!r}: {e}")
+        return None
+
+    if not await search_index.refresh():
+        return None
+
+    try:
+        results = search_index.search(keyword, regexp)
+    except re.error as e:
+        logger.info(f"Falling back to helm for regular expression {keyword!r}: {e}")
+        return None
+
+    charts = []
+    seen = set()
+    for result in results:
+        if not versions and result.name in seen:
+            continue
+        if not constraints.check(result.record.semver(result.position)):
+            continue
+        seen.add(result.name)
+        chart = result.chart
+        charts.append({
+            "name": result.name,
+            "version": chart.version,
+            "app_version": chart.app_version,
+            "description": chart.description,
+        })
+    return charts
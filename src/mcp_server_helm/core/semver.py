@@ -0,0 +1,322 @@
+import re
+from typing import List, Optional, Tuple
+
+# Semantic versions as accepted by Masterminds/semver's NewVersion, which helm
+# uses for chart versions: a leading "v" and missing minor/patch are tolerated.
+VERSION_PATTERN = re.compile(
+    r"^v?(0|[1-9]\d*)(?:\.(0|[1-9]\d*))?(?:\.(0|[1-9]\d*))?"
+    r"(?:-((?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?"
+    r"(?:\+([0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
+)
+
+
+def _prerelease_key(prerelease: str) -> Tuple:
+    # Numeric identifiers sort before alphanumeric ones and compare numerically;
+    # a version without a prerelease sorts after all of its prereleases.
+    if not prerelease:
+        return (1, ())
+
+    parts = []
+    for part in prerelease.split("."):
+        if part.isdigit():
+            parts.append((0, int(part), ""))
+        else:
+            parts.append((1, 0, part))
+    return (0, tuple(parts))
+
+
+class Version:
+    """
+    A parsed semantic version, ordered by semver precedence.
+    """
+
+    __slots__ = ("major", "minor", "patch", "prerelease", "metadata", "original", "key")
+
+    def __init__(self, major: int, minor: int, patch: int, prerelease: str = "",
+                 metadata: str = "", original: Optional[str] = None):
+        self.major = major
+        self.minor = minor
+        self.patch = patch
+        self.prerelease = prerelease
+        self.metadata = metadata
+        self.original = original if original is not None else str(self)
+        self.key = (major, minor, patch) + _prerelease_key(prerelease)
+
+    def __str__(self) -> str:
+        version = f"{self.major}.{self.minor}.{self.patch}"
+        if self.prerelease:
+            version += f"-{self.prerelease}"
+        if self.metadata:
+            version += f"+{self.metadata}"
+        return version
+
+    def __repr__(self) -> str:
+        return f"Version({self.original!r})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Version) and self.key == other.key
+
+    def __lt__(self, other: "Version") -> bool:
+        return self.key < other.key
+
+    def __le__(self, other: "Version") -> bool:
+        return self.key <= other.key
+
+    def __gt__(self, other: "Version") -> bool:
+        return self.key > other.key
+
+    def __ge__(self, other: "Version") -> bool:
+        return self.key >= other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+
+def parse_version(version: str) -> Optional[Version]:
+    """
+    Parses a version string, returning None if it is not a valid semantic version.
+    """
+    match = VERSION_PATTERN.match(version)
+    if match is None:
+        return None
+
+    major, minor, patch, prerelease, metadata = match.groups()
+    return Version(int(major), int(minor or 0), int(patch or 0),
+                   prerelease or "", metadata or "", original=version)
+
+
+# Constraint grammar of Masterminds/semver v3, which helm uses for --version
+_CONSTRAINT_VERSION = (r"v?([0-9|x|X|\*]+)(\.[0-9|x|X|\*]+)?(\.[0-9|x|X|\*]+)?"
+                       r"(-([0-9A-Za-z\-]+(\.[0-9A-Za-z\-]+)*))?"
+                       r"(\+([0-9A-Za-z\-]+(\.[0-9A-Za-z\-]+)*))?")
+_OPERATORS = ("!=", ">=", "=>", "<=", "=<", "~>", "=", ">", "<", "~", "^", "")
+_OPERATOR_PATTERN = "|".join(re.escape(op) for op in _OPERATORS)
+
+CONSTRAINT_PATTERN = re.compile(rf"^\s*({_OPERATOR_PATTERN})\s*({_CONSTRAINT_VERSION})\s*$")
+_RANGE_PATTERN = re.compile(rf"\s*({_CONSTRAINT_VERSION})\s+-\s+({_CONSTRAINT_VERSION})\s*")
+_FIND_PATTERN = re.compile(rf"({_OPERATOR_PATTERN})\s*({_CONSTRAINT_VERSION})")
+_VALID_PATTERN = re.compile(rf"^(\s*({_OPERATOR_PATTERN})\s*({_CONSTRAINT_VERSION})\s*)"
+                            rf"((?:\s+|,\s*)({_OPERATOR_PATTERN})\s*({_CONSTRAINT_VERSION})\s*)*$")
+
+# Stand-in for "no limit" in (major, minor, patch) bounds
+UNBOUNDED = 1 << 62
+
+Triple = Tuple[int, int, int]
+
+
+def _is_wildcard(part: Optional[str]) -> bool:
+    return part in ("x", "X", "*")
+
+
+class Constraint:
+    """
+    A single comparison such as ">=1.2", "~1.4" or "2.x", with Masterminds
+    semantics: wildcards and missing parts make a constraint "dirty", and
+    prerelease versions only match constraints that carry a prerelease
+    themselves.
+    """
+
+    __slots__ = ("operator", "version", "dirty", "minor_dirty", "patch_dirty")
+
+    def __init__(self, text: str):
+        match = CONSTRAINT_PATTERN.match(text)
+        if match is None:
+            raise ValueError(f"improper constraint: {text}")
+
+        operator, version = match.group(1), match.group(2)
+        major, minor, patch, prerelease = match.group(3), match.group(4), match.group(5), match.group(6) or ""
+        self.dirty = self.minor_dirty = self.patch_dirty = False
+
+        if _is_wildcard(major) or not major:
+            version = f"0.0.0{prerelease}"
+            self.dirty = True
+        elif not minor or _is_wildcard(minor[1:]):
+            version = f"{major}.0.0{prerelease}"
+            self.dirty = self.minor_dirty = True
+        elif not patch or _is_wildcard(patch[1:]):
+            version = f"{major}{minor}.0{prerelease}"
+            self.dirty = self.patch_dirty = True
+
+        parsed = parse_version(version)
+        if parsed is None:
+            raise ValueError(f"improper constraint: {text}")
+
+        self.operator = operator
+        self.version = parsed
+
+    def __repr__(self) -> str:
+        return f"Constraint({self.operator}{self.version})"
+
+    def _prerelease_mismatch(self, version: Version) -> bool:
+        return bool(version.prerelease) and not self.version.prerelease
+
+    def check(self, version: Version) -> bool:
+        """
+        Returns whether version satisfies this constraint.
+        """
+        op = self.operator
+        con = self.version
+
+        if op == "!=":
+            return self._check_not_equal(version)
+        if self._prerelease_mismatch(version):
+            return False
+
+        if op in ("", "="):
+            return self._check_tilde(version) if self.dirty else version == con
+        if op in ("~", "~>"):
+            return self._check_tilde(version)
+        if op == "^":
+            return self._check_caret(version)
+        if op == ">=" or op == "=>":
+            return version >= con
+        if op == "<":
+            return version < con
+        if op == ">":
+            if not self.dirty:
+                return version > con
+            if version.major != con.major:
+                return version.major > con.major
+            if self.minor_dirty:
+                return False
+            if self.patch_dirty:
+                return version.minor > con.minor
+            return version > con
+        # "<=" and "=<"
+        if not self.dirty:
+            return version <= con
+        if version.major > con.major:
+            return False
+        if version.major == con.major and version.minor > con.minor and not self.minor_dirty:
+            return False
+        return True
+
+    def _check_not_equal(self, version: Version) -> bool:
+        con = self.version
+        if self.dirty:
+            if self._prerelease_mismatch(version):
+                return False
+            if con.major != version.major:
+                return True
+            if con.minor != version.minor and not self.minor_dirty:
+                return True
+            if self.minor_dirty:
+                return False
+            if con.patch != version.patch and not self.patch_dirty:
+                return True
+            if self.patch_dirty:
+                if version.prerelease or con.prerelease:
+                    return _prerelease_key(version.prerelease) != _prerelease_key(con.prerelease)
+                return False
+        return version != con
+
+    def _check_tilde(self, version: Version) -> bool:
+        con = self.version
+        if version < con:
+            return False
+        # ~0.0.0 accepts everything, like >=0.0.0
+        if (con.major, con.minor, con.patch) == (0, 0, 0) and not self.minor_dirty and not self.patch_dirty:
+            return True
+        if version.major != con.major:
+            return False
+        return version.minor == con.minor or self.minor_dirty
+
+    def _check_caret(self, version: Version) -> bool:
+        con = self.version
+        if version < con:
+            return False
+        if con.major > 0 or self.minor_dirty:
+            return version.major == con.major
+        if version.major > 0:
+            return False
+        if con.minor > 0 or self.patch_dirty:
+            return version.minor == con.minor
+        if version.minor > 0:
+            return False
+        return version.patch == con.patch
+
+    def bounds(self) -> Tuple[Optional[Triple], Optional[Triple]]:
+        """
+        Returns inclusive (major, minor, patch) bounds every matching version lies
+        within. The bounds may be wider than the constraint; check() is exact.
+        """
+        op = self.operator
+        con = self.version
+        triple = (con.major, con.minor, con.patch)
+        major_limit = (con.major, UNBOUNDED, UNBOUNDED)
+        minor_limit = (con.major, con.minor, UNBOUNDED)
+
+        if op == "!=":
+            return None, None
+        if op in ("", "=") and not self.dirty:
+            return triple, triple
+        if op in ("", "=", "~", "~>"):
+            if triple == (0, 0, 0) and not self.minor_dirty and not self.patch_dirty:
+                return triple, None
+            return triple, major_limit if self.minor_dirty else minor_limit
+        if op == "^":
+            return triple, major_limit if con.major > 0 or self.minor_dirty else (0, UNBOUNDED, UNBOUNDED)
+        if op in (">", ">=", "=>"):
+            return triple, None
+        if op == "<" or not self.dirty:
+            return None, triple
+        # Dirty "<=" and "=<"
+        return None, major_limit if self.minor_dirty or triple == (0, 0, 0) else minor_limit
+
+
+class Constraints:
+    """
+    A parsed version constraint: OR-ed groups ("||") of AND-ed comparisons.
+    """
+
+    __slots__ = ("text", "groups")
+
+    def __init__(self, text: str, groups: List[List[Constraint]]):
+        self.text = text
+        self.groups = groups
+
+    def __repr__(self) -> str:
+        return f"Constraints({self.text!r})"
+
+    def check(self, version: Version) -> bool:
+        """
+        Returns whether version satisfies any of the OR-ed groups.
+        """
+        return any(all(constraint.check(version) for constraint in group) for group in self.groups)
+
+    @staticmethod
+    def group_bounds(group: List[Constraint]) -> Tuple[Optional[Triple], Optional[Triple]]:
+        """
+        Intersects the bounds of an AND-ed group of constraints.
+        """
+        lower: Optional[Triple] = None
+        upper: Optional[Triple] = None
+        for constraint in group:
+            low, high = constraint.bounds()
+            if low is not None and (lower is None or low > lower):
+                lower = low
+            if high is not None and (upper is None or high < upper):
+                upper = high
+        return lower, upper
+
+
+def _rewrite_ranges(text: str) -> str:
+    # "1.2 - 1.4.5" is shorthand for ">= 1.2, <= 1.4.5"
+    for match in list(_RANGE_PATTERN.finditer(text)):
+        text = text.replace(match.group(0), f">= {match.group(1)}, <= {match.group(11)} ", 1)
+    return text
+
+
+def parse_constraints(text: str) -> Constraints:
+    """
+    Parses a version constraint string the way helm does.
+
+    Raises ValueError if the constraint is malformed.
+    """
+    groups = []
+    for segment in _rewrite_ranges(text).split("||"):
+        if not _VALID_PATTERN.match(segment):
+            raise ValueError(f"improper constraint: {segment}")
+        parts = [match.group(0) for match in _FIND_PATTERN.finditer(segment)] or [segment]
+        groups.append([Constraint(part) for part in parts])
+    return Constraints(text, groups)
@@ -1,6 +1,8 @@
 import sys
+import asyncio
+import inspect
 import logging
-from typing import Dict, List, Any
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Tuple
 
 # Try to import mcp with error handling
 try:
@@ -13,13 +15,20 @@ except ImportError as e:
     sys.exit(1)
 
 from ..schemas.tools import get_all_tools
-from ..commands import (
-    basic, dependencies, get, release, repository,
-    registry, search, show, package, plugin
-)
+from .deadlines import run_with_deadline, tool_deadline
+from .progress import ProgressReporter, current_reporter
+from .validation import Validator, compile_schema, validation_error
+from .. import commands
 
 logger = logging.getLogger(__name__)
 
+# Takes a tool call's arguments and returns the coroutine producing its output
+# and whether the call succeeded, which is helm's exit status for most tools
+Handler = Callable[[Dict[str, Any]], Awaitable[Tuple[str, bool]]]
+
+# Tools that accept background=true and then run as jobs
+BACKGROUND_TOOLS = frozenset(["helm_install", "helm_upgrade", "helm_upgrade_many", "helm_rollback", "helm_test"])
+
 
 class HelmMCPServer:
     """
@@ -28,6 +37,12 @@ class HelmMCPServer:
     
     def __init__(self):
         self.server = Server("mcp-helm")
+        # The tool list and the handler table never change, so both are built once.
+        # Tools and their validators are built on first use to keep startup short.
+        self._tools: Optional[List[Tool]] = None
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+        self._validators: Dict[str, Validator] = {}
+        self._handlers = self._build_handlers()
         self._setup_handlers()
     
     def _setup_handlers(self):
@@ -36,236 +51,373 @@ class HelmMCPServer:
         @self.server.list_tools()
         async def list_tools() -> List[Tool]:
             logger.info("Listing available tools")
-            return get_all_tools()
+            return self._tool_list()
+
+        # dispatch validates every call, batch steps included, so the SDK's own
+        # jsonschema check would only repeat it. Older SDKs do not have one.
+        if "validate_input" in inspect.signature(self.server.call_tool).parameters:
+            register_call_tool = self.server.call_tool(validate_input=False)
+        else:
+            register_call_tool = self.server.call_tool()
 
-        @self.server.call_tool()
+        @register_call_tool
         async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
             logger.info(f"Tool call: {name} with arguments {arguments}")
 
-            result = ""
-
-            # Use a dictionary mapping for "switch-case" approach
-            command_handlers = {
-                # Basic commands
-                "helm_completion": lambda: basic.helm_completion(arguments["shell"]),
-                "helm_create": lambda: basic.helm_create(arguments["name"], arguments.get("starter")),
-                "helm_env": lambda: basic.helm_env(),
-                "helm_version": lambda: basic.helm_version(),
-                "helm_verify": lambda: basic.helm_verify(
-                    arguments["path"],
-                    arguments.get("keyring")
-                ),
-
-                # Dependency commands
-                "helm_dependency_build": lambda: dependencies.helm_dependency_build(arguments["chart_path"]),
-                "helm_dependency_list": lambda: dependencies.helm_dependency_list(arguments["chart_path"]),
-                "helm_dependency_update": lambda: dependencies.helm_dependency_update(arguments["chart_path"]),
-
-                # Get commands
-                "helm_get_all": lambda: get.helm_get_all(arguments["release_name"], arguments.get("namespace")),
-                "helm_get_hooks": lambda: get.helm_get_hooks(arguments["release_name"], arguments.get("namespace")),
-                "helm_get_manifest": lambda: get.helm_get_manifest(arguments["release_name"], arguments.get("namespace")),
-                "helm_get_metadata": lambda: get.helm_get_metadata(arguments["release_name"], arguments.get("namespace")),
-                "helm_get_notes": lambda: get.helm_get_notes(arguments["release_name"], arguments.get("namespace")),
-                "helm_get_values": lambda: get.helm_get_values(
-                    arguments["release_name"],
-                    arguments.get("namespace"),
-                    arguments.get("all_values", False)
-                ),
-
-                # Release management commands
-                "helm_install": lambda: release.helm_install(
-                    arguments["chart"],
-                    arguments.get("release_name"),
-                    arguments.get("namespace"),
-                    arguments.get("values_file"),
-                    arguments.get("set_values"),
-                    arguments.get("description"),
-                    arguments.get("timeout"),
-                    arguments.get("wait", False),
-                    arguments.get("atomic", False)
-                ),
-                "helm_upgrade": lambda: release.helm_upgrade(
-                    arguments["release_name"],
-                    arguments["chart"],
-                    arguments.get("namespace"),
-                    arguments.get("values_file"),
-                    arguments.get("set_values"),
-                    arguments.get("install", False),
-                    arguments.get("force", False),
-                    arguments.get("atomic", False),
-                    arguments.get("timeout"),
-                    arguments.get("wait", False)
-                ),
-                "helm_uninstall": lambda: release.helm_uninstall(
-                    arguments["release_name"],
-                    arguments.get("namespace"),
-                    arguments.get("keep_history", False),
-                    arguments.get("no_hooks", False)
-                ),
-                "helm_rollback": lambda: release.helm_rollback(
-                    arguments["release_name"],
-                    arguments.get("revision"),
-                    arguments.get("namespace"),
-                    arguments.get("timeout"),
-                    arguments.get("wait", False),
-                    arguments.get("force", False)
-                ),
-                "helm_history": lambda: release.helm_history(
-                    arguments["release_name"],
-                    arguments.get("namespace"),
-                    arguments.get("max_")
-                ),
-                "helm_status": lambda: release.helm_status(
-                    arguments["release_name"],
-                    arguments.get("namespace"),
-                    arguments.get("revision")
-                ),
-                "helm_list": lambda: release.helm_list(
-                    arguments.get("namespace"),
-                    arguments.get("all_namespaces", False),
-                    arguments.get("filter_"),
-                    arguments.get("uninstalled", False),
-                    arguments.get("deployed", False),
-                    arguments.get("failed", False)
-                ),
-                "helm_test": lambda: release.helm_test(
-                    arguments["release_name"],
-                    arguments.get("namespace"),
-                    arguments.get("timeout"),
-                    arguments.get("filter_")
-                ),
-
-                # Repository commands
-                "helm_repo_add": lambda: repository.helm_repo_add(
-                    arguments["name"],
-                    arguments["url"],
-                    arguments.get("username"),
-                    arguments.get("password"),
-                    arguments.get("pass_credentials", False)
-                ),
-                "helm_repo_remove": lambda: repository.helm_repo_remove(arguments["name"]),
-                "helm_repo_list": lambda: repository.helm_repo_list(),
-                "helm_repo_update": lambda: repository.helm_repo_update(),
-                "helm_repo_index": lambda: repository.helm_repo_index(
-                    arguments["directory"],
-                    arguments.get("url"),
-                    arguments.get("merge")
-                ),
-
-                # Registry commands
-                "helm_registry_login": lambda: registry.helm_registry_login(
-                    arguments["registry_url"],
-                    arguments["username"],
-                    arguments["password"],
-                    arguments.get("insecure", False)
-                ),
-                "helm_registry_logout": lambda: registry.helm_registry_logout(arguments["registry_url"]),
-
-                # Search commands
-                "helm_search_repo": lambda: search.helm_search_repo(
-                    arguments["keyword"],
-                    arguments.get("version"),
-                    arguments.get("regexp", False),
-                    arguments.get("versions", False)
-                ),
-                "helm_search_hub": lambda: search.helm_search_hub(
-                    arguments["keyword"],
-                    arguments.get("max_results"),
-                    arguments.get("repo_url")
-                ),
-
-                # Show commands
-                "helm_show_all": lambda: show.helm_show_all(
-                    arguments["chart"],
-                    arguments.get("repo"),
-                    arguments.get("version")
-                ),
-                "helm_show_chart": lambda: show.helm_show_chart(
-                    arguments["chart"],
-                    arguments.get("repo"),
-                    arguments.get("version")
-                ),
-                "helm_show_crds": lambda: show.helm_show_crds(
-                    arguments["chart"],
-                    arguments.get("repo"),
-                    arguments.get("version")
-                ),
-                "helm_show_readme": lambda: show.helm_show_readme(
-                    arguments["chart"],
-                    arguments.get("repo"),
-                    arguments.get("version")
-                ),
-                "helm_show_values": lambda: show.helm_show_values(
-                    arguments["chart"],
-                    arguments.get("repo"),
-                    arguments.get("version")
-                ),
-
-                # Package commands
-                "helm_package": lambda: package.helm_package(
-                    arguments["chart_path"],
-                    arguments.get("destination"),
-                    arguments.get("app_version"),
-                    arguments.get("version"),
-                    arguments.get("dependency_update", False)
-                ),
-                "helm_push": lambda: package.helm_push(
-                    arguments["chart_path"],
-                    arguments["registry_url"],
-                    arguments.get("force", False),
-                    arguments.get("insecure", False),
-                    arguments.get("plain_http", False)
-                ),
-                "helm_pull": lambda: package.helm_pull(
-                    arguments["chart"],
-                    arguments.get("repo"),
-                    arguments.get("version"),
-                    arguments.get("destination"),
-                    arguments.get("untar", False),
-                    arguments.get("verify", False),
-                    arguments.get("keyring")
-                ),
-                "helm_lint": lambda: package.helm_lint(
-                    arguments["chart_path"],
-                    arguments.get("values_file"),
-                    arguments.get("set_values")
-                ),
-                "helm_template": lambda: package.helm_template(
-                    arguments["chart"],
-                    arguments.get("release_name"),
-                    arguments.get("namespace"),
-                    arguments.get("values_file"),
-                    arguments.get("set_values"),
-                    arguments.get("api_versions"),
-                    arguments.get("kube_version")
-                ),
-
-                # Plugin commands
-                "helm_plugin_install": lambda: plugin.helm_plugin_install(
-                    arguments["plugin_url"],
-                    arguments.get("version")
-                ),
-                "helm_plugin_list": lambda: plugin.helm_plugin_list(),
-                "helm_plugin_uninstall": lambda: plugin.helm_plugin_uninstall(arguments["plugin_name"]),
-                "helm_plugin_update": lambda: plugin.helm_plugin_update(arguments["plugin_name"]),
-            }
-
-            # Execute the corresponding handler or return an error if the command is not found
-            if name in command_handlers:
-                try:
-                    result = command_handlers[name]()
-                except Exception as e:
-                    error_msg = f"Error executing {name}: {str(e)}"
-                    logger.error(error_msg)
-                    return [TextContent(type="text", text=error_msg)]
-            else:
-                error_msg = f"Unknown tool: {name}"
-                logger.error(error_msg)
-                return [TextContent(type="text", text=error_msg)]
+            token = current_reporter.set(self._progress_reporter())
+            try:
+                result, _ = await self.dispatch(name, arguments)
+            finally:
+                current_reporter.reset(token)
 
             return [TextContent(type="text", text=result)]
 
+    def _build_handlers(self) -> Dict[str, Handler]:
+        """
+        Returns the handler of every tool. Each handler takes the call's
+        arguments and returns a coroutine with the tool's text result and
+        whether the call succeeded.
+        """
+        # Use a dictionary mapping for "switch-case" approach
+        return {
+            # Basic commands
+            "helm_completion": lambda args: commands.basic.helm_completion(args["shell"]),
+            "helm_create": lambda args: commands.basic.helm_create(args["name"], args.get("starter")),
+            "helm_env": lambda args: commands.basic.helm_env(),
+            "helm_version": lambda args: commands.basic.helm_version(),
+            "helm_verify": lambda args: commands.basic.helm_verify(
+                args["path"],
+                args.get("keyring")
+            ),
+
+            # Dependency commands
+            "helm_dependency_build": lambda args: commands.dependencies.helm_dependency_build(args["chart_path"]),
+            "helm_dependency_list": lambda args: commands.dependencies.helm_dependency_list(args["chart_path"]),
+            "helm_dependency_update": lambda args: commands.dependencies.helm_dependency_update(args["chart_path"]),
+
+            # Get commands
+            "helm_get_all": lambda args: commands.get.helm_get_all(args["release_name"], args.get("namespace")),
+            "helm_get_hooks": lambda args: commands.get.helm_get_hooks(args["release_name"], args.get("namespace")),
+            "helm_get_manifest": lambda args: commands.get.helm_get_manifest(args["release_name"], args.get("namespace")),
+            "helm_get_metadata": lambda args: commands.get.helm_get_metadata(args["release_name"], args.get("namespace")),
+            "helm_get_notes": lambda args: commands.get.helm_get_notes(args["release_name"], args.get("namespace")),
+            "helm_get_values": lambda args: commands.get.helm_get_values(
+                args["release_name"],
+                args.get("namespace"),
+                args.get("all_values", False)
+            ),
+
+            # Release management commands
+            "helm_install": lambda args: commands.release.helm_install(
+                args["chart"],
+                args.get("release_name"),
+                args.get("namespace"),
+                args.get("values_file"),
+                args.get("set_values"),
+                args.get("description"),
+                args.get("timeout"),
+                args.get("wait", False),
+                args.get("atomic", False),
+                args.get("values")
+            ),
+            "helm_upgrade": lambda args: commands.release.helm_upgrade(
+                args["release_name"],
+                args["chart"],
+                args.get("namespace"),
+                args.get("values_file"),
+                args.get("set_values"),
+                args.get("install", False),
+                args.get("force", False),
+                args.get("atomic", False),
+                args.get("timeout"),
+                args.get("wait", False),
+                args.get("values")
+            ),
+            "helm_upgrade_many": lambda args: commands.release.helm_upgrade_many(
+                args["releases"],
+                args["chart"],
+                args.get("values_file"),
+                args.get("set_values"),
+                args.get("install", False),
+                args.get("force", False),
+                args.get("atomic", False),
+                args.get("timeout"),
+                args.get("wait", False),
+                args.get("wave_size"),
+                args.get("max_concurrency"),
+                args.get("max_failures", 0),
+                args.get("rollback_failed", False),
+                args.get("values")
+            ),
+            "helm_uninstall": lambda args: commands.release.helm_uninstall(
+                args["release_name"],
+                args.get("namespace"),
+                args.get("keep_history", False),
+                args.get("no_hooks", False)
+            ),
+            "helm_rollback": lambda args: commands.release.helm_rollback(
+                args["release_name"],
+                args.get("revision"),
+                args.get("namespace"),
+                args.get("timeout"),
+                args.get("wait", False),
+                args.get("force", False)
+            ),
+            "helm_history": lambda args: commands.release.helm_history(
+                args["release_name"],
+                args.get("namespace"),
+                args.get("max_"),
+                args.get("delta", False),
+                args.get("cursor")
+            ),
+            "helm_status": lambda args: commands.release.helm_status(
+                args["release_name"],
+                args.get("namespace"),
+                args.get("revision")
+            ),
+            "helm_status_many": lambda args: commands.release.helm_status_many(
+                args.get("releases"),
+                args.get("namespace"),
+                args.get("all_namespaces", False),
+                args.get("selector"),
+                args.get("filter_"),
+                args.get("max_concurrency")
+            ),
+            "helm_wait_status": lambda args: commands.release.helm_wait_status(
+                args["release_name"],
+                args.get("namespace"),
+                args.get("status", "deployed"),
+                args.get("revision"),
+                args.get("timeout")
+            ),
+            "helm_list": lambda args: commands.release.helm_list(
+                args.get("namespace"),
+                args.get("all_namespaces", False),
+                args.get("filter_"),
+                args.get("uninstalled", False),
+                args.get("deployed", False),
+                args.get("failed", False),
+                args.get("namespaces"),
+                args.get("shard", False),
+                args.get("limit"),
+                args.get("offset", 0),
+                args.get("sort_by"),
+                args.get("reverse", False),
+                args.get("fields"),
+                args.get("delta", False),
+                args.get("cursor")
+            ),
+            "helm_test": lambda args: commands.release.helm_test(
+                args["release_name"],
+                args.get("namespace"),
+                args.get("timeout"),
+                args.get("filter_")
+            ),
+
+            # Repository commands
+            "helm_repo_add": lambda args: commands.repository.helm_repo_add(
+                args["name"],
+                args["url"],
+                args.get("username"),
+                args.get("password"),
+                args.get("pass_credentials", False)
+            ),
+            "helm_repo_remove": lambda args: commands.repository.helm_repo_remove(args["name"]),
+            "helm_repo_list": lambda args: commands.repository.helm_repo_list(),
+            "helm_repo_update": lambda args: commands.repository.helm_repo_update(
+                args.get("names"),
+                args.get("parallel", False)
+            ),
+            "helm_repo_index": lambda args: commands.repository.helm_repo_index(
+                args["directory"],
+                args.get("url"),
+                args.get("merge")
+            ),
+
+            # Registry commands
+            "helm_registry_login": lambda args: commands.registry.helm_registry_login(
+                args["registry_url"],
+                args["username"],
+                args["password"],
+                args.get("insecure", False)
+            ),
+            "helm_registry_logout": lambda args: commands.registry.helm_registry_logout(args["registry_url"]),
+
+            # Search commands
+            "helm_search_repo": lambda args: commands.search.helm_search_repo(
+                args["keyword"],
+                args.get("version"),
+                args.get("regexp", False),
+                args.get("versions", False)
+            ),
+            "helm_search_hub": lambda args: commands.search.helm_search_hub(
+                args["keyword"],
+                args.get("max_results"),
+                args.get("repo_url")
+            ),
+
+            # Show commands
+            "helm_show_all": lambda args: commands.show.helm_show_all(
+                args["chart"],
+                args.get("repo"),
+                args.get("version")
+            ),
+            "helm_show_chart": lambda args: commands.show.helm_show_chart(
+                args["chart"],
+                args.get("repo"),
+                args.get("version")
+            ),
+            "helm_show_crds": lambda args: commands.show.helm_show_crds(
+                args["chart"],
+                args.get("repo"),
+                args.get("version")
+            ),
+            "helm_show_readme": lambda args: commands.show.helm_show_readme(
+                args["chart"],
+                args.get("repo"),
+                args.get("version")
+            ),
+            "helm_show_values": lambda args: commands.show.helm_show_values(
+                args["chart"],
+                args.get("repo"),
+                args.get("version")
+            ),
+
+            # Package commands
+            "helm_package": lambda args: commands.package.helm_package(
+                args["chart_path"],
+                args.get("destination"),
+                args.get("app_version"),
+                args.get("version"),
+                args.get("dependency_update", False)
+            ),
+            "helm_push": lambda args: commands.package.helm_push(
+                args["chart_path"],
+                args["registry_url"],
+                args.get("force", False),
+                args.get("insecure", False),
+                args.get("plain_http", False)
+            ),
+            "helm_pull": lambda args: commands.package.helm_pull(
+                args["chart"],
+                args.get("repo"),
+                args.get("version"),
+                args.get("destination"),
+                args.get("untar", False),
+                args.get("verify", False),
+                args.get("keyring")
+            ),
+            "helm_lint": lambda args: commands.package.helm_lint(
+                args["chart_path"],
+                args.get("values_file"),
+                args.get("set_values"),
+                args.get("values")
+            ),
+            "helm_template": lambda args: commands.package.helm_template(
+                args["chart"],
+                args.get("release_name"),
+                args.get("namespace"),
+                args.get("values_file"),
+                args.get("set_values"),
+                args.get("api_versions"),
+                args.get("kube_version"),
+                args.get("values")
+            ),
+
+            # Plugin commands
+            "helm_plugin_install": lambda args: commands.plugin.helm_plugin_install(
+                args["plugin_url"],
+                args.get("version")
+            ),
+            "helm_plugin_list": lambda args: commands.plugin.helm_plugin_list(),
+            "helm_plugin_uninstall": lambda args: commands.plugin.helm_plugin_uninstall(args["plugin_name"]),
+            "helm_plugin_update": lambda args: commands.plugin.helm_plugin_update(args["plugin_name"]),
+
+            # Background job commands
+            "helm_job_status": lambda args: commands.jobs.helm_job_status(args["job_id"]),
+            "helm_job_result": lambda args: commands.jobs.helm_job_result(args["job_id"]),
+            "helm_job_cancel": lambda args: commands.jobs.helm_job_cancel(args["job_id"]),
+
+            # Batch execution
+            "helm_batch": lambda args: commands.batch.helm_batch(
+                args["steps"],
+                self.dispatch,
+                args.get("max_concurrency"),
+                args.get("failure_policy", "stop")
+            ),
+
+            # Server introspection
+            "helm_server_stats": lambda args: commands.stats.helm_server_stats(),
+        }
+
+    async def dispatch(self, name: str, arguments: Dict[str, Any]) -> Tuple[str, bool]:
+        """
+        Runs a single tool call and returns its text result and whether it succeeded.
+
+        Used for MCP tool calls as well as for the steps of helm_batch.
+        """
+        # Execute the corresponding handler or return an error if the command is not found.
+        # Handlers return coroutines so independent tool calls run concurrently.
+        handler = self._handlers.get(name)
+        if handler is None:
+            error_msg = f"Unknown tool: {name}"
+            logger.error(error_msg)
+            return error_msg, False
+
+        # Malformed calls are rejected here instead of failing in helm or in their handler
+        errors: List[Dict[str, str]] = []
+        validator = self._validator(name)
+        if validator is not None:
+            validator(arguments, "", errors)
+        if errors:
+            return validation_error(name, errors), False
+
+        # Long operations can run as background jobs and answer with a job ID right away
+        if name in BACKGROUND_TOOLS and arguments.get("background"):
+            deadline = tool_deadline(name, arguments)
+            call = lambda: run_with_deadline(name, lambda: handler(arguments), deadline)
+            return commands.jobs.helm_job_start(name, call)
+
+        try:
+            # Cancellation by the client or the deadline stops the helm process as well
+            return await run_with_deadline(name, lambda: handler(arguments), tool_deadline(name, arguments))
+        except Exception as e:
+            error_msg = f"Error executing {name}: {str(e)}"
+            logger.error(error_msg)
+            return error_msg, False
+
+    def _tool_list(self) -> List[Tool]:
+        if self._tools is None:
+            self._tools = get_all_tools()
+            self._schemas = {tool.name: tool.inputSchema for tool in self._tools}
+        return self._tools
+
+    def _validator(self, name: str) -> Optional[Validator]:
+        """
+        Returns the compiled input schema validator of a tool, compiling it on its first call.
+        """
+        validator = self._validators.get(name)
+        if validator is None:
+            self._tool_list()
+            if name not in self._schemas:
+                return None
+            validator = self._validators[name] = compile_schema(self._schemas[name])
+        return validator
+
+    def _progress_reporter(self) -> Optional[ProgressReporter]:
+        """
+        Returns a reporter for the request being handled if its client asked for progress notifications.
+        """
+        try:
+            context = self.server.request_context
+        except LookupError:
+            return None
+
+        progress_token = context.meta.progressToken if context.meta is not None else None
+        if progress_token is None:
+            return None
+        return ProgressReporter(context.session, progress_token)
+
     async def serve(self) -> None:
         """
         Main function to run the MCP server for Helm commands.
@@ -275,7 +427,13 @@ class HelmMCPServer:
         logger.info("Creating initialization options")
         options = self.server.create_initialization_options()
 
-        logger.info("Starting stdio server")
-        async with stdio_server() as (read_stream, write_stream):
-            logger.info("Running MCP server")
-            await self.server.run(read_stream, write_stream, options, raise_exceptions=True)
\ No newline at end of file
+        # Warm the helm binary facts without delaying the client's initialize
+        probe = asyncio.ensure_future(commands.basic.probe_helm())
+
+        try:
+            logger.info("Starting stdio server")
+            async with stdio_server() as (read_stream, write_stream):
+                logger.info("Running MCP server")
+                await self.server.run(read_stream, write_stream, options, raise_exceptions=True)
+        finally:
+            probe.cancel()
\ No newline at end of file
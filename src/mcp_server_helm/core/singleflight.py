@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, TypeVar
+
+from .progress import ProgressFanout, current_reporter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls: while a call for a key is in flight,
+    later callers with the same key wait for its result instead of starting
+    their own.
+
+    The call runs in its own task. A cancelled caller only stops waiting; the
+    call itself is cancelled once no caller is waiting for it any more.
+    Progress the call reports goes to every waiting caller that asked for it.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        # key -> (task, number of callers waiting for it, progress fanout of the waiters)
+        self._in_flight: Dict[Hashable, List[Any]] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Returns the result of call(), sharing it with every concurrent caller of key.
+        Exceptions are shared the same way.
+        """
+        self.calls += 1
+
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            logger.debug(f"Joining in-flight call for {key}")
+            flight[1] += 1
+        else:
+            fanout = ProgressFanout()
+            task = asyncio.ensure_future(self._run(call, fanout))
+            flight = self._in_flight[key] = [task, 1, fanout]
+            task.add_done_callback(lambda _: self._finished(key, flight))
+
+        reporter = current_reporter.get()
+        if reporter is not None:
+            flight[2].reporters.append(reporter)
+
+        try:
+            return await asyncio.shield(flight[0])
+        except asyncio.CancelledError:
+            if reporter is not None and reporter in flight[2].reporters:
+                flight[2].reporters.remove(reporter)
+            if not flight[0].done():
+                flight[1] -= 1
+                if flight[1] == 0:
+                    flight[0].cancel()
+                    self._finished(key, flight)
+            raise
+
+    @staticmethod
+    async def _run(call: Callable[[], Awaitable[T]], fanout: ProgressFanout) -> T:
+        # The task has its own copy of the context, so this only redirects the shared call's progress
+        current_reporter.set(fanout)
+        return await call()
+
+    def _finished(self, key: Hashable, flight: List[Any]) -> None:
+        if self._in_flight.get(key) is flight:
+            del self._in_flight[key]
+        # Nobody may be left to see a failure
+        if flight[0].done() and not flight[0].cancelled():
+            flight[0].exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
@@ -1,43 +1,362 @@
-import subprocess
+import asyncio
+import os
 import logging
-from typing import List, Optional
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from . import config, repo_index
+from .binary import helm_binary, subprocess_env
+from .processes import USE_PROCESS_GROUPS, terminator
+from .progress import MAX_MESSAGE_LENGTH, ProgressReporter, current_reporter
+from .scheduler import READ_LANE, lane_for_command, scheduler
+from .singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Shares one helm process between identical concurrent read-only commands
+read_coalescer = SingleFlight()
 
-def execute_helm_command(cmd: List[str], stdin_input: Optional[str] = None) -> str:
+# Bytes of an output line kept for its progress message: enough for the longest
+# message even in four-byte characters, plus one so the reporter marks the cut
+PROGRESS_LINE_BYTES = 4 * MAX_MESSAGE_LENGTH + 4
+
+# Size of the pieces large stdin payloads, such as inline values, are written to helm in
+STDIN_CHUNK_BYTES = 64 * 1024
+
+# Namespace of each kube context, keyed by context and the kubeconfig files' stamps
+_context_namespaces: Dict[Tuple[Any, ...], str] = {}
+
+# Counts finished mutating commands. Part of the coalescing key, so a read
+# issued after a mutation never joins a read that started before it finished.
+_mutation_epoch = 0
+
+
+class HelmResult(NamedTuple):
     """
-    Execute a Helm command and return the formatted output.
+    Raw outcome of a finished helm process.
     """
-    logger.info(f"Executing command: {' '.join(cmd)}")
+    returncode: int
+    stdout: str
+    stderr: str
 
-    try:
-        if stdin_input:
-            # Use Popen to provide input via stdin
-            process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            stdout, stderr = process.communicate(input=stdin_input)
-
-            if process.returncode != 0:
-                error_msg = f"Error executing command: {stderr}"
-                logger.error(error_msg)
-                return error_msg
-
-            return stdout
-        else:
-            # Use subprocess.run for commands without stdin input
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            return result.stdout
-    except subprocess.CalledProcessError as e:
-        error_msg = f"Error executing command: {e.stderr}"
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+
+def format_helm_result(result: HelmResult) -> str:
+    """
+    Turn a helm process result into the text returned to the client.
+    """
+    if not result.ok:
+        error_msg = f"Error executing command: {result.stderr}"
         logger.error(error_msg)
         return error_msg
+
+    return result.stdout
+
+
+async def run_helm_command(cmd: List[str], stdin_input: Optional[str] = None) -> HelmResult:
+    """
+    Run a Helm command without blocking the event loop and return its raw result.
+
+    Identical read-only commands that run at the same time share a single helm
+    process and all receive its result.
+    """
+    global _mutation_epoch
+
+    if lane_for_command(cmd) == READ_LANE:
+        if config.COALESCE_READS and stdin_input is None:
+            key = (_mutation_epoch, current_kube_context(), os.environ.get("HELM_NAMESPACE", ""), tuple(cmd))
+            return await read_coalescer.do(key, lambda: _spawn_helm_command(cmd))
+        return await _spawn_helm_command(cmd, stdin_input)
+
+    try:
+        return await _spawn_helm_command(cmd, stdin_input)
+    finally:
+        _mutation_epoch += 1
+
+
+async def _spawn_helm_command(cmd: List[str], stdin_input: Optional[str] = None) -> HelmResult:
+    """
+    Run a helm process once the scheduler grants a slot in the command's lane.
+    """
+    async with scheduler.slot(cmd):
+        logger.info(f"Executing command: {' '.join(cmd)}")
+
+        # The resolved path spares the PATH search on every exec
+        argv = cmd
+        if cmd[0] == "helm":
+            path, _ = helm_binary.resolve()
+            if path:
+                argv = [path] + cmd[1:]
+
+        process = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=asyncio.subprocess.PIPE if stdin_input else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=subprocess_env(),
+            start_new_session=USE_PROCESS_GROUPS
+        )
+        reporter = current_reporter.get()
+        payload = stdin_input.encode() if stdin_input else None
+        try:
+            if reporter is None and payload is None:
+                stdout, stderr = await process.communicate()
+            elif reporter is None:
+                stdout, stderr, _ = await asyncio.gather(
+                    process.stdout.read(), process.stderr.read(), _feed_stdin(process, payload))
+                await process.wait()
+            else:
+                stdout, stderr = await _stream_process(process, cmd, payload, reporter)
+        except asyncio.CancelledError:
+            # Nobody is waiting for the result any more; do not leave helm running.
+            # The lane slot and any release lock are held until helm has exited,
+            # so the next operation on the release cannot overlap with this one.
+            stopping = terminator.terminate(process, cmd)
+            while stopping is not None and not stopping.done():
+                try:
+                    await asyncio.shield(stopping)
+                except asyncio.CancelledError:
+                    pass
+            raise
+
+    return HelmResult(
+        process.returncode,
+        stdout.decode(errors="replace"),
+        stderr.decode(errors="replace")
+    )
+
+
+async def _forward_lines(stream: asyncio.StreamReader, chunks: List[bytes], reporter: ProgressReporter) -> None:
+    # Reads in chunks rather than lines: JSON output can be one line far longer than the stream buffer.
+    # Only the start of a line is kept for its progress message, so a long line costs no copies.
+    pending: List[bytes] = []
+    pending_size = 0
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end == -1:
+                break
+            if pending_size < PROGRESS_LINE_BYTES:
+                pending.append(chunk[start:min(end, start + PROGRESS_LINE_BYTES - pending_size)])
+            await _report_line(b"".join(pending), reporter)
+            pending = []
+            pending_size = 0
+            start = end + 1
+
+        if pending_size < PROGRESS_LINE_BYTES:
+            piece = chunk[start:start + PROGRESS_LINE_BYTES - pending_size]
+            pending.append(piece)
+            pending_size += len(piece)
+
+    await _report_line(b"".join(pending), reporter)
+
+
+async def _report_line(line: bytes, reporter: ProgressReporter) -> None:
+    if line.strip():
+        await reporter.report(line.decode(errors="replace").rstrip())
+
+
+async def _heartbeat(cmd: List[str], reporter: ProgressReporter) -> None:
+    # helm is silent while it waits for resources, so keep the client informed that it is still running
+    started = time.monotonic()
+    while True:
+        await asyncio.sleep(config.PROGRESS_INTERVAL)
+        await reporter.report(f"{' '.join(cmd[:3])} still running after {time.monotonic() - started:.0f}s")
+
+
+async def _feed_stdin(process: asyncio.subprocess.Process, payload: Optional[bytes]) -> None:
+    """
+    Writes payload to the process's stdin in STDIN_CHUNK_BYTES pieces, waiting
+    for helm to take each piece, so large payloads are never buffered twice.
+    """
+    if payload is None or process.stdin is None:
+        return
+
+    view = memoryview(payload)
+    try:
+        for start in range(0, len(view), STDIN_CHUNK_BYTES):
+            process.stdin.write(view[start:start + STDIN_CHUNK_BYTES])
+            await process.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        # helm exited without reading its input, as communicate() tolerates
+        pass
+    process.stdin.close()
+
+
+async def _stream_process(process: asyncio.subprocess.Process, cmd: List[str], payload: Optional[bytes],
+                          reporter: ProgressReporter) -> Tuple[bytes, bytes]:
+    """
+    Collects a process's output like communicate() while forwarding each
+    output line to the client as a progress notification.
+    """
+    stdout: List[bytes] = []
+    stderr: List[bytes] = []
+
+    heartbeat = asyncio.ensure_future(_heartbeat(cmd, reporter))
+    try:
+        await asyncio.gather(
+            _feed_stdin(process, payload),
+            _forward_lines(process.stdout, stdout, reporter),
+            _forward_lines(process.stderr, stderr, reporter),
+        )
+        await process.wait()
+    finally:
+        heartbeat.cancel()
+
+    return b"".join(stdout), b"".join(stderr)
+
+
+async def execute_kubectl_command(cmd: List[str]) -> Tuple[str, bool]:
+    """
+    Run a kubectl command and return its output, or its error text, along with
+    whether it succeeded.
+
+    kubectl is not helm: it runs outside the scheduler lanes and read
+    coalescing, and never counts as a mutation.
+    """
+    logger.info(f"Executing kubectl command: {' '.join(cmd)}")
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=subprocess_env(),
+            start_new_session=USE_PROCESS_GROUPS
+        )
+    except OSError as e:
+        error_msg = f"Error executing command: {e}"
+        logger.error(error_msg)
+        return error_msg, False
+
+    try:
+        stdout, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        terminator.terminate(process, cmd)
+        raise
+
+    if process.returncode != 0:
+        error_msg = f"Error executing command: {stderr.decode(errors='replace')}"
+        logger.error(error_msg)
+        return error_msg, False
+    return stdout.decode(errors="replace"), True
+
+
+async def execute_helm_command_with_status(cmd: List[str],
+                                           stdin_input: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Execute a Helm command and return the formatted output along with whether it succeeded.
+    """
+    try:
+        result = await run_helm_command(cmd, stdin_input)
     except Exception as e:
         error_msg = f"Unexpected error: {str(e)}"
         logger.error(error_msg)
-        return error_msg
\ No newline at end of file
+        return error_msg, False
+
+    return format_helm_result(result), result.ok
+
+
+async def execute_helm_command_async(cmd: List[str], stdin_input: Optional[str] = None) -> str:
+    """
+    Execute a Helm command asynchronously and return the formatted output.
+    """
+    output, _ = await execute_helm_command_with_status(cmd, stdin_input)
+    return output
+
+
+def execute_helm_command(cmd: List[str], stdin_input: Optional[str] = None) -> str:
+    """
+    Execute a Helm command and return the formatted output.
+
+    Synchronous wrapper around execute_helm_command_async for callers that are
+    not running inside an event loop.
+    """
+    return asyncio.run(execute_helm_command_async(cmd, stdin_input))
+
+
+def current_kube_context() -> str:
+    """
+    Returns the kube context helm will talk to, or an empty string for the kubeconfig default.
+    """
+    return os.environ.get("HELM_KUBECONTEXT", "")
+
+
+def _kubeconfig_paths() -> List[str]:
+    paths = os.environ.get("KUBECONFIG") or os.path.join(os.path.expanduser("~"), ".kube", "config")
+    return [path for path in paths.split(os.pathsep) if path]
+
+
+def _kubeconfig_stamp(paths: List[str]) -> Tuple[Optional[Tuple[int, int]], ...]:
+    # (mtime, size) of each kubeconfig file, so switching the context's namespace is noticed
+    stamps = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamps.append(None)
+    return tuple(stamps)
+
+
+def _read_context_namespace(context: str, paths: List[str]) -> str:
+    # Merged like kubectl does: the first file to set current-context, or to define a context, wins
+    current = context
+    contexts: Dict[str, Any] = {}
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                document = repo_index.yaml.load(f, Loader=repo_index._yaml_loader()) or {}
+        except FileNotFoundError:
+            continue
+        except (OSError, repo_index.yaml.YAMLError) as e:
+            logger.info(f"Could not read kubeconfig {path}: {e}")
+            continue
+        if not isinstance(document, dict):
+            continue
+        if not current and isinstance(document.get("current-context"), str):
+            current = document["current-context"]
+        for entry in document.get("contexts") or []:
+            if isinstance(entry, dict) and isinstance(entry.get("name"), str):
+                contexts.setdefault(entry["name"], entry.get("context") or {})
+
+    settings = contexts.get(current) if current else None
+    namespace = settings.get("namespace") if isinstance(settings, dict) else None
+    return namespace if isinstance(namespace, str) and namespace else "default"
+
+
+def context_namespace() -> str:
+    """
+    Returns the namespace of the current kube context, which helm uses when
+    neither a namespace nor HELM_NAMESPACE is given, or "default" if the
+    context sets none.
+
+    It is read from the kubeconfig files themselves, once per context and
+    again only when one of them changes, so building a lock or cache key
+    never waits on a process. Without PyYAML it is "default".
+    """
+    context = current_kube_context()
+    paths = _kubeconfig_paths()
+    key = (context, tuple(paths), _kubeconfig_stamp(paths))
+    namespace = _context_namespaces.get(key)
+    if namespace is None:
+        namespace = _read_context_namespace(context, paths) if repo_index.index_support_available() else "default"
+        _context_namespaces[key] = namespace
+    return namespace
+
+
+def effective_namespace(namespace: Optional[str] = None) -> str:
+    """
+    Returns the namespace helm will use when no explicit namespace is given.
+    """
+    return namespace or os.environ.get("HELM_NAMESPACE") or context_namespace()
@@ -0,0 +1,119 @@
+import json
+import logging
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Appends the errors found in a value at a path to the list it is given
+Validator = Callable[[Any, str, List[Dict[str, str]]], None]
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "boolean": lambda value: isinstance(value, bool),
+    # Strict: handlers pass integers to helm as str(value), which would turn 3.0 into "3.0"
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    "null": lambda value: value is None,
+}
+
+_JSON_TYPES = {dict: "object", list: "array", str: "string", bool: "boolean", int: "integer", float: "number"}
+
+
+def _json_type(value: Any) -> str:
+    return "null" if value is None else _JSON_TYPES.get(type(value), type(value).__name__)
+
+
+def _join(path: str, key: Any) -> str:
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else str(key)
+
+
+def compile_schema(schema: Dict[str, Any]) -> Validator:
+    """
+    Compiles the JSON Schema subset used by the tool input schemas (type,
+    properties, required, additionalProperties, items, enum, minimum) into a
+    validator function. Unsupported keywords are ignored.
+    """
+    checks: List[Validator] = []
+
+    expected = schema.get("type")
+    allowed_types = [expected] if isinstance(expected, str) else expected if isinstance(expected, list) else []
+    type_checks = [_TYPE_CHECKS[name] for name in allowed_types if name in _TYPE_CHECKS]
+    if type_checks:
+        expected_text = " or ".join(allowed_types)
+
+        def check_type(value: Any, path: str, errors: List[Dict[str, str]]) -> None:
+            if not any(type_check(value) for type_check in type_checks):
+                errors.append({"path": path, "error": "type",
+                               "message": f"expected {expected_text}, got {_json_type(value)}"})
+    else:
+        check_type = None
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+
+        def check_enum(value: Any, path: str, errors: List[Dict[str, str]]) -> None:
+            if value not in allowed:
+                errors.append({"path": path, "error": "enum",
+                               "message": f"must be one of {', '.join(json.dumps(item) for item in allowed)}"})
+        checks.append(check_enum)
+
+    if "minimum" in schema:
+        minimum = schema["minimum"]
+
+        def check_minimum(value: Any, path: str, errors: List[Dict[str, str]]) -> None:
+            if _TYPE_CHECKS["number"](value) and value < minimum:
+                errors.append({"path": path, "error": "minimum", "message": f"must be at least {minimum}"})
+        checks.append(check_minimum)
+
+    properties = {name: compile_schema(subschema) for name, subschema in (schema.get("properties") or {}).items()}
+    required = list(schema.get("required") or [])
+    closed = schema.get("additionalProperties") is False
+    if properties or required or closed:
+        def check_object(value: Any, path: str, errors: List[Dict[str, str]]) -> None:
+            if not isinstance(value, dict):
+                return
+            for name in required:
+                if name not in value:
+                    errors.append({"path": _join(path, name), "error": "required", "message": "is required"})
+            for name, item in value.items():
+                validator = properties.get(name)
+                if validator is not None:
+                    validator(item, _join(path, name), errors)
+                elif closed:
+                    errors.append({"path": _join(path, name), "error": "unknown", "message": "is not a known property"})
+        checks.append(check_object)
+
+    if isinstance(schema.get("items"), dict):
+        item_validator = compile_schema(schema["items"])
+
+        def check_items(value: Any, path: str, errors: List[Dict[str, str]]) -> None:
+            if isinstance(value, list):
+                for position, item in enumerate(value):
+                    item_validator(item, _join(path, position), errors)
+        checks.append(check_items)
+
+    def validate(value: Any, path: str, errors: List[Dict[str, str]]) -> None:
+        # Nested keywords only make sense once the type is right
+        if check_type is not None:
+            before = len(errors)
+            check_type(value, path, errors)
+            if len(errors) > before:
+                return
+        for check in checks:
+            check(value, path, errors)
+
+    return validate
+
+
+def validation_error(name: str, errors: List[Dict[str, str]]) -> str:
+    """
+    Returns the error text of a tool call rejected by its input schema: a
+    summary line followed by the errors as JSON.
+    """
+    error_msg = f"Error: invalid arguments for {name}\n" + json.dumps({"tool": name, "errors": errors}, indent=2)
+    logger.error(f"Rejected call to {name}: {errors}")
+    return error_msg
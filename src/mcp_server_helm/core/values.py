@@ -0,0 +1,55 @@
+import json
+from typing import Any, Dict, List, Optional, Union
+
+# Inline values: one document, or several layered in order
+InlineValues = Union[Dict[str, Any], List[Dict[str, Any]]]
+
+# Argument list that makes helm read a values file from stdin
+STDIN_VALUES = ["-f", "-"]
+
+
+def merge_values(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merges override into a copy of base the way helm layers values files:
+    nested maps are merged, any other value replaces the earlier one.
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_values(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def values_input(values: InlineValues) -> str:
+    """
+    Layers inline values documents and serializes the result for `-f -`.
+    JSON is valid YAML, so helm reads it without a YAML encoder here.
+
+    Raises ValueError if a document is not an object.
+    """
+    documents = values if isinstance(values, list) else [values]
+
+    merged: Dict[str, Any] = {}
+    for position, document in enumerate(documents, 1):
+        if not isinstance(document, dict):
+            raise ValueError(f"values document {position} must be an object")
+        merged = merge_values(merged, document)
+
+    return json.dumps(merged, separators=(",", ":"), ensure_ascii=False)
+
+
+def add_values_input(cmd: List[str], values: Optional[InlineValues]) -> Optional[str]:
+    """
+    Adds `-f -` to cmd for inline values and returns the stdin input carrying
+    them, or None if there are no inline values.
+
+    Raises ValueError if a document is not an object.
+    """
+    if values is None:
+        return None
+
+    stdin_input = values_input(values)
+    cmd.extend(STDIN_VALUES)
+    return stdin_input
@@ -0,0 +1,94 @@
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .utils import current_kube_context, effective_namespace, execute_helm_command_with_status
+
+logger = logging.getLogger(__name__)
+
+WatchKey = Tuple[str, str]
+
+
+class ReleaseWatcher:
+    """
+    Shares `helm list --all` polls between tool calls waiting on releases of
+    the same namespace.
+
+    A waiter asks for the releases as seen after a point in time. A poll that
+    started after that point answers every waiter of the namespace, and polls
+    running at the same time share one helm process through read coalescing.
+    """
+
+    def __init__(self):
+        # Latest poll per namespace: when it started, and its releases or error
+        self._latest: Dict[WatchKey, Tuple[float, Optional[List[Dict[str, Any]]], Optional[str]]] = {}
+        self._waiters: Dict[WatchKey, int] = {}
+        self.polls = 0
+        self.shared = 0
+
+    @staticmethod
+    def watch_key(namespace: Optional[str]) -> WatchKey:
+        return current_kube_context(), effective_namespace(namespace)
+
+    @contextmanager
+    def waiting(self, namespace: Optional[str]) -> Iterator[None]:
+        """
+        Registers a waiter on namespace; the last poll is dropped once nobody waits on it.
+        """
+        key = self.watch_key(namespace)
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            self._waiters[key] -= 1
+            if self._waiters[key] == 0:
+                del self._waiters[key]
+                self._latest.pop(key, None)
+
+    async def releases(self, namespace: Optional[str],
+                       newer_than: float) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """
+        Returns the releases of namespace from a poll started at or after
+        newer_than (a time.monotonic() value), or None and the error of a failed poll.
+        """
+        key = self.watch_key(namespace)
+        latest = self._latest.get(key)
+        if latest is not None and latest[0] >= newer_than:
+            self.shared += 1
+            return latest[1], latest[2]
+
+        cmd = ["helm", "list", "--output", "json", "--all", "--max", "0"]
+        if namespace:
+            cmd.extend(["-n", namespace])
+
+        started = time.monotonic()
+        self.polls += 1
+        output, ok = await execute_helm_command_with_status(cmd)
+
+        releases: Optional[List[Dict[str, Any]]] = None
+        error: Optional[str] = None
+        if not ok:
+            error = output
+        else:
+            try:
+                releases = json.loads(output) or []
+            except json.JSONDecodeError:
+                error = f"Error: unexpected helm list output:\n{output}"
+
+        latest = self._latest.get(key)
+        if key in self._waiters and (latest is None or latest[0] < started):
+            self._latest[key] = (started, releases, error)
+        return releases, error
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "namespaces": len(self._waiters),
+            "waiters": sum(self._waiters.values()),
+            "polls": self.polls,
+            "shared": self.shared,
+        }
+
+
+release_watcher = ReleaseWatcher()
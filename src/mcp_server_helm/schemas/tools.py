@@ -6,6 +6,39 @@ def get_all_tools():
     Returns all tool definitions for the Helm MCP server.
     """
     return [
+        # Batch tool
+        Tool(
+            name="helm_batch",
+            description="Runs several tool calls in one request. Steps run in parallel unless they depend on each other through depends_on, and per-step results and timings are returned",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "steps": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "string"},
+                                "tool": {"type": "string"},
+                                "arguments": {"type": "object"},
+                                "depends_on": {
+                                    "type": "array",
+                                    "items": {"type": "string"}
+                                }
+                            },
+                            "required": ["tool"]
+                        }
+                    },
+                    "max_concurrency": {"type": "integer"},
+                    "failure_policy": {
+                        "type": "string",
+                        "enum": ["stop", "continue"]
+                    }
+                },
+                "required": ["steps"]
+            },
+        ),
+
         # Completion tools
         Tool(
             name="helm_completion",
@@ -166,7 +199,9 @@ def get_all_tools():
                 "properties": {
                     "release_name": {"type": "string"},
                     "namespace": {"type": "string"},
-                    "max_": {"type": "integer"}
+                    "max_": {"type": "integer"},
+                    "delta": {"type": "boolean"},
+                    "cursor": {"type": "string"}
                 },
                 "required": ["release_name"]
             },
@@ -184,15 +219,52 @@ def get_all_tools():
                     "namespace": {"type": "string"},
                     "values_file": {"type": "string"},
                     "set_values": {"type": "object"},
+                    "values": {"type": ["object", "array"], "items": {"type": "object"}},
                     "description": {"type": "string"},
                     "timeout": {"type": "string"},
                     "wait": {"type": "boolean"},
-                    "atomic": {"type": "boolean"}
+                    "atomic": {"type": "boolean"},
+                    "background": {"type": "boolean"}
                 },
                 "required": ["chart"]
             },
         ),
 
+        # Job tools
+        Tool(
+            name="helm_job_cancel",
+            description="Cancels a background job and stops its helm process",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {"type": "string"}
+                },
+                "required": ["job_id"]
+            },
+        ),
+        Tool(
+            name="helm_job_result",
+            description="Returns the output of a finished background job",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {"type": "string"}
+                },
+                "required": ["job_id"]
+            },
+        ),
+        Tool(
+            name="helm_job_status",
+            description="Shows the state, duration and recent output of a background job",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {"type": "string"}
+                },
+                "required": ["job_id"]
+            },
+        ),
+
         # Lint tool
         Tool(
             name="helm_lint",
@@ -202,7 +274,8 @@ def get_all_tools():
                 "properties": {
                     "chart_path": {"type": "string"},
                     "values_file": {"type": "string"},
-                    "set_values": {"type": "object"}
+                    "set_values": {"type": "object"},
+                    "values": {"type": ["object", "array"], "items": {"type": "object"}}
                 },
                 "required": ["chart_path"]
             },
@@ -211,7 +284,7 @@ def get_all_tools():
         # List tool
         Tool(
             name="helm_list",
-            description="Lists releases",
+            description="Lists releases, optionally one namespace per helm process and page by page",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -220,7 +293,25 @@ def get_all_tools():
                     "filter_": {"type": "string"},
                     "uninstalled": {"type": "boolean"},
                     "deployed": {"type": "boolean"},
-                    "failed": {"type": "boolean"}
+                    "failed": {"type": "boolean"},
+                    "namespaces": {"type": "array", "items": {"type": "string"}},
+                    "shard": {"type": "boolean"},
+                    "limit": {"type": "integer", "minimum": 1},
+                    "offset": {"type": "integer", "minimum": 0},
+                    "sort_by": {
+                        "type": "string",
+                        "enum": ["name", "namespace", "revision", "updated", "status", "chart", "app_version"]
+                    },
+                    "reverse": {"type": "boolean"},
+                    "fields": {
+                        "type": "array",
+                        "items": {
+                            "type": "string",
+                            "enum": ["name", "namespace", "revision", "updated", "status", "chart", "app_version"]
+                        }
+                    },
+                    "delta": {"type": "boolean"},
+                    "cursor": {"type": "string"}
                 },
                 "required": []
             },
@@ -402,10 +493,16 @@ def get_all_tools():
         ),
         Tool(
             name="helm_repo_update",
-            description="Updates chart repositories",
+            description="Updates chart repositories, optionally only the named ones. With parallel, indexes are fetched concurrently and only downloaded when they changed",
             inputSchema={
                 "type": "object",
-                "properties": {},
+                "properties": {
+                    "names": {
+                        "type": "array",
+                        "items": {"type": "string"}
+                    },
+                    "parallel": {"type": "boolean"}
+                },
                 "required": []
             },
         ),
@@ -422,7 +519,8 @@ def get_all_tools():
                     "namespace": {"type": "string"},
                     "timeout": {"type": "string"},
                     "wait": {"type": "boolean"},
-                    "force": {"type": "boolean"}
+                    "force": {"type": "boolean"},
+                    "background": {"type": "boolean"}
                 },
                 "required": ["release_name"]
             },
@@ -457,6 +555,17 @@ def get_all_tools():
             },
         ),
 
+        # Server stats tool
+        Tool(
+            name="helm_server_stats",
+            description="Shows the MCP server's internal counters: scheduler lanes, coalesced reads, stopped processes, status waiters, release locks, caches, helm_list and helm_history delta cursors, the helm binary and repository indexes",
+            inputSchema={
+                "type": "object",
+                "properties": {},
+                "required": []
+            },
+        ),
+
         # Show tools
         Tool(
             name="helm_show_all",
@@ -524,7 +633,7 @@ def get_all_tools():
             },
         ),
 
-        # Status tool
+        # Status tools
         Tool(
             name="helm_status",
             description="Displays the status of the named release",
@@ -538,6 +647,32 @@ def get_all_tools():
                 "required": ["release_name"]
             },
         ),
+        Tool(
+            name="helm_status_many",
+            description="Displays the status of many releases concurrently, given as a list or selected by namespace, label selector and name filter. Failed queries and releases that are not deployed are listed first",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "releases": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "release_name": {"type": "string"},
+                                "namespace": {"type": "string"}
+                            },
+                            "required": ["release_name"]
+                        }
+                    },
+                    "namespace": {"type": "string"},
+                    "all_namespaces": {"type": "boolean"},
+                    "selector": {"type": "string"},
+                    "filter_": {"type": "string"},
+                    "max_concurrency": {"type": "integer"}
+                },
+                "required": []
+            },
+        ),
 
         # Template tool
         Tool(
@@ -551,6 +686,7 @@ def get_all_tools():
                     "namespace": {"type": "string"},
                     "values_file": {"type": "string"},
                     "set_values": {"type": "object"},
+                    "values": {"type": ["object", "array"], "items": {"type": "object"}},
                     "api_versions": {
                         "type": "array",
                         "items": {"type": "string"}
@@ -571,7 +707,8 @@ def get_all_tools():
                     "release_name": {"type": "string"},
                     "namespace": {"type": "string"},
                     "timeout": {"type": "string"},
-                    "filter_": {"type": "string"}
+                    "filter_": {"type": "string"},
+                    "background": {"type": "boolean"}
                 },
                 "required": ["release_name"]
             },
@@ -593,7 +730,7 @@ def get_all_tools():
             },
         ),
 
-        # Upgrade tool
+        # Upgrade tools
         Tool(
             name="helm_upgrade",
             description="Upgrades a release",
@@ -605,15 +742,52 @@ def get_all_tools():
                     "namespace": {"type": "string"},
                     "values_file": {"type": "string"},
                     "set_values": {"type": "object"},
+                    "values": {"type": ["object", "array"], "items": {"type": "object"}},
                     "install": {"type": "boolean"},
                     "force": {"type": "boolean"},
                     "atomic": {"type": "boolean"},
                     "timeout": {"type": "string"},
-                    "wait": {"type": "boolean"}
+                    "wait": {"type": "boolean"},
+                    "background": {"type": "boolean"}
                 },
                 "required": ["release_name", "chart"]
             },
         ),
+        Tool(
+            name="helm_upgrade_many",
+            description="Upgrades many releases to the same chart and values in waves of bounded concurrency, stopping once failures exceed a threshold and optionally rolling back releases that failed",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "releases": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "release_name": {"type": "string"},
+                                "namespace": {"type": "string"}
+                            },
+                            "required": ["release_name"]
+                        }
+                    },
+                    "chart": {"type": "string"},
+                    "values_file": {"type": "string"},
+                    "set_values": {"type": "object"},
+                    "values": {"type": ["object", "array"], "items": {"type": "object"}},
+                    "install": {"type": "boolean"},
+                    "force": {"type": "boolean"},
+                    "atomic": {"type": "boolean"},
+                    "timeout": {"type": "string"},
+                    "wait": {"type": "boolean"},
+                    "wave_size": {"type": "integer"},
+                    "max_concurrency": {"type": "integer"},
+                    "max_failures": {"type": "integer"},
+                    "rollback_failed": {"type": "boolean"},
+                    "background": {"type": "boolean"}
+                },
+                "required": ["releases", "chart"]
+            },
+        ),
 
         # Verify tool
         Tool(
@@ -629,6 +803,23 @@ def get_all_tools():
             },
         ),
 
+        # Wait tool
+        Tool(
+            name="helm_wait_status",
+            description="Waits inside the server until a release reaches a status, and optionally a revision, or the timeout expires",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "release_name": {"type": "string"},
+                    "namespace": {"type": "string"},
+                    "status": {"type": "string"},
+                    "revision": {"type": "integer"},
+                    "timeout": {"type": "string"}
+                },
+                "required": ["release_name"]
+            },
+        ),
+
         # Version tool
         Tool(
             name="helm_version",
@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+from mcp_server_helm.core import utils
+from mcp_server_helm.core.repo_index import index_support_available
+from mcp_server_helm.core.utils import effective_namespace
+
+pytestmark = pytest.mark.skipif(not index_support_available(), reason="PyYAML is not installed")
+
+KUBECONFIG = """apiVersion: v1
+kind: Config
+current-context: {current}
+contexts:
+- name: main
+  context:
+    cluster: main
+    namespace: team-a
+- name: other
+  context:
+    cluster: other
+    namespace: team-b
+- name: bare
+  context:
+    cluster: main
+"""
+
+
+@pytest.fixture
+def kubeconfig(tmp_path, monkeypatch):
+    path = tmp_path / "config"
+    path.write_text(KUBECONFIG.format(current="main"))
+
+    monkeypatch.setenv("KUBECONFIG", str(path))
+    monkeypatch.delenv("HELM_NAMESPACE", raising=False)
+    monkeypatch.delenv("HELM_KUBECONTEXT", raising=False)
+    monkeypatch.setattr(utils, "_context_namespaces", {})
+    return path
+
+
+def test_explicit_and_helm_namespace_win(kubeconfig, monkeypatch):
+    assert effective_namespace("given") == "given"
+    monkeypatch.setenv("HELM_NAMESPACE", "from-env")
+    assert effective_namespace() == "from-env"
+
+
+def test_namespace_of_current_or_chosen_context(kubeconfig, monkeypatch):
+    assert effective_namespace() == "team-a"
+
+    monkeypatch.setenv("HELM_KUBECONTEXT", "other")
+    assert effective_namespace() == "team-b"
+
+    monkeypatch.setenv("HELM_KUBECONTEXT", "bare")
+    assert effective_namespace() == "default"
+
+
+def test_kubeconfig_change_is_noticed(kubeconfig):
+    assert effective_namespace() == "team-a"
+    kubeconfig.write_text(KUBECONFIG.format(current="other"))
+    assert effective_namespace() == "team-b"
+
+
+def test_first_kubeconfig_file_wins(kubeconfig, tmp_path, monkeypatch):
+    override = tmp_path / "override"
+    override.write_text("current-context: other\ncontexts:\n- name: other\n  context:\n    namespace: team-c\n")
+    monkeypatch.setenv("KUBECONFIG", os.pathsep.join([str(override), str(kubeconfig)]))
+    assert effective_namespace() == "team-c"
+
+
+def test_default_without_kubeconfig(kubeconfig, tmp_path, monkeypatch):
+    monkeypatch.setenv("KUBECONFIG", str(tmp_path / "missing"))
+    assert effective_namespace() == "default"
@@ -0,0 +1,157 @@
+import asyncio
+import http.server
+import json
+import os
+import threading
+
+import pytest
+
+from mcp_server_helm.core import config
+from mcp_server_helm.core.repo_index import index_file_path, index_support_available
+from mcp_server_helm.core.repo_update import FAILED, UNCHANGED, UPDATED, update_repositories
+
+pytestmark = pytest.mark.skipif(not index_support_available(), reason="PyYAML is not installed")
+
+INDEX = b"""apiVersion: v1
+entries:
+  nginx:
+  - name: nginx
+    version: 1.2.3
+    appVersion: "1.25"
+    description: web server
+generated: "2024-01-01T00:00:00Z"
+"""
+
+ETAG = '"index-v1"'
+LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+class _IndexHandler(http.server.BaseHTTPRequestHandler):
+    # Set by the server fixture: "ok" serves INDEX conditionally, "error" fails, "garbage" serves invalid YAML,
+    # "redirect" sends requests for 127.0.0.1 to the same server as localhost, a second host
+    mode = "ok"
+    requests = []
+    authorizations = []
+
+    def do_GET(self):
+        type(self).requests.append((self.path, self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since")))
+        type(self).authorizations.append((self.headers.get("Host"), self.headers.get("Authorization")))
+        if self.mode == "redirect" and self.headers.get("Host", "").startswith("127.0.0.1"):
+            self.send_response(302)
+            self.send_header("Location", f"http://localhost:{self.server.server_address[1]}{self.path}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.mode == "error":
+            self.send_error(500, "index unavailable")
+            return
+        if self.mode == "ok" and self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = b"entries: [unterminated\n" if self.mode == "garbage" else INDEX
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    """
+    Serves a chart repository over HTTP and points helm's repository config, cache and the server state at tmp_path.
+    """
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _IndexHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+
+    _IndexHandler.mode = "ok"
+    _IndexHandler.requests = []
+    _IndexHandler.authorizations = []
+
+    url = f"http://127.0.0.1:{server.server_address[1]}/charts"
+    (tmp_path / "repositories.yaml").write_text(f"repositories:\n- name: local\n  url: {url}\n")
+    monkeypatch.setenv("HELM_REPOSITORY_CONFIG", str(tmp_path / "repositories.yaml"))
+    monkeypatch.setenv("HELM_REPOSITORY_CACHE", str(tmp_path / "cache"))
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1,localhost")
+    monkeypatch.setenv("no_proxy", "127.0.0.1,localhost")
+    monkeypatch.setattr(config, "STATE_DIR", str(tmp_path / "state"))
+
+    yield _IndexHandler
+
+    server.shutdown()
+    server.server_close()
+
+
+def _update():
+    results = asyncio.run(update_repositories())
+    assert results is not None and len(results) == 1
+    return results[0]
+
+
+def _validators(tmp_path):
+    with open(tmp_path / "state" / "repo-validators.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_download_records_validators(repository, tmp_path):
+    result = _update()
+
+    assert result.status == UPDATED
+    assert result.downloaded_bytes == len(INDEX)
+    assert repository.requests == [("/charts/index.yaml", None, None)]
+    with open(index_file_path("local"), "rb") as f:
+        assert f.read() == INDEX
+
+    validator = _validators(tmp_path)["local"]
+    assert validator["etag"] == ETAG
+    assert validator["last_modified"] == LAST_MODIFIED
+
+
+def test_not_modified_skips_download(repository):
+    _update()
+    mtime = os.stat(index_file_path("local")).st_mtime_ns
+
+    result = _update()
+
+    assert result.status == UNCHANGED
+    assert result.downloaded_bytes == 0
+    assert result.index_bytes == len(INDEX)
+    assert repository.requests[-1] == ("/charts/index.yaml", ETAG, LAST_MODIFIED)
+    assert os.stat(index_file_path("local")).st_mtime_ns == mtime
+
+
+@pytest.mark.parametrize("mode", ["error", "garbage"])
+def test_failure_keeps_cached_index(repository, mode):
+    _update()
+
+    repository.mode = mode
+    result = _update()
+
+    assert result.status == FAILED
+    assert result.error
+    with open(index_file_path("local"), "rb") as f:
+        assert f.read() == INDEX
+    assert not [name for name in os.listdir(os.path.dirname(index_file_path("local"))) if name.startswith(".tmp-")]
+
+
+@pytest.mark.parametrize("pass_credentials_all", [True, False])
+def test_credentials_follow_redirect_only_when_passed_to_all_domains(repository, tmp_path, pass_credentials_all):
+    config_path = tmp_path / "repositories.yaml"
+    config_path.write_text(config_path.read_text() + "  username: user\n  password: secret\n"
+                           f"  pass_credentials_all: {str(pass_credentials_all).lower()}\n")
+    repository.mode = "redirect"
+
+    result = _update()
+
+    assert result.status == UPDATED, result.error
+    (first_host, first_auth), (second_host, second_auth) = repository.authorizations
+    assert first_host.startswith("127.0.0.1") and second_host.startswith("localhost")
+    assert first_auth == "Basic dXNlcjpzZWNyZXQ="
+    assert second_auth == (first_auth if pass_credentials_all else None)
@@ -0,0 +1,107 @@
+import itertools
+
+import pytest
+
+from mcp_server_helm.core.repo_index import _build_record
+from mcp_server_helm.core.semver import parse_constraints, parse_version
+
+# (constraint, versions it matches, versions it rejects), following Masterminds/semver as used by helm
+CONFORMANCE = [
+    # Exact versions
+    ("1.2.3", ["1.2.3", "v1.2.3", "1.2.3+build.5"], ["1.2.4", "1.2.2", "1.2.3-beta"]),
+    ("=1.2.3", ["1.2.3"], ["1.2.4"]),
+    ("!=1.2.3", ["1.2.2", "1.2.4", "2.0.0"], ["1.2.3"]),
+
+    # Comparisons
+    (">1.2.3", ["1.2.4", "2.0.0"], ["1.2.3", "1.0.0"]),
+    (">=1.2.3", ["1.2.3", "1.3.0"], ["1.2.2", "1.3.0-alpha"]),
+    ("<1.2.3", ["1.2.2", "0.9.0"], ["1.2.3", "1.2.2-rc.1"]),
+    ("<=1.2.3", ["1.2.3", "1.0.0"], ["1.2.4"]),
+    (">1.2", ["1.3.0", "2.0.0"], ["1.2.0", "1.2.9"]),
+    ("<=1.2", ["1.2.9", "1.0.0"], ["1.3.0", "2.0.0"]),
+    (">=2.3 <3", ["2.3.0", "2.9.9"], ["2.2.9", "3.0.0", "3.0.0-rc.1"]),
+    (">=2.3, <3", ["2.3.0", "2.9.9"], ["2.2.9", "3.0.0"]),
+
+    # Caret
+    ("^1.2.3", ["1.2.3", "1.9.9"], ["1.2.2", "2.0.0"]),
+    ("^1.2", ["1.2.0", "1.9.0"], ["1.1.9", "2.0.0"]),
+    ("^1", ["1.0.0", "1.9.9"], ["0.9.9", "2.0.0"]),
+    ("^0.2.3", ["0.2.3", "0.2.9"], ["0.2.2", "0.3.0", "1.0.0"]),
+    ("^0.0.3", ["0.0.3"], ["0.0.4", "0.1.0"]),
+    ("^0", ["0.0.0", "0.9.9"], ["1.0.0"]),
+
+    # Tilde
+    ("~1.2.3", ["1.2.3", "1.2.9"], ["1.2.2", "1.3.0"]),
+    ("~1.2", ["1.2.0", "1.2.9"], ["1.1.9", "1.3.0"]),
+    ("~1", ["1.0.0", "1.9.9"], ["0.9.9", "2.0.0"]),
+    ("~>1.2.3", ["1.2.3", "1.2.9"], ["1.3.0"]),
+    ("~0.0.0", ["0.0.0", "5.0.0"], ["5.0.0-alpha"]),
+
+    # Wildcards
+    ("*", ["0.0.0", "1.2.3", "10.0.0"], ["1.0.0-alpha"]),
+    ("x", ["1.2.3"], ["1.0.0-alpha"]),
+    ("1.2.x", ["1.2.0", "1.2.9"], ["1.1.9", "1.3.0"]),
+    ("1.2.*", ["1.2.0", "1.2.9"], ["1.3.0"]),
+    ("2.X", ["2.0.0", "2.9.9"], ["1.9.9", "3.0.0"]),
+    ("2", ["2.0.0", "2.9.9"], ["3.0.0"]),
+    ("!=1.2.x", ["1.1.9", "1.3.0"], ["1.2.0", "1.2.5"]),
+
+    # Hyphen ranges
+    ("1.2 - 1.4.5", ["1.2.0", "1.4.5"], ["1.1.9", "1.4.6"]),
+    ("1.2.3 - 2.3", ["1.2.3", "2.3.9"], ["1.2.2", "2.4.0"]),
+
+    # Alternatives
+    ("1.2.x || >=3", ["1.2.5", "3.0.0", "4.1.0"], ["1.3.0", "2.9.9"]),
+    ("^1.0.0 || ^3.0.0", ["1.5.0", "3.5.0"], ["2.0.0", "4.0.0"]),
+    ("<1.0.0 || >=2.0.0 <2.1.0", ["0.9.0", "2.0.5"], ["1.0.0", "2.1.0"]),
+
+    # Prereleases only match constraints that carry one themselves
+    (">=1.2.3-beta", ["1.2.3-beta", "1.2.3-beta.2", "1.2.3", "1.3.0"], ["1.2.3-alpha", "1.2.2"]),
+    ("^1.2.3-alpha", ["1.2.3-alpha.1", "1.2.3", "1.9.0"], ["2.0.0", "1.2.2"]),
+    ("~1.2.3-0", ["1.2.3-0", "1.2.3-rc.1", "1.2.9"], ["1.3.0"]),
+    ("<2.0.0-0", ["1.9.9", "1.5.0-beta"], ["2.0.0", "2.0.0-alpha"]),
+    ("1.2.3-rc.1", ["1.2.3-rc.1"], ["1.2.3-rc.2", "1.2.3"]),
+]
+
+
+@pytest.mark.parametrize("constraint, matching, rejected", CONFORMANCE)
+def test_conformance(constraint, matching, rejected):
+    constraints = parse_constraints(constraint)
+    for version in matching:
+        assert constraints.check(parse_version(version)), f"{constraint} should match {version}"
+    for version in rejected:
+        assert not constraints.check(parse_version(version)), f"{constraint} should not match {version}"
+
+
+@pytest.mark.parametrize("constraint", ["", "1.2.3.4", ">>1.2", "^1.2.3 ||", "1.2 - ", "foo"])
+def test_improper_constraints(constraint):
+    with pytest.raises(ValueError):
+        parse_constraints(constraint)
+
+
+def test_precedence():
+    ordered = ["1.0.0-alpha", "1.0.0-alpha.1", "1.0.0-alpha.beta", "1.0.0-beta", "1.0.0-beta.2",
+               "1.0.0-beta.11", "1.0.0-rc.1", "1.0.0", "1.0.1", "1.1.0", "2.0.0"]
+    versions = [parse_version(version) for version in ordered]
+    assert versions == sorted(reversed(versions))
+    assert parse_version("1.0.0+build.1") == parse_version("1.0.0")
+
+
+def _version_list():
+    versions = [f"{major}.{minor}.{patch}" for major, minor, patch in itertools.product(range(4), range(4), range(4))]
+    versions += ["1.2.3-alpha", "1.2.3-beta.2", "2.0.0-rc.1", "3.0.0-0", "0.0.3-pre", "10.0.0", "1.10.0"]
+    return versions
+
+
+def test_latest_matching_agrees_with_brute_force():
+    versions = _version_list()
+    record = _build_record("chart", [{"version": version} for version in versions], {}, {}, "index.yaml")
+    parsed = [parse_version(version) for version in versions]
+
+    for constraint, _, _ in CONFORMANCE:
+        constraints = parse_constraints(constraint)
+        expected = max((version for version in parsed if constraints.check(version)), default=None)
+
+        position = record.latest_matching(constraints)
+        found = record.semver(position) if position is not None else None
+        assert found == expected, f"{constraint}: expected {expected}, got {found}"
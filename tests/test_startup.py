@@ -0,0 +1,36 @@
+import json
+import os
+import subprocess
+import sys
+
+import mcp_server_helm
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(mcp_server_helm.__file__)))
+
+# A fresh interpreter, since the rest of the suite imports the command modules
+PROBE = (
+    "import json, sys\n"
+    "import mcp_server_helm.core.server\n"
+    "print(json.dumps(sorted(sys.modules)))\n"
+)
+
+
+def _modules_after(statement: str) -> set:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC, os.environ.get("PYTHONPATH")])))
+    output = subprocess.run([sys.executable, "-c", statement], env=env, check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return set(json.loads(output.strip().splitlines()[-1]))
+
+
+def test_server_import_leaves_commands_and_optional_dependencies_unloaded():
+    modules = _modules_after(PROBE)
+
+    assert "mcp_server_helm.core.server" in modules
+    assert not [name for name in modules if name.startswith("mcp_server_helm.commands.")]
+    assert "yaml" not in modules
+
+
+def test_command_modules_load_on_first_use():
+    modules = _modules_after(PROBE.replace("print(", "mcp_server_helm.core.server.commands.release\nprint(", 1))
+
+    assert "mcp_server_helm.commands.release" in modules